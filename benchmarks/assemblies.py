@@ -0,0 +1,36 @@
+"""The brick assembly the benchmarks and the tests convert.
+
+Benchmarks import it as a sibling module, ``from assemblies import make_assy``,
+which works because ``python benchmarks/<name>.py`` puts this directory first
+on ``sys.path``. tests/conftest.py adds this directory to ``sys.path`` and
+wraps ``Brick`` and ``make_assy`` in its fixtures.
+"""
+
+from cadbuildr.foundation.gen.models import Assembly, Extrusion, Part, Sketch, Square
+
+
+class Brick(Part):
+    def __init__(self, size=8, height=8):
+        super().__init__()
+        sketch = Sketch(self.xy())
+        square = Square.from_center_and_side(sketch.origin, size)
+        self.add_operation(Extrusion(square, height))
+
+
+def make_assy(
+    n,
+    size=lambda i: 4 + i,
+    height=lambda i: 8,
+    position=lambda i: [float(i * 10), 0.0, 0.0],
+):
+    """
+    An assembly of ``n`` bricks, brick ``i`` of ``size(i)`` and ``height(i)``
+    translated to ``position(i)``, or left in place when ``position`` is None.
+    """
+    assy = Assembly()
+    for i in range(n):
+        brick = Brick(size=size(i), height=height(i))
+        if position is not None:
+            brick.translate(position(i))
+        assy.add_component(brick)
+    return assy
@@ -0,0 +1,51 @@
+"""Payload size and encode/decode time: JSON versus the binary DAG format.
+
+Run from the repository root:
+
+    python benchmarks/bench_binary.py [--bricks 50]
+
+The plain sizes are what goes on the wire: ``requests.post(json=...)`` sends
+the body uncompressed. The zlib sizes are for transports that compress.
+"""
+
+import argparse
+import json
+import time
+import zlib
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import decode_dag, encode_dag
+
+from assemblies import make_assy
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=50)
+    args = parser.parse_args()
+
+    dag = show_dag(make_assy(args.bricks, size=lambda i: 4 + i % 7, height=lambda i: 4 + i % 5))
+    json_time, json_bytes = best_of(lambda: json.dumps(dag).encode("utf-8"))
+    binary_time, binary_bytes = best_of(lambda: encode_dag(dag))
+    json_decode, _ = best_of(lambda: json.loads(json_bytes))
+    binary_decode, decoded = best_of(lambda: decode_dag(binary_bytes))
+    assert json.dumps(decoded) == json.dumps(dag), "binary round trip differs"
+
+    print(f"{len(dag['DAG'])} nodes")
+    print(f"json:   {len(json_bytes):9d} B  zlib {len(zlib.compress(json_bytes)):8d} B  "
+          f"encode {json_time * 1000:7.2f} ms  decode {json_decode * 1000:7.2f} ms")
+    print(f"binary: {len(binary_bytes):9d} B  zlib {len(zlib.compress(binary_bytes)):8d} B  "
+          f"encode {binary_time * 1000:7.2f} ms  decode {binary_decode * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Time model construction that goes through @default factories.
+
+Run from the repository root:
+
+    python benchmarks/bench_defaults.py [--count 2000]
+
+Each generated field default is ``_eval_expr({}, expr)``; the first table
+times those calls directly, the second the construction of models that use
+several defaults.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.gen.models import Extrusion, InterfaceGridSpec, Part, Sketch, Square
+from cadbuildr.foundation.gen.runtime import _eval_expr
+
+EXPRESSIONS = [
+    "[]",
+    "0.0",
+    "FloatParameter(value=0.0)",
+    "BoolParameter(value=False)",
+    "StringParameter(value='part0')",
+    "Frame.make_origin_frame()",
+    "[1.0, 0.0, 0.0, 0.0]",
+]
+
+
+def best_of(fn, count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for expr in EXPRESSIONS:
+        try:
+            _eval_expr({}, expr)
+        except ValueError:
+            print(f"{expr:<32} fails")
+            continue
+        seconds = best_of(lambda: _eval_expr({}, expr), args.count, args.repeat)
+        print(f"{expr:<32} {seconds * 1e6:8.1f} us")
+
+    part = Part()
+    sketch = Sketch(part.xy())
+    square = Square.from_center_and_side(sketch.origin, 8)
+    builders = {
+        "InterfaceGridSpec()": InterfaceGridSpec,
+        "Extrusion(square, 8)": lambda: Extrusion(square, 8),
+        "Part()": Part,
+    }
+    for name, build in builders.items():
+        seconds = best_of(build, args.count // 10, args.repeat)
+        print(f"{name:<32} {seconds * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
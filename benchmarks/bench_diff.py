@@ -0,0 +1,42 @@
+"""Compare full and delta payloads for a one-part edit of an assembly.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_diff.py [--bricks 200]
+"""
+
+import argparse
+import json
+import time
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import ShortIdMap, apply_patch, diff_dag
+
+from assemblies import make_assy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=200)
+    args = parser.parse_args()
+
+    id_map = ShortIdMap()
+    old = show_dag(make_assy(args.bricks), id_map=id_map)
+    new = show_dag(make_assy(args.bricks, height=lambda i: 12 if i == args.bricks - 1 else 8), id_map=id_map)
+
+    start = time.perf_counter()
+    patch = diff_dag(old, new)
+    diff_time = time.perf_counter() - start
+    start = time.perf_counter()
+    apply_patch(old, patch)
+    apply_time = time.perf_counter() - start
+
+    full_size = len(json.dumps(new))
+    patch_size = len(json.dumps(patch))
+    print(f"nodes: {len(new['DAG'])}, added {len(patch['added'])}, removed {len(patch['removed'])}")
+    print(f"full DAG: {full_size} bytes, patch: {patch_size} bytes ({full_size / patch_size:.0f}x smaller)")
+    print(f"diff: {diff_time * 1000:.1f} ms, apply: {apply_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Time repeated @expand of sketch shapes.
+
+Run from the repository root:
+
+    python benchmarks/bench_expand.py [--count 2000]
+
+Pattern-heavy parts expand the same few shape types many times; this times
+one ``expand()`` call of each.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.gen.models import Hexagon, Part, Rectangle, Sketch, Square
+
+
+def best_of(fn, count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sketch = Sketch(Part().xy())
+    shapes = {
+        "Square": Square.from_center_and_side(sketch.origin, 8),
+        "Rectangle": Rectangle.from_center_and_sides(sketch.origin, 8, 4),
+        "Hexagon": Hexagon(sketch.origin, radius=5),
+    }
+    for name, shape in shapes.items():
+        seconds = best_of(shape.expand, args.count, args.repeat)
+        print(f"{name:<12} {seconds * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time regenerating the primitives of filleted profiles.
+
+Run from the repository root:
+
+    python benchmarks/bench_fillet.py [--vertices 200] [--rectangles 200]
+
+Each FilletPolyline vertex builds a Line, an Arc and five Points, and every
+one of them registers with the sketch, which skips elements equal to one it
+already holds; regenerating the profile therefore finds all of them present.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.gen.models import (
+    FilletPolyline,
+    FloatParameter,
+    Part,
+    Point,
+    RectangleRounded,
+    Sketch,
+)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_polyline(vertices):
+    sketch = Sketch(Part().xy())
+    points = [Point(sketch, float(i * 10), float((i % 2) * 10)) for i in range(vertices)]
+    return FilletPolyline(points=points, radius=FloatParameter(value=1.0))
+
+
+def make_rectangles(count):
+    sketch = Sketch(Part().xy())
+    return [
+        RectangleRounded(
+            center=Point(sketch, float(i * 20), 0.0),
+            w=FloatParameter(value=10.0),
+            h=FloatParameter(value=6.0),
+            radius=FloatParameter(value=1.0),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=200)
+    parser.add_argument("--rectangles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    polyline = make_polyline(args.vertices)
+    polyline.compute("primitives")
+    seconds = best_of(lambda: polyline.compute("primitives"), args.repeat)
+    print(
+        f"FilletPolyline, {args.vertices} vertices: {seconds * 1000:.1f} ms "
+        f"({len(polyline.points[0].sketch.elements)} sketch elements)"
+    )
+
+    rectangles = make_rectangles(args.rectangles)
+    for rectangle in rectangles:
+        rectangle.compute("primitives")
+    seconds = best_of(lambda: [rectangle.compute("primitives") for rectangle in rectangles], args.repeat)
+    print(
+        f"RectangleRounded x {args.rectangles}: {seconds * 1000:.1f} ms "
+        f"({len(rectangles[0].center.sketch.elements)} sketch elements)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare compute_hash with hashing json.dumps(sort_keys=True) output.
+
+Hashes every node of an assembly of identical bricks, as in
+tests/unit/test_many_legos_deterministic.py. Run from the repository root:
+
+    python benchmarks/bench_hash.py [--bricks 20] [--repeat 10]
+"""
+
+import argparse
+import hashlib
+import json
+import time
+
+from cadbuildr.foundation.compute_functions import (  # pragma: allowlist secret
+    _convert_component_to_root,
+    _finalize_root_names,
+)
+from cadbuildr.foundation.constants import DEFAULT_TYPE_REGISTRY
+from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
+from cadbuildr.foundation.gen.dag import compute_hash, pydantic_to_dag
+
+from assemblies import make_assy
+
+
+def json_dumps_hash(content):
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def time_per_pass(hash_fn, nodes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            hash_fn(node)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    root = _convert_component_to_root(make_assy(args.bricks, size=lambda i: 8))
+    _finalize_root_names(root)
+    memo = {}
+    pydantic_to_dag(root, memo, DEFAULT_TYPE_REGISTRY.copy(), setup_foundation_hooks())
+    nodes = list(memo.values())
+
+    mismatches = sum(compute_hash(node) != json_dumps_hash(node) for node in nodes)
+    baseline = time_per_pass(json_dumps_hash, nodes, args.repeat)
+    streaming = time_per_pass(compute_hash, nodes, args.repeat)
+    print(f"{len(nodes)} nodes, {mismatches} hash mismatches")
+    print(f"json.dumps + sha256: {baseline * 1000:.2f} ms")
+    print(f"compute_hash:        {streaming * 1000:.2f} ms ({baseline / streaming:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
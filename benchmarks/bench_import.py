@@ -0,0 +1,66 @@
+"""Time a cold `import cadbuildr.foundation` and the first model lookup.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 500]
+
+Each measurement starts a fresh interpreter. The import is read from
+``-X importtime`` (cumulative time of the top-level package); the first
+model lookup, which imports the models from ``__getattr__`` where
+``-X importtime`` does not time the package itself, is timed in the child.
+With ``--budget-ms`` the script exits with status 1 when the best cold import
+exceeds the budget.
+"""
+
+import argparse
+import subprocess
+import sys
+
+LOOKUP = (
+    "import time\n"
+    "import cadbuildr.foundation as foundation\n"
+    "start = time.perf_counter()\n"
+    "foundation.Part\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def run(*args):
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def import_time_us():
+    result = run("-X", "importtime", "-c", "import cadbuildr.foundation")
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == " cadbuildr.foundation":
+            return int(parts[1])
+    raise RuntimeError("no -X importtime entry for cadbuildr.foundation")
+
+
+def lookup_time():
+    return float(run("-c", LOOKUP).stdout)
+
+
+def best_of(fn, repeat):
+    return min(fn() for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    cold_ms = best_of(import_time_us, args.repeat) / 1000
+    print(f"import cadbuildr.foundation: {cold_ms:.1f} ms")
+    lookup_ms = best_of(lookup_time, args.repeat) * 1000
+    print(f"first model lookup afterwards: {lookup_ms:.1f} ms")
+
+    if args.budget_ms is not None and cold_ms > args.budget_ms:
+        print(f"over budget ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
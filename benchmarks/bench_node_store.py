@@ -0,0 +1,45 @@
+"""Time repeated streaming exports with and without a NodeStore.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_node_store.py [--bricks 200]
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from cadbuildr.foundation.dag_utils import stream_dag
+from cadbuildr.foundation.gen.dag import NodeStore
+
+from assemblies import make_assy
+
+
+def export(assy, store):
+    out = io.StringIO()
+    start = time.perf_counter()
+    stream_dag(assy, out, store=store)
+    return time.perf_counter() - start, len(out.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=200)
+    args = parser.parse_args()
+
+    plain_time, plain_size = export(make_assy(args.bricks), None)
+    print(f"no store:          {plain_time * 1000:.0f} ms, {plain_size} bytes")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with NodeStore(os.path.join(tmp, "nodes.sqlite")) as store:
+            cold_time, cold_size = export(make_assy(args.bricks), store)
+            warm_time, warm_size = export(make_assy(args.bricks, height=lambda i: 12 if i == args.bricks - 1 else 8), store)
+            print(f"store, cold:       {cold_time * 1000:.0f} ms, {cold_size} bytes")
+            print(f"store, after edit: {warm_time * 1000:.0f} ms, {warm_size} bytes")
+            print(store.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compare serial and process-pool show_dag on a brick assembly.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel.py [--bricks 200] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from cadbuildr.foundation.dag_utils import show_dag
+
+from assemblies import make_assy
+
+
+def timed(**kwargs):
+    assy = make_assy(ARGS.bricks, size=lambda i: 4 + i % 7, height=lambda i: 4 + i % 5)
+    start = time.perf_counter()
+    dag = show_dag(assy, **kwargs)
+    return time.perf_counter() - start, dag
+
+
+def main():
+    serial_time, serial = timed()
+    parallel_time, parallel = timed(workers=ARGS.workers)
+    assert json.dumps(parallel) == json.dumps(serial), "parallel DAG differs from serial"
+    print(f"{ARGS.bricks} bricks, {len(serial['DAG'])} nodes, {os.cpu_count()} CPUs")
+    print(f"serial:     {serial_time * 1000:.1f} ms")
+    print(f"workers={ARGS.workers}: {parallel_time * 1000:.1f} ms ({serial_time / parallel_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ARGS = parser.parse_args()
+    main()
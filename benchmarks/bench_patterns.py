@@ -0,0 +1,48 @@
+"""Time generating the Points of large location patterns.
+
+Run from the repository root:
+
+    python benchmarks/bench_patterns.py [--grid 100] [--rings 40] [--repeat 3]
+
+Each pattern builds its Points on a fresh sketch, so every run registers
+the same number of elements. ``positions_array()`` is timed on its own to
+separate computing the layout from building the Points.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation import GridLocations, HexLocations
+from cadbuildr.foundation.gen.models import Part, Sketch
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid", type=int, default=100, help="grid side, in points")
+    parser.add_argument("--rings", type=int, default=40, help="HexLocations n_radial")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    patterns = {
+        f"GridLocations {args.grid}x{args.grid}": lambda c: GridLocations(c, 2.0, 2.0, args.grid, args.grid),
+        f"HexLocations n_radial={args.rings}": lambda c: HexLocations(c, 2.0, args.rings),
+    }
+    for name, make in patterns.items():
+        pattern = make(Sketch(Part().xy()).origin)
+        n = len(pattern.positions_array())
+        layout = best_of(pattern.positions_array, args.repeat)
+        points = best_of(lambda: make(Sketch(Part().xy()).origin).positions(), args.repeat)
+        print(f"{name} ({n} points): positions_array {layout * 1000:.2f} ms, positions {points * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
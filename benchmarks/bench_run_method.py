@@ -0,0 +1,55 @@
+"""Time the dispatch overhead of generated methods going through run_method.
+
+Run from the repository root:
+
+    python benchmarks/bench_run_method.py [--count 100000]
+
+``Sketch.add_element`` runs once per sketch element (from
+``SketchElementMixin.model_post_init``); adding an element that is already
+the first in the list keeps the method body itself O(1), so the time is
+mostly dispatch.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.gen.models import Part, Sketch
+from cadbuildr.foundation.gen.runtime import register_method_fn, run_method
+
+
+@register_method_fn("bench_noop_method")
+def bench_noop_method(inst, element):
+    return True
+
+
+def best_of(fn, count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sketch = Sketch(Part().xy())
+    element = sketch.origin
+    sketch.add_element(element)
+    local_vars = {"element": element}
+    cases = {
+        "run_method(no-op)": lambda: run_method(sketch, "bench_noop_method", local_vars),
+        "Sketch.add_element": lambda: sketch.add_element(element),
+    }
+    for name, fn in cases.items():
+        seconds = best_of(fn, args.count, args.repeat)
+        print(f"{name:<22} {seconds * 1e6:8.2f} us/call  ({seconds * args.count * 1000:.0f} ms per {args.count})")
+
+
+if __name__ == "__main__":
+    main()
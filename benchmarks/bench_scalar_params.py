@@ -0,0 +1,62 @@
+"""Time DAG conversion of many frames that share a few scalar parameter values.
+
+Every frame holds a StringParameter name and a BoolParameter display flag,
+and the names repeat, so most of the objects converted are scalar
+parameters whose nodes already exist.
+
+Run from the repository root:
+
+    python benchmarks/bench_scalar_params.py [--frames 20000] [--names 50]
+"""
+
+import argparse
+import time
+
+from typing import List
+
+from pydantic import BaseModel
+
+from cadbuildr.foundation.gen.dag import TraversalStats, pydantic_to_dag
+from cadbuildr.foundation.gen.models import BoolParameter, Frame, StringParameter
+
+
+class Frames(BaseModel):
+    frames: List[Frame]
+
+
+def make_frames(count, names):
+    origin = Frame.make_origin_frame()
+    return Frames(frames=[
+        Frame(
+            top_frame=origin,
+            name=StringParameter(value=f"frame{i % names}"),
+            display=BoolParameter(value=False),
+            position=[0.0, 0.0, float(i)],
+            quaternion=[1.0, 0.0, 0.0, 0.0],
+        )
+        for i in range(count)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--names", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.names)
+    best = float("inf")
+    for _ in range(args.repeat):
+        stats = TraversalStats()
+        start = time.perf_counter()
+        pydantic_to_dag(frames, {}, {}, stats=stats)
+        best = min(best, time.perf_counter() - start)
+    print(
+        f"pydantic_to_dag, {args.frames} frames: {best * 1000:.1f} ms "
+        f"({stats.visited} objects visited, {stats.nodes_created} nodes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
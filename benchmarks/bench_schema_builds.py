@@ -0,0 +1,81 @@
+"""Time importing the models and building a first part, and list schema builds.
+
+Run from the repository root:
+
+    python benchmarks/bench_schema_builds.py [--repeat 5] [--top 10] [--all]
+
+Each measurement starts a fresh interpreter, imports the generated models and
+then builds and converts a two-brick assembly from ``assemblies.py``, which
+builds the schemas of the models it validates. The per-class build times
+come from ``schema_build_times()``; with ``--all`` the remaining deferred
+schemas are built as well, which is what importing the models used to cost
+up front.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import cadbuildr.foundation.gen.models
+from cadbuildr.foundation.gen.runtime import build_deferred_schemas, schema_build_times
+from cadbuildr.foundation.dag_utils import show_dag
+imported = time.perf_counter()
+
+from assemblies import make_assy
+show_dag(make_assy(2))
+built = time.perf_counter()
+if sys.argv[1] == "all":
+    build_deferred_schemas()
+print(json.dumps({
+    "import": imported - start,
+    "first_part": built - imported,
+    "all": time.perf_counter() - built,
+    "builds": schema_build_times(),
+}))
+"""
+
+
+def measure(build_all):
+    # The script imports the shared assembly builder from this directory.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, "all" if build_all else "used"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return json.loads(result.stdout)
+
+
+def best_of(fn, repeat):
+    return min((fn() for _ in range(repeat)), key=lambda run: run["import"] + run["first_part"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--all", action="store_true", help="also build every deferred schema")
+    args = parser.parse_args()
+
+    run = best_of(lambda: measure(args.all), args.repeat)
+    builds = run["builds"]
+    print(f"import models:        {run['import'] * 1000:.1f} ms")
+    print(f"first part + DAG:     {run['first_part'] * 1000:.1f} ms")
+    if args.all:
+        print(f"remaining schemas:    {run['all'] * 1000:.1f} ms")
+    print(f"schemas built:        {len(builds)} ({sum(builds.values()) * 1000:.1f} ms)")
+    for name, seconds in sorted(builds.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:<28} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Time short-id assignment for large node sets.
+
+Run from the repository root:
+
+    python benchmarks/bench_short_ids.py [--nodes 1000000] [--added 1000]
+"""
+
+import argparse
+import hashlib
+import time
+
+from cadbuildr.foundation.gen.dag import ShortIdMap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--added", type=int, default=1000)
+    args = parser.parse_args()
+
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(args.nodes)]
+    added = [hashlib.sha256(f"added{i}".encode()).hexdigest() for i in range(args.added)]
+
+    id_map = ShortIdMap()
+    start = time.perf_counter()
+    id_map.assign(hashes)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    id_map.assign(hashes + added)
+    rebuild = time.perf_counter() - start
+
+    lengths = [len(short_id) for short_id in id_map.as_dict().values()]
+    print(f"first build, {args.nodes} nodes: {first * 1000:.0f} ms")
+    print(f"rebuild adding {args.added} nodes: {rebuild * 1000:.0f} ms")
+    print(f"id length: max {max(lengths)}, mean {sum(lengths) / len(lengths):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Peak memory of show_dag + json.dumps versus stream_dag.
+
+Run from the repository root:
+
+    python benchmarks/bench_streaming.py [--bricks 200]
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from cadbuildr.foundation.dag_utils import show_dag, stream_dag
+
+from assemblies import make_assy
+
+
+def measure(export, bricks):
+    assy = make_assy(bricks, size=lambda i: 4 + i % 7, height=lambda i: 4 + i % 5)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as fp:
+        export(assy, fp)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=200)
+    args = parser.parse_args()
+
+    exports = {
+        "show_dag + json.dump": lambda assy, fp: json.dump(show_dag(assy), fp),
+        "stream_dag (ndjson)": lambda assy, fp: stream_dag(assy, fp),
+    }
+    for name, export in exports.items():
+        elapsed, peak = measure(export, args.bricks)
+        print(f"{name:22s} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
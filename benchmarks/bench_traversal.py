@@ -0,0 +1,67 @@
+"""Time DAG conversion of a brick assembly and of a deep Frame.top_frame chain.
+
+Run from the repository root:
+
+    python benchmarks/bench_traversal.py [--bricks 50] [--depth 5000] [--profile]
+
+``--profile`` also prints a per-type ConversionProfile of the assembly build.
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import ConversionProfile, TraversalStats, pydantic_to_dag
+from cadbuildr.foundation.gen.models import BoolParameter, Frame, StringParameter
+
+from assemblies import make_assy
+
+
+def make_chain(depth):
+    frame = None
+    for i in range(depth):
+        frame = Frame(
+            top_frame=frame,
+            name=StringParameter(value=f"f{i}"),
+            display=BoolParameter(value=False),
+            position=[0.0, 0.0, float(i)],
+            quaternion=[1.0, 0.0, 0.0, 0.0],
+        )
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        assy = make_assy(args.bricks, size=lambda i: 8)
+        start = time.perf_counter()
+        show_dag(assy)
+        best = min(best, time.perf_counter() - start)
+    print(f"show_dag, {args.bricks} bricks: {best * 1000:.1f} ms")
+
+    if args.profile:
+        profile = ConversionProfile(trace_allocations=True)
+        with profile:
+            show_dag(make_assy(args.bricks, size=lambda i: 8))
+        print(profile.table())
+
+    stats = TraversalStats()
+    chain = make_chain(args.depth)
+    start = time.perf_counter()
+    pydantic_to_dag(chain, {}, stats=stats)
+    elapsed = time.perf_counter() - start
+    print(
+        f"pydantic_to_dag, {args.depth}-deep frame chain: {elapsed * 1000:.1f} ms "
+        f"({stats.nodes_created} nodes, max stack depth {stats.max_depth})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Time validate_dag on a large assembly DAG.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_validation.py [--bricks 500]
+"""
+
+import argparse
+import time
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import validate_dag
+
+from assemblies import make_assy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bricks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dag = show_dag(make_assy(args.bricks))
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        report = validate_dag(dag)
+        best = min(best, time.perf_counter() - start)
+    print(f"{len(dag['DAG'])} nodes, ok={report.ok}: {best * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
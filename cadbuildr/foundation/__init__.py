@@ -1,30 +1,18 @@
-"""CADbuildr Foundation - Core types for parametric CAD (auto-generated from GraphQL schema)."""
+"""CADbuildr Foundation - Core types for parametric CAD (auto-generated from GraphQL schema).
 
-# Re-export all generated types dynamically
-from.gen.models import *
-from.gen.runtime import *
-
-# Import compute functions to register them
-from. import compute_functions  # noqa: F401
-
-# Import shape transformation methods to register them
-from. import shape_methods  # noqa: F401
+The generated models and the modules re-exported below are imported on first
+use (PEP 562), so ``import cadbuildr.foundation`` stays cheap for processes
+that never build a model. The generated models, wherever they are imported
+from, always come with the registrations of ``compute_functions``,
+``shape_methods`` and ``helpers``.
+"""
 
-# Import helpers to add monkey-patched methods
-from. import helpers  # noqa: F401
+from.lazy_imports import install_models_hook as _install_models_hook
 
-# Export PlaneFactory for backward compatibility
-from.helpers import PlaneFactory, TFHelper, anchor_plane, make_anchor
+# Before anything can import the generated models.
+_install_models_hook(__name__)
 
-# Export pattern classes
-from.pattern import (
-    CircularPattern,
-    RectangularPattern,
-    GridLocations,
-    HexLocations,
-    PolarLocations,
-    Locations,
-)
+from.gen.runtime import *
 
 # SDK parameter schema decorators
 from .parameters import (
@@ -37,18 +25,57 @@ from .parameters import (
     cadbuildr_project,
 )
 
-# DAG and WebRTC utilities
-from.dag_utils import show, show_dag
-from.coms.screenshot_framing import build_screenshot_framing, request_viewer_screenshot
-from.coms.utils_webrtc import (
-    set_port,
-    set_broker_url,
-    get_build_status,
-    get_screenshot,
-    wait_for_feedback,
-    collect_and_display_feedback,
-)
-from.coms.kernel_api import KernelApiClient, KernelApiError
+# Re-exported name -> submodule it is imported from on first use.
+_LAZY_EXPORTS = {
+    # PlaneFactory is exported for backward compatibility
+    "PlaneFactory": "helpers",
+    "TFHelper": "helpers",
+    "anchor_plane": "helpers",
+    "make_anchor": "helpers",
+    # Pattern classes
+    "CircularPattern": "pattern",
+    "RectangularPattern": "pattern",
+    "GridLocations": "pattern",
+    "HexLocations": "pattern",
+    "PolarLocations": "pattern",
+    "Locations": "pattern",
+    # DAG and WebRTC utilities
+    "show": "dag_utils",
+    "show_dag": "dag_utils",
+    "build_screenshot_framing": "coms.screenshot_framing",
+    "request_viewer_screenshot": "coms.screenshot_framing",
+    "set_port": "coms.utils_webrtc",
+    "set_broker_url": "coms.utils_webrtc",
+    "get_build_status": "coms.utils_webrtc",
+    "get_screenshot": "coms.utils_webrtc",
+    "wait_for_feedback": "coms.utils_webrtc",
+    "collect_and_display_feedback": "coms.utils_webrtc",
+    "KernelApiClient": "coms.kernel_api",
+    "KernelApiError": "coms.kernel_api",
+}
+
+# Set once the generated models are re-exported from this package.
+_models_loaded = False
+
+
+def _load_models() -> None:
+    """Import the generated models and re-export them from this package."""
+    global _models_loaded
+    from importlib import import_module
+
+    models = import_module(f"{__name__}.gen.models")
+    namespace = globals()
+    for name in models.__all__:
+        namespace.setdefault(name, getattr(models, name))
+    _models_loaded = True
+
+
+def _public_names() -> list:
+    """The names ``from cadbuildr.foundation import *`` imports."""
+    _load_models()
+    for name in _LAZY_EXPORTS:
+        __getattr__(name)
+    return [name for name in globals() if not name.startswith("_") and name != "lazy_imports"]
 
 
 # Helpful error hints for unknown-symbol imports (PEP 562).
@@ -61,6 +88,20 @@ from.coms.kernel_api import KernelApiClient, KernelApiError
 def __getattr__(name: str):
     import difflib
     import sys
+    from importlib import import_module
+
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is not None:
+        value = getattr(import_module(f"{__name__}.{module_name}"), name)
+        globals()[name] = value
+        return value
+    if name == "__all__":
+        return _public_names()
+    if not name.startswith("_") and not _models_loaded:
+        # The first lookup of any other public name loads the models.
+        _load_models()
+        if name in globals():
+            return globals()[name]
 
     # Dunder / sunder / private lookups shortcut — no one benefits from a
     # hint for `__path__` or `_pytest_something`, and producing one for
@@ -83,7 +124,7 @@ def __getattr__(name: str):
             continue
 
     # Close-match suggestions against top-level public API.
-    available = [n for n in dir(mod) if not n.startswith("_")]
+    available = [n for n in sorted(set(dir(mod)) | set(_LAZY_EXPORTS)) if not n.startswith("_")]
     close = difflib.get_close_matches(name, available, n=3, cutoff=0.6)
 
     hints: list[str] = []
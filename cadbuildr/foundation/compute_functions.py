@@ -4,8 +4,11 @@ from typing import Any, Callable, Iterable, Optional, Sequence
 import math
 import re
 
-from.gen.runtime import register_compute_fn, register_method_fn
-from.gen.runtime.helpers import register_cast_fn
+from pydantic import BaseModel
+
+from.gen.runtime import construct_trusted, register_compute_fn, register_method_fn
+from.gen.runtime.helpers import _METHOD, register_cast_fn
+from.mixin.sketch_mixin import deferred_registration
 
 
 @register_cast_fn("cast_edge_ref")
@@ -57,7 +60,18 @@ def get_sketch_origin(inst: Sketch, field_name: str, meta: dict[str, Any]) -> Po
     return Point(sketch=inst, x=FloatParameter(value=0.0), y=FloatParameter(value=0.0))
 
 
+def _trusted_point(sketch: Sketch, x: float, y: float) -> Point:
+    """Point at coordinates computed by the library, built without validation."""
+    return construct_trusted(
+        Point,
+        sketch=sketch,
+        x=construct_trusted(FloatParameter, value=float(x)),
+        y=construct_trusted(FloatParameter, value=float(y)),
+    )
+
+
 @register_compute_fn("compute_convex_hull_lines")
+@deferred_registration()
 def compute_convex_hull_lines(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -95,13 +109,17 @@ def compute_convex_hull_lines(
     hull = lower[:-1] + upper[:-1]
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     hull_pts = [pt(*c) for c in hull]
-    return [Line(p1=hull_pts[i], p2=hull_pts[(i + 1) % len(hull_pts)]) for i in range(len(hull_pts))]
+    return [
+        construct_trusted(Line, p1=hull_pts[i], p2=hull_pts[(i + 1) % len(hull_pts)])
+        for i in range(len(hull_pts))
+    ]
 
 
 @register_compute_fn("compute_helix2d_points")
+@deferred_registration()
 def compute_helix2d_points(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -132,7 +150,7 @@ def compute_helix2d_points(
         r = pitch * theta / (2 * math.pi)
         x = cx + r * math.cos(theta)
         y = cy + r * math.sin(theta)
-        out.append(Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y)))
+        out.append(_trusted_point(sketch, x, y))
     return out
 
 
@@ -279,6 +297,7 @@ def compute_jern_arc_midpoint(
 
 
 @register_compute_fn("compute_polyline_primitives")
+@deferred_registration()
 def compute_polyline_primitives(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -288,10 +307,11 @@ def compute_polyline_primitives(
     pts = list(inst.points)
     if len(pts) < 2:
         raise ValueError("Polyline requires at least 2 points")
-    return [Line(p1=pts[i], p2=pts[i + 1]) for i in range(len(pts) - 1)]
+    return [construct_trusted(Line, p1=pts[i], p2=pts[i + 1]) for i in range(len(pts) - 1)]
 
 
 @register_compute_fn("compute_fillet_polyline_primitives")
+@deferred_registration()
 def compute_fillet_polyline_primitives(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -313,7 +333,7 @@ def compute_fillet_polyline_primitives(
     coords = [(p.x.value, p.y.value) for p in pts]
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     def normalize(vx: float, vy: float) -> tuple[float, float]:
         mag = math.hypot(vx, vy)
@@ -322,7 +342,7 @@ def compute_fillet_polyline_primitives(
         return vx / mag, vy / mag
 
     if len(pts) == 2:
-        return [Line(p1=pts[0], p2=pts[1])]
+        return [construct_trusted(Line, p1=pts[0], p2=pts[1])]
 
     primitives: list = []
     # Walk segments. For each interior vertex i (1..N-2), compute the
@@ -344,7 +364,7 @@ def compute_fillet_polyline_primitives(
         alpha = two_alpha / 2.0
         if math.isclose(alpha, 0.0) or math.isclose(alpha, math.pi / 2):
             # Collinear or 180° turn — skip the fillet, treat as a straight pass.
-            primitives.append(Line(p1=pt(*prev_end), p2=pt(*b)))
+            primitives.append(construct_trusted(Line, p1=pt(*prev_end), p2=pt(*b)))
             prev_end = b
             continue
         tan_dist = radius / math.tan(alpha)
@@ -367,12 +387,12 @@ def compute_fillet_polyline_primitives(
         mid_offset = radius * (1.0 / sin_alpha - 1.0)
         mid = (b[0] + bx * mid_offset, b[1] + by * mid_offset)
 
-        primitives.append(Line(p1=pt(*prev_end), p2=pt(*t_in)))
-        primitives.append(Arc(p1=pt(*t_in), p2=pt(*mid), p3=pt(*t_out)))
+        primitives.append(construct_trusted(Line, p1=pt(*prev_end), p2=pt(*t_in)))
+        primitives.append(construct_trusted(Arc, p1=pt(*t_in), p2=pt(*mid), p3=pt(*t_out)))
         prev_end = t_out
 
     # Closing line to the last point.
-    primitives.append(Line(p1=pt(*prev_end), p2=pt(*coords[-1])))
+    primitives.append(construct_trusted(Line, p1=pt(*prev_end), p2=pt(*coords[-1])))
     return primitives
 
 
@@ -427,6 +447,7 @@ def compute_hole_axis_line(inst: Any, field_name: str, meta: dict[str, Any]) ->
 
 
 @register_compute_fn("compute_counterbore_profile_lines")
+@deferred_registration()
 def compute_counterbore_profile_lines(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -453,7 +474,7 @@ def compute_counterbore_profile_lines(
         raise ValueError("CounterBoreHole.cbore_depth must be less than depth")
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     p0 = pt(0.0, 0.0)
     p1 = pt(cb_rad, 0.0)
@@ -463,16 +484,17 @@ def compute_counterbore_profile_lines(
     p5 = pt(0.0, depth)
 
     return [
-        Line(p1=p0, p2=p1),
-        Line(p1=p1, p2=p2),
-        Line(p1=p2, p2=p3),
-        Line(p1=p3, p2=p4),
-        Line(p1=p4, p2=p5),
-        Line(p1=p5, p2=p0),
+        construct_trusted(Line, p1=p0, p2=p1),
+        construct_trusted(Line, p1=p1, p2=p2),
+        construct_trusted(Line, p1=p2, p2=p3),
+        construct_trusted(Line, p1=p3, p2=p4),
+        construct_trusted(Line, p1=p4, p2=p5),
+        construct_trusted(Line, p1=p5, p2=p0),
     ]
 
 
 @register_compute_fn("compute_countersink_profile_lines")
+@deferred_registration()
 def compute_countersink_profile_lines(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -507,7 +529,7 @@ def compute_countersink_profile_lines(
         )
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     p0 = pt(0.0, 0.0)
     p1 = pt(cs_rad, 0.0)
@@ -516,15 +538,16 @@ def compute_countersink_profile_lines(
     p4 = pt(0.0, depth)
 
     return [
-        Line(p1=p0, p2=p1),
-        Line(p1=p1, p2=p2),
-        Line(p1=p2, p2=p3),
-        Line(p1=p3, p2=p4),
-        Line(p1=p4, p2=p0),
+        construct_trusted(Line, p1=p0, p2=p1),
+        construct_trusted(Line, p1=p1, p2=p2),
+        construct_trusted(Line, p1=p2, p2=p3),
+        construct_trusted(Line, p1=p3, p2=p4),
+        construct_trusted(Line, p1=p4, p2=p0),
     ]
 
 
 @register_compute_fn("compute_slot_center_to_center_primitives")
+@deferred_registration()
 def compute_slot_center_to_center_primitives(
     inst: Any, field_name: str, meta: dict[str, Any]
 ) -> list:
@@ -547,7 +570,7 @@ def compute_slot_center_to_center_primitives(
     nx, ny = -uy, ux
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     # Side line endpoints.
     a1 = pt(p1x + nx * r, p1y + ny * r)  # +offset at p1
@@ -560,14 +583,15 @@ def compute_slot_center_to_center_primitives(
     mid_p1 = pt(p1x - ux * r, p1y - uy * r)
 
     return [
-        Line(p1=a1, p2=a2),
-        Arc(p1=a2, p2=mid_p2, p3=b1),
-        Line(p1=b1, p2=b2),
-        Arc(p1=b2, p2=mid_p1, p3=a1),
+        construct_trusted(Line, p1=a1, p2=a2),
+        construct_trusted(Arc, p1=a2, p2=mid_p2, p3=b1),
+        construct_trusted(Line, p1=b1, p2=b2),
+        construct_trusted(Arc, p1=b2, p2=mid_p1, p3=a1),
     ]
 
 
 @register_compute_fn("compute_rounded_rectangle_primitives")
+@deferred_registration()
 def compute_rounded_rectangle_primitives(inst: Any, field_name: str, meta: dict[str, Any]) -> list:
     """Build the 8 boundary primitives (4 lines + 4 arcs) of a RectangleRounded.
 
@@ -592,7 +616,7 @@ def compute_rounded_rectangle_primitives(inst: Any, field_name: str, meta: dict[
         )
 
     def pt(x: float, y: float) -> Point:
-        return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+        return _trusted_point(sketch, x, y)
 
     inv_sqrt2 = math.sqrt(2) / 2
 
@@ -613,14 +637,14 @@ def compute_rounded_rectangle_primitives(inst: Any, field_name: str, meta: dict[
     sw_mid = pt(cx - w / 2 + r - r * inv_sqrt2, cy - h / 2 + r - r * inv_sqrt2)
 
     return [
-        Line(p1=s_w, p2=s_e),
-        Arc(p1=s_e, p2=se_mid, p3=e_s),
-        Line(p1=e_s, p2=e_n),
-        Arc(p1=e_n, p2=ne_mid, p3=n_e),
-        Line(p1=n_e, p2=n_w),
-        Arc(p1=n_w, p2=nw_mid, p3=w_n),
-        Line(p1=w_n, p2=w_s),
-        Arc(p1=w_s, p2=sw_mid, p3=s_w),
+        construct_trusted(Line, p1=s_w, p2=s_e),
+        construct_trusted(Arc, p1=s_e, p2=se_mid, p3=e_s),
+        construct_trusted(Line, p1=e_s, p2=e_n),
+        construct_trusted(Arc, p1=e_n, p2=ne_mid, p3=n_e),
+        construct_trusted(Line, p1=n_e, p2=n_w),
+        construct_trusted(Arc, p1=n_w, p2=nw_mid, p3=w_n),
+        construct_trusted(Line, p1=w_n, p2=w_s),
+        construct_trusted(Arc, p1=w_s, p2=sw_mid, p3=s_w),
     ]
 
 
@@ -689,6 +713,126 @@ def add_element_method(inst: Sketch, element: Any) -> bool:
     return True
 
 
+# Stand-ins in element keys for the sketch the element belongs to, for list
+# values, and the result for values that cannot be keyed.
+_OWN_SKETCH = object()
+_LIST = object()
+_UNKEYABLE = object()
+
+_PLAIN_TYPES = frozenset((float, int, str, bool, type(None)))
+
+# Model class -> its field names, or None when its instances are not keyed.
+_KEY_FIELDS: dict[type, Optional[tuple[str, ...]]] = {}
+
+
+def _key_fields(cls: type) -> Optional[tuple[str, ...]]:
+    fields = None
+    if issubclass(cls, BaseModel) and cls.__pydantic_generic_metadata__["origin"] is None:
+        fields = tuple(cls.__pydantic_fields__)
+    _KEY_FIELDS[cls] = fields
+    return fields
+
+
+class _ElementKeys:
+    """
+    Hashable keys of sketch element values, such that two keyed values
+    compare equal exactly when their keys do.
+
+    Models are keyed by class and field values, lists item by item and the
+    sketch by identity; models with extra or private values, generic models,
+    models that contain themselves (another sketch, through its elements) and
+    any other objects get ``_UNKEYABLE``. Keys of models are memoized by id,
+    so an instance is only valid while the values do not change: each
+    add_elements_method call keys the current values with a new one.
+    """
+
+    def __init__(self, sketch: Sketch):
+        self.sketch = sketch
+        self.memo: dict[int, Any] = {}
+
+    def __call__(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type in _PLAIN_TYPES:
+            return value
+        if value is self.sketch:
+            return _OWN_SKETCH
+        if value_type is list:
+            keys = [_LIST]
+            for item in value:
+                key = self(item)
+                if key is _UNKEYABLE:
+                    return _UNKEYABLE
+                keys.append(key)
+            return tuple(keys)
+        key = self.memo.get(id(value))
+        if key is None:
+            # Seen again before its key is done, the model contains itself.
+            self.memo[id(value)] = _UNKEYABLE
+            key = self.memo[id(value)] = self._model_key(value, value_type)
+        return key
+
+    def _model_key(self, value: Any, value_type: type) -> Any:
+        fields = _KEY_FIELDS[value_type] if value_type in _KEY_FIELDS else _key_fields(value_type)
+        if fields is None or value.__pydantic_extra__ or value.__pydantic_private__ is not None:
+            return _UNKEYABLE
+        keys = [value_type]
+        values = value.__dict__
+        for name in fields:
+            if name not in values:
+                return _UNKEYABLE
+            key = self(values[name])
+            if key is _UNKEYABLE:
+                return _UNKEYABLE
+            keys.append(key)
+        return tuple(keys)
+
+
+@register_method_fn("add_elements_method")
+def add_elements_method(inst: Sketch, elements: list) -> bool:
+    """Add elements in order, skipping those already present, like repeated
+    add_element calls. Keyed elements (see _ElementKeys) are looked up by key
+    instead of being compared against every element of the sketch."""
+    if (
+        not isinstance(inst, Sketch)
+        or type(inst).add_element is not Sketch.add_element
+        or _METHOD.get("add_element_method") is not add_element_method
+    ):
+        for element in elements:
+            inst.add_element(element)
+        return True
+
+    if not hasattr(inst, "elements") or inst.elements is None:
+        inst.elements = []
+    current = inst.elements
+
+    element_key = _ElementKeys(inst)
+    present = {id(existing) for existing in current}
+    keys = set()
+    unkeyed = []
+    for existing in current:
+        key = element_key(existing)
+        if key is _UNKEYABLE:
+            unkeyed.append(existing)
+        else:
+            keys.add(key)
+
+    for element in elements:
+        if id(element) in present:
+            continue
+        key = element_key(element)
+        if key is _UNKEYABLE:
+            if element in current:
+                continue
+            unkeyed.append(element)
+        else:
+            if key in keys or element in unkeyed:
+                continue
+            keys.add(key)
+        current.append(element)
+        present.add(id(element))
+    return True
+
+
 @register_compute_fn("get_extrusion_sketch")
 def get_extrusion_sketch(inst: Any, field_name: str, meta: dict[str, Any]) -> Sketch:
     """Get the sketch for an extrusion from its shape."""
@@ -1514,8 +1658,11 @@ def _convert_component_to_root(
     if isinstance(component, AssemblyRoot):
         # Component is already an AssemblyRoot, recursively update its components
         if parent_frame is not None:
-            # Update this assembly's frame's top_frame
-            component.frame.top_frame = parent_frame
+            # Update this assembly's frame's top_frame. Like the PartRoot case,
+            # leave an equal frame in place so re-converting an unchanged
+            # assembly doesn't register as an edit.
+            if component.frame.top_frame != parent_frame:
+                component.frame.top_frame = parent_frame
             # Recursively update nested components
             for idx, child in enumerate(component.components):
                 _convert_component_to_root(
@@ -6,6 +6,8 @@ from typing import Any, Dict, Literal, Optional
 
 import requests
 
+from cadbuildr.foundation.gen.dag.diff import diff_dag
+
 DEFAULT_MESH_KERNEL = "replicad"
 DEFAULT_FEATURE_SCRIPT_KERNEL = "onshape-fs"
 MESH_KERNEL_ALLOWLIST = frozenset({"replicad", "truck"})
@@ -100,7 +102,17 @@ class KernelApiClient:
         client_request_id: Optional[str] = None,
         session_id: Optional[str] = None,
         file_name: Optional[str] = None,
+        base_dag: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any] | bytes:
+        """
+        Render ``dag`` with a mesh kernel.
+
+        When ``base_dag`` (a DAG this session rendered before) is given, the
+        request carries ``dagPatch`` -- the ``diff_dag`` patch from it --
+        instead of the full DAG. If the API rejects it with any 4xx status
+        (it does not know ``dagPatch``, or no longer holds the base), the
+        full DAG is sent instead.
+        """
         mesh_kernel = self._resolve_kernel(
             kernel,
             default_kernel=DEFAULT_MESH_KERNEL,
@@ -109,7 +121,11 @@ class KernelApiClient:
         )
         render_format = self._resolve_format(format)
 
-        payload: Dict[str, Any] = {"dag": dag, "kernel": mesh_kernel, "format": render_format}
+        payload: Dict[str, Any] = {"kernel": mesh_kernel, "format": render_format}
+        if base_dag is not None:
+            payload["dagPatch"] = diff_dag(base_dag, dag)
+        else:
+            payload["dag"] = dag
         if mesh_config:
             payload["meshConfig"] = mesh_config
         if client_request_id:
@@ -125,6 +141,17 @@ class KernelApiClient:
             headers=self._headers(request_id),
             timeout=self.timeout_s,
         )
+        if base_dag is not None and 400 <= response.status_code < 500:
+            return self.render(
+                dag=dag,
+                kernel=kernel,
+                format=format,
+                mesh_config=mesh_config,
+                request_id=request_id,
+                client_request_id=client_request_id,
+                session_id=session_id,
+                file_name=file_name,
+            )
         if render_format == "json":
             return self._parse_response(response)
         if response.status_code >= 400:
@@ -2,6 +2,8 @@ import json
 import time
 from typing import Any, Dict, Optional
 
+from cadbuildr.foundation.gen.dag.diff import diff_dag
+
 try:
     import requests
 
@@ -13,6 +15,8 @@ except ImportError:
 # Global configuration for broker URL
 BROKER_URL = "http://localhost:5050/send"
 _RECORDED_REQUEST_IDS: list[str] = []
+# Broker base URL -> whether it relays DAG patches to a viewer that applies them.
+_PATCH_SUPPORT: Dict[str, bool] = {}
 
 
 def create_dag_message(
@@ -22,6 +26,13 @@ def create_dag_message(
     return {"type": "@buildr/dag", "dag": dag, "request_id": request_id}
 
 
+def create_dag_patch_message(
+    patch: Dict[str, Any], request_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Create a typed DAG patch message (see ``diff_dag``) for the broker."""
+    return {"type": "@buildr/dag-patch", "patch": patch, "request_id": request_id}
+
+
 def set_broker_url(url: str):
     """
     Set the broker URL for sending DAG data.
@@ -44,7 +55,36 @@ def set_port(port: int):
     BROKER_URL = f"http://localhost:{port}/send"
 
 
-def show_ext(dag: Any, request_id: Optional[str] = None) -> Optional[str]:
+def broker_supports_patches(broker_url: Optional[str] = None) -> bool:
+    """
+    Whether the broker confirms it supports ``@buildr/dag-patch`` messages.
+
+    Asks ``GET <broker>/capabilities`` once per broker URL. Only a 200 answer
+    whose ``messageTypes`` list holds ``"@buildr/dag-patch"`` counts as
+    support; brokers without the endpoint (or unreachable ones) do not.
+
+    Args:
+        broker_url: Optional broker base URL (default: derived from BROKER_URL)
+    """
+    if broker_url is None:
+        broker_url = BROKER_URL.replace("/send", "")
+    supported = _PATCH_SUPPORT.get(broker_url)
+    if supported is None:
+        supported = False
+        if is_requests_available:
+            try:
+                response = requests.get(f"{broker_url}/capabilities", timeout=2.0)
+                if response.status_code == 200:
+                    supported = "@buildr/dag-patch" in response.json().get("messageTypes", [])
+            except Exception:
+                pass
+        _PATCH_SUPPORT[broker_url] = supported
+    return supported
+
+
+def show_ext(
+    dag: Any, request_id: Optional[str] = None, base_dag: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
     """
     Send DAG data to the broker via HTTP POST.
     The broker forwards the data to the viewer via WebRTC.
@@ -52,6 +92,14 @@ def show_ext(dag: Any, request_id: Optional[str] = None) -> Optional[str]:
     Args:
         dag: Dictionary containing DAG data to visualize
         request_id: Optional request ID for tracking
+        base_dag: Optional DAG previously sent to the viewer. When given and
+                  the broker confirms it supports patches (see
+                  ``broker_supports_patches``), only the patch from
+                  ``base_dag`` to ``dag`` is sent. The broker relays it as
+                  is, so the viewer must support patches as well: one that
+                  does not keeps showing the previous model. If the broker
+                  rejects the patch (e.g. it no longer has the base), or does
+                  not confirm patch support, the full DAG is sent instead.
 
     Returns:
         The request_id from the broker, or None if failed
@@ -63,11 +111,17 @@ def show_ext(dag: Any, request_id: Optional[str] = None) -> Optional[str]:
         return None
 
     try:
-        # Create typed message
-        message = create_dag_message(dag, request_id)
+        response = None
+        if base_dag is not None and broker_supports_patches():
+            message = create_dag_patch_message(diff_dag(base_dag, dag), request_id)
+            response = requests.post(BROKER_URL, json=message, timeout=2.0)
+
+        if response is None or response.status_code != 200:
+            # Create typed message
+            message = create_dag_message(dag, request_id)
 
-        # Send DAG to broker
-        response = requests.post(BROKER_URL, json=message, timeout=2.0)
+            # Send DAG to broker
+            response = requests.post(BROKER_URL, json=message, timeout=2.0)
 
         if response.status_code == 200:
             result = response.json()
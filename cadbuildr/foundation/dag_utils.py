@@ -1,31 +1,39 @@
 """Utilities for creating and formatting DAG structures from Pydantic models."""
 
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from typing import IO, Any, Dict, List, Optional, Tuple
 
-from cadbuildr.foundation.constants import DEFAULT_TYPE_REGISTRY, DEFAULT_VALID_TYPES
+from cadbuildr.foundation.constants import DEFAULT_TYPE_REGISTRY
 from cadbuildr.foundation.gen.models import Part, Assembly
 from cadbuildr.foundation.gen.dag import (
+    DagBuildCache,
+    DagStreamWriter,
+    ConversionProfile,
+    HookRegistry,
+    NodeStore,
+    ShortIdMap,
+    TraversalStats,
     format_dag,
     pydantic_to_dag,
+    convert_parallel,
     has_cycle,
     has_link_cycle,
 )
-from cadbuildr.foundation.gen.dag.validation import print_node_hierarchy_report
+from cadbuildr.foundation.gen.dag.profiling import active_profile
+from cadbuildr.foundation.gen.dag.validation import (
+    ConversionValidator,
+    DagIssue,
+    DagValidationError,
+    print_node_hierarchy_report,
+    validate_dag,
+)
 from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
 
 
-def show_dag(obj: Any, valid_types: Optional[List[str]] = None) -> Dict[str, Any]:
-    """
-    Convert a Pydantic model to a formatted DAG ready for visualization.
-
-    Args:
-        obj: Pydantic model instance
-        valid_types: Optional list of valid type names for expansion.
-                     If None, uses DEFAULT_VALID_TYPES.
-
-    Returns:
-        Formatted DAG dictionary
-    """
+def _prepare_conversion(
+    obj: Any, valid_types: Optional[List[str]]
+) -> Tuple[Any, HookRegistry, Dict[str, int]]:
+    """Return the object to convert, the hooks and the type registry to use."""
     # Convert Part/Assembly subclasses to their root representations
     # This ensures custom Part/Assembly classes get converted to PartRoot/AssemblyRoot
     if isinstance(obj, (Part, Assembly)):
@@ -40,19 +48,90 @@ def show_dag(obj: Any, valid_types: Optional[List[str]] = None) -> Dict[str, Any
     # Set up foundation-specific hooks
     hooks = setup_foundation_hooks()
 
-    memo: Dict[str, Any] = {}
-    type_registry = {}
-
     # Build type registry from valid_types
     if valid_types is None:
-        valid_types = DEFAULT_VALID_TYPES
         type_registry = DEFAULT_TYPE_REGISTRY.copy()
     else:
         # Create type registry from provided valid_types
         type_registry = {type_name: i for i, type_name in enumerate(valid_types)}
 
-    root_id = pydantic_to_dag(obj, memo, type_registry, hooks)
-    dag_data = format_dag(memo, root_id, type_registry)
+    return obj, hooks, type_registry
+
+
+def show_dag(
+    obj: Any,
+    valid_types: Optional[List[str]] = None,
+    cache: Optional[DagBuildCache] = None,
+    stats: Optional[TraversalStats] = None,
+    workers: Optional[int] = None,
+    id_map: Optional[ShortIdMap] = None,
+    validate: bool = False,
+    profile: Optional[ConversionProfile] = None,
+) -> Dict[str, Any]:
+    """
+    Convert a Pydantic model to a formatted DAG ready for visualization.
+
+    Args:
+        obj: Pydantic model instance
+        valid_types: Optional list of valid type names for expansion.
+                     If None, uses DEFAULT_VALID_TYPES.
+        cache: Optional DagBuildCache reused across calls. Unchanged subtrees
+               are taken from the cache instead of being re-traversed, so an
+               edit-rebuild loop only pays for the edited path.
+        stats: Optional TraversalStats filled with node counts and work-stack
+               depth statistics for the conversion.
+        workers: Optional process count for converting the components of an
+                 assembly in parallel. The DAG is identical to the serial
+                 one; assemblies that cannot be split safely (see
+                 ``convert_parallel``) are converted serially, as is
+                 everything where the fork start method is unavailable.
+                 Ignored when ``cache``, ``stats`` or a profile is given, or
+                 with ``validate``. The components are converted in the
+                 worker processes, so what converting does to the models
+                 there (computed fields filled in, elements an expansion
+                 registers in a sketch) does not happen to ``obj``.
+        id_map: Optional ShortIdMap kept for a session. A node keeps the
+                short id it was first given in every DAG built with the map.
+        validate: Check frame cycles and plane frames pointing to origin as
+                  nodes are converted, raising DagValidationError (with the
+                  object path) at the first problem.
+        profile: Optional ConversionProfile filled with per-type timings and
+                 the time spent converting and formatting. Defaults to the
+                 profile active as a context manager, if any.
+
+    Returns:
+        Formatted DAG dictionary
+    """
+    obj, hooks, type_registry = _prepare_conversion(obj, valid_types)
+    memo: Dict[str, Any] = {}
+    validator = ConversionValidator() if validate else None
+    if profile is None:
+        profile = active_profile()
+    if profile is not None:
+        convert_phase, format_phase = profile.phase("convert"), profile.phase("format")
+    else:
+        convert_phase = format_phase = nullcontext()
+
+    parallel = None
+    if workers is not None and cache is None and stats is None and validator is None and profile is None:
+        parallel = convert_parallel(obj, type_registry, hooks, workers)
+
+    with convert_phase:
+        if parallel is not None:
+            root_id, memo = parallel
+        elif cache is not None:
+            cache.begin(obj, type_registry)
+            root_id = pydantic_to_dag(
+                obj, cache.nodes, type_registry, hooks,
+                cache=cache, stats=stats, validator=validator, profile=profile,
+            )
+            memo = cache.finish(root_id, type_registry)
+        else:
+            root_id = pydantic_to_dag(
+                obj, memo, type_registry, hooks, stats=stats, validator=validator, profile=profile
+            )
+    with format_phase:
+        dag_data = format_dag(memo, root_id, type_registry, id_map=id_map)
 
     # Add serializableNodes mapping for frontend compatibility
     dag_data["serializableNodes"] = type_registry
@@ -60,6 +139,61 @@ def show_dag(obj: Any, valid_types: Optional[List[str]] = None) -> Dict[str, Any
     return dag_data
 
 
+def stream_dag(
+    obj: Any,
+    fp: IO[str],
+    valid_types: Optional[List[str]] = None,
+    mode: str = "ndjson",
+    store: Optional[NodeStore] = None,
+) -> str:
+    """
+    Convert a Pydantic model and write its DAG to ``fp`` as it is built.
+
+    Nodes are written in topological order (children first) the moment they
+    are finalized, followed by a footer with ``rootNodeId`` and
+    ``serializableNodes``; only node ids are kept in memory. Ids are the full
+    hashes. ``read_dag_stream`` turns the output into what ``show_dag``
+    returns.
+
+    Args:
+        obj: Pydantic model instance
+        fp: Text stream to write to (file, ``socket.makefile("w")``, ...)
+        valid_types: Optional list of valid type names for expansion.
+                     If None, uses DEFAULT_VALID_TYPES.
+        mode: ``"ndjson"`` (one node per line) or ``"json"`` (a single
+              document whose DAG object is written incrementally).
+        store: Optional NodeStore shared across exports. Nodes it already
+               holds are not written, and new nodes are added to it; read
+               the output back with ``read_dag_stream(fp, store)``.
+
+    Returns:
+        Full hash id of the root node
+    """
+    obj, hooks, type_registry = _prepare_conversion(obj, valid_types)
+    writer = DagStreamWriter(fp, mode, store)
+    root_id = pydantic_to_dag(obj, writer, type_registry, hooks)
+    writer.finish(root_id, type_registry)
+    return root_id
+
+
+def _report_issue(dag: Optional[Dict[str, Any]], issue: DagIssue) -> None:
+    """Print a validation issue found before sending a DAG."""
+    print("=" * 80)
+    print(f"BUG DETECTED: {issue.title}")
+    print("=" * 80)
+    print(issue.message)
+    if issue.path:
+        print(f"  Object path: {' -> '.join(issue.path)}")
+    if dag is not None and "node_info" in issue.details:
+        print_node_hierarchy_report(
+            dag,
+            issue.details["node_info"],
+            issue.details["node_type"],
+            issue.details["link_field"],
+        )
+    print("=" * 80)
+
+
 def show(obj: Any, valid_types: Optional[List[str]] = None) -> Optional[str]:
     """
     Show a CAD object by converting it to DAG and sending via WebRTC broker.
@@ -97,73 +231,18 @@ def show(obj: Any, valid_types: Optional[List[str]] = None) -> Optional[str]:
             obj = _convert_component_to_root(obj)
             _finalize_root_names(obj)
 
-        dag = show_dag(obj, valid_types)
-
-        # Check for cycles BEFORE sending to frontend (prevents infinite loops)
-        # This is critical - frontend will infinite loop if there's a cycle in frame hierarchy
-        has_cycle_bool, cycle_path, frame_info = has_link_cycle(
-            dag, "Frame", "top_frame"
-        )
-        if has_cycle_bool:
-            # Build detailed error message with frame names
-            cycle_names = [
-                frame_info.get(fid, {}).get("name", fid) for fid in cycle_path
-            ]
-            error_msg = (
-                f"ERROR: Frame cycle detected in DAG!\n"
-                f"  Cycle path (IDs): {' -> '.join(cycle_path)}\n"
-                f"  Cycle path (names): {' -> '.join(cycle_names)}\n"
-                f"  This will cause infinite loop in frontend. DAG not sent."
-            )
-            print("=" * 80)
-            print("BUG DETECTED: Frame Cycle")
-            print("=" * 80)
-            print(error_msg)
-            print_node_hierarchy_report(dag, frame_info, "Frame", "top_frame")
-            print("=" * 80)
-            raise ValueError(error_msg)
-
-        if has_cycle(dag):
-            error_msg = "ERROR: General cycle detected in DAG! This will cause infinite loop in frontend. DAG not sent."
-            print("=" * 80)
-            print("BUG DETECTED: General Cycle")
-            print("=" * 80)
-            print(error_msg)
-            print("=" * 80)
-            raise ValueError(error_msg)
-
-        # Check for plane frames pointing to origin (will cause frontend infinite loop)
-        frame_type_id = dag.get("serializableNodes", {}).get("Frame", -1)
-        if frame_type_id != -1:
-            for node_id, node in dag["DAG"].items():
-                if node.get("type") == frame_type_id:
-                    frame_name = (
-                        dag["DAG"]
-                        .get(node["deps"].get("name", ""), {})
-                        .get("params", {})
-                        .get("value", "")
-                    )
-                    top_frame_id = node["deps"].get("top_frame")
-                    if frame_name in ["yx", "yz", "zy", "xz", "zx"] and top_frame_id:
-                        top_frame = dag["DAG"].get(top_frame_id)
-                        if top_frame:
-                            top_frame_name = (
-                                dag["DAG"]
-                                .get(top_frame["deps"].get("name", ""), {})
-                                .get("params", {})
-                                .get("value", "")
-                            )
-                            if top_frame_name == "origin":
-                                error_msg = (
-                                    f"ERROR: Plane frame '{frame_name}' ({node_id}) points to 'origin' instead of component frame. "
-                                    f"This will cause frontend infinite loop. DAG not sent."
-                                )
-                                print("=" * 80)
-                                print("BUG DETECTED: Plane Frame Points to Origin")
-                                print("=" * 80)
-                                print(error_msg)
-                                print("=" * 80)
-                                raise ValueError(error_msg)
+        # Check for cycles and plane frames pointing to origin BEFORE sending to
+        # frontend (prevents infinite loops): while converting, then in a
+        # single pass over the finished DAG
+        try:
+            dag = show_dag(obj, valid_types, validate=True)
+        except DagValidationError as e:
+            _report_issue(None, e.issue)
+            raise
+        report = validate_dag(dag)
+        if not report.ok:
+            _report_issue(dag, report.issues[0])
+            raise ValueError(report.issues[0].message)
 
         request_id = show_ext(dag)
         return request_id
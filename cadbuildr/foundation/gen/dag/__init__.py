@@ -1,25 +1,60 @@
 """DAG utilities for converting Pydantic models to DAG format."""
 
-from .conversion import pydantic_to_dag
+from .binary import decode_dag, encode_dag
+from .conversion import TraversalStats, pydantic_to_dag
+from .diff import apply_patch, dag_fingerprint, diff_dag
 from .formatting import format_dag
 from .hash import compute_hash
+from .incremental import DagBuildCache
+from .parallel import convert_parallel
+from .profiling import ConversionProfile, TypeProfile
+from .short_ids import ShortIdMap
+from .store import NodeStore
+from .streaming import DagStreamWriter, read_dag_stream
 from .hooks import (
     HookRegistry,
     TraversalContext,
     clear_hooks,
     register_hook,
 )
-from .validation import has_cycle, has_link_cycle
+from .validation import (
+    ConversionValidator,
+    DagIssue,
+    DagValidationError,
+    DagValidationReport,
+    has_cycle,
+    has_link_cycle,
+    validate_dag,
+)
 
 __all__ = [
     "pydantic_to_dag",
+    "TraversalStats",
     "format_dag",
     "compute_hash",
+    "DagBuildCache",
+    "ShortIdMap",
+    "NodeStore",
+    "convert_parallel",
+    "ConversionProfile",
+    "TypeProfile",
+    "DagStreamWriter",
+    "read_dag_stream",
+    "encode_dag",
+    "decode_dag",
+    "diff_dag",
+    "apply_patch",
+    "dag_fingerprint",
     "HookRegistry",
     "TraversalContext",
     "register_hook",
     "clear_hooks",
     "has_cycle",
     "has_link_cycle",
+    "validate_dag",
+    "DagIssue",
+    "DagValidationReport",
+    "DagValidationError",
+    "ConversionValidator",
 ]
 
@@ -0,0 +1,346 @@
+"""Compact binary encoding of formatted DAGs.
+
+``encode_dag`` / ``decode_dag`` convert the dict produced by ``format_dag``
+(``version``, ``rootNodeId``, ``DAG``, ``serializableNodes``) to and from a
+byte string that decodes back to an equal dict, about a third the size of
+the JSON text. The format is opt-in: nothing in this package sends it by
+default. Layout, little-endian throughout::
+
+    magic b"CBDG", format version byte
+    string table     uvarint count, then (uvarint byte length, utf-8 bytes)*
+    version          string index
+    type registry    uvarint count, then (name string index, uvarint type id)*
+    nodes            uvarint count, then per node:
+                       id string index, uvarint type id, node kind byte
+                       kind 0: params (dict body), deps (dict body)
+                       kind 1: float64 -- {"params": {"value": x}, "deps": {}}
+    root             uvarint node index
+
+Values are tagged. Node references inside ``deps`` become node indices
+rather than id strings, lists of floats become packed float64 arrays, and
+ints are zigzag varints of any size. Every string (type names, node ids,
+keys, string values) is stored once in the string table.
+"""
+
+import struct
+from typing import Any, Dict, List, Tuple
+
+MAGIC = b"CBDG"
+FORMAT_VERSION = 1
+
+_NULL = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STRING = 5
+_LIST = 6
+_DICT = 7
+_NODE_REF = 8
+_FLOAT_ARRAY = 9
+
+_NODE_GENERAL = 0
+_NODE_SCALAR_FLOAT = 1
+
+_pack_double = struct.Struct("<d").pack
+_unpack_double = struct.Struct("<d").unpack_from
+
+
+def _write_uvarint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.strings: Dict[str, int] = {}
+        self.node_index: Dict[str, int] = {}
+        self.body = bytearray()
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def value(self, value: Any, refs: bool) -> None:
+        out = self.body
+        value_type = value.__class__
+        # Exact types first, most common first; one-byte varints inline.
+        if value_type is str:
+            index = self.node_index.get(value) if refs else None
+            if index is not None:
+                out.append(_NODE_REF)
+            else:
+                out.append(_STRING)
+                index = self.strings.get(value)
+                if index is None:
+                    index = self.strings[value] = len(self.strings)
+            if index < 0x80:
+                out.append(index)
+            else:
+                _write_uvarint(out, index)
+        elif value_type is float:
+            out.append(_FLOAT)
+            out += _pack_double(value)
+        elif value_type is dict:
+            out.append(_DICT)
+            self.dict_body(value, refs)
+        elif value_type is list or value_type is tuple:
+            self.sequence(value, refs)
+        elif value is None:
+            out.append(_NULL)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_uvarint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, str):
+            self.value(str.__str__(value), refs)
+        elif isinstance(value, (list, tuple)):
+            self.sequence(value, refs)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self.dict_body(value, refs)
+        else:
+            raise TypeError(f"Cannot encode {value_type.__name__} value in a binary DAG")
+
+    def sequence(self, value: Any, refs: bool) -> None:
+        out = self.body
+        if value and all(type(item) is float for item in value):
+            out.append(_FLOAT_ARRAY)
+            _write_uvarint(out, len(value))
+            out += struct.pack(f"<{len(value)}d", *value)
+        else:
+            out.append(_LIST)
+            _write_uvarint(out, len(value))
+            for item in value:
+                self.value(item, refs)
+
+    def dict_body(self, value: Dict[str, Any], refs: bool) -> None:
+        out = self.body
+        strings = self.strings
+        node_index = self.node_index
+        _write_uvarint(out, len(value))
+        for key, item in value.items():
+            index = strings.get(key)
+            if index is None:
+                if not isinstance(key, str):
+                    raise TypeError(f"Binary DAG dict keys must be str, got {type(key).__name__}")
+                index = strings[key] = len(strings)
+            if index < 0x80:
+                out.append(index)
+            else:
+                _write_uvarint(out, index)
+            if refs and item.__class__ is str and item in node_index:
+                # Most deps values: a single node reference.
+                index = node_index[item]
+                out.append(_NODE_REF)
+                if index < 0x80:
+                    out.append(index)
+                else:
+                    _write_uvarint(out, index)
+            else:
+                self.value(item, refs)
+
+
+def encode_dag(dag: Dict[str, Any]) -> bytes:
+    """Encode a formatted DAG (as returned by ``format_dag``/``show_dag``)."""
+    nodes: Dict[str, Any] = dag["DAG"]
+    encoder = _Encoder()
+    encoder.node_index = {node_id: i for i, node_id in enumerate(nodes)}
+    body = encoder.body
+
+    _write_uvarint(body, encoder.string(dag["version"]))
+    registry: Dict[str, int] = dag["serializableNodes"]
+    _write_uvarint(body, len(registry))
+    for type_name, type_id in registry.items():
+        _write_uvarint(body, encoder.string(type_name))
+        _write_uvarint(body, type_id)
+
+    _write_uvarint(body, len(nodes))
+    for node_id, node in nodes.items():
+        _write_uvarint(body, encoder.string(node_id))
+        _write_uvarint(body, node["type"])
+        params = node["params"]
+        deps = node["deps"]
+        if not deps and len(params) == 1 and type(params.get("value")) is float and len(node) == 3:
+            body.append(_NODE_SCALAR_FLOAT)
+            body += _pack_double(params["value"])
+        else:
+            body.append(_NODE_GENERAL)
+            encoder.dict_body(params, refs=False)
+            encoder.dict_body(deps, refs=True)
+
+    _write_uvarint(body, encoder.node_index[dag["rootNodeId"]])
+
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    _write_uvarint(out, len(encoder.strings))
+    for string in encoder.strings:
+        encoded = string.encode("utf-8")
+        _write_uvarint(out, len(encoded))
+        out += encoded
+    out += body
+    return bytes(out)
+
+
+class _Decoder:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+        self.strings: List[str] = []
+
+    def uvarint(self) -> int:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            try:
+                byte = data[self.pos]
+            except IndexError:
+                raise ValueError("Truncated binary DAG") from None
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def byte(self) -> int:
+        try:
+            value = self.data[self.pos]
+        except IndexError:
+            raise ValueError("Truncated binary DAG") from None
+        self.pos += 1
+        return value
+
+    def double(self) -> float:
+        end = self.pos + 8
+        if end > len(self.data):
+            raise ValueError("Truncated binary DAG")
+        value = _unpack_double(self.data, self.pos)[0]
+        self.pos = end
+        return value
+
+    def doubles(self, count: int) -> Tuple[float, ...]:
+        end = self.pos + 8 * count
+        if end > len(self.data):
+            raise ValueError("Truncated binary DAG")
+        values = struct.unpack_from(f"<{count}d", self.data, self.pos)
+        self.pos = end
+        return values
+
+    def string(self) -> str:
+        return self.strings[self.uvarint()]
+
+    def value(self) -> Any:
+        tag = self.byte()
+        if tag == _FLOAT:
+            return self.double()
+        if tag == _STRING:
+            return self.string()
+        if tag == _NODE_REF:
+            # Resolved to an id once every node is known.
+            return _Ref(self.uvarint())
+        if tag == _INT:
+            zigzag = self.uvarint()
+            return (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+        if tag == _FLOAT_ARRAY:
+            return list(self.doubles(self.uvarint()))
+        if tag == _LIST:
+            return [self.value() for _ in range(self.uvarint())]
+        if tag == _DICT:
+            return self.dict_body()
+        if tag == _NULL:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        raise ValueError(f"Unknown value tag {tag} in binary DAG")
+
+    def dict_body(self) -> Dict[str, Any]:
+        result = {}
+        for _ in range(self.uvarint()):
+            key = self.string()
+            result[key] = self.value()
+        return result
+
+
+class _Ref(int):
+    """Node index read from a deps value, before ids are resolved."""
+
+
+def _resolve_refs(value: Any, node_ids: List[str]) -> Any:
+    if type(value) is _Ref:
+        return node_ids[value]
+    if isinstance(value, list):
+        return [_resolve_refs(item, node_ids) for item in value]
+    if isinstance(value, dict):
+        return {key: _resolve_refs(item, node_ids) for key, item in value.items()}
+    return value
+
+
+def decode_dag(data: bytes) -> Dict[str, Any]:
+    """Decode bytes from ``encode_dag`` back into a formatted DAG dict."""
+    try:
+        return _decode(data)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Truncated or corrupt binary DAG: {e}") from e
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    if data[:4] != MAGIC:
+        raise ValueError("Not a binary DAG (bad magic)")
+    decoder = _Decoder(data)
+    decoder.pos = 4
+    version = decoder.byte()
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary DAG format version {version}")
+
+    strings = decoder.strings
+    for _ in range(decoder.uvarint()):
+        length = decoder.uvarint()
+        end = decoder.pos + length
+        if end > len(data):
+            raise ValueError("Truncated binary DAG")
+        strings.append(data[decoder.pos:end].decode("utf-8"))
+        decoder.pos = end
+
+    dag_version = decoder.string()
+    registry: Dict[str, int] = {}
+    for _ in range(decoder.uvarint()):
+        type_name = decoder.string()
+        registry[type_name] = decoder.uvarint()
+
+    nodes: Dict[str, Any] = {}
+    node_ids: List[str] = []
+    for _ in range(decoder.uvarint()):
+        node_id = decoder.string()
+        type_id = decoder.uvarint()
+        kind = decoder.byte()
+        if kind == _NODE_SCALAR_FLOAT:
+            node = {"type": type_id, "params": {"value": decoder.double()}, "deps": {}}
+        elif kind == _NODE_GENERAL:
+            params = decoder.dict_body()
+            node = {"type": type_id, "params": params, "deps": decoder.dict_body()}
+        else:
+            raise ValueError(f"Unknown node kind {kind} in binary DAG")
+        nodes[node_id] = node
+        node_ids.append(node_id)
+
+    for node in nodes.values():
+        if node["deps"]:
+            node["deps"] = _resolve_refs(node["deps"], node_ids)
+
+    root_index = decoder.uvarint()
+    return {
+        "version": dag_version,
+        "rootNodeId": node_ids[root_index],
+        "DAG": nodes,
+        "serializableNodes": registry,
+    }
@@ -1,11 +1,174 @@
 """Core Pydantic model to DAG node conversion."""
 
-from typing import Any, Dict, Optional, Set
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
 
 from pydantic import BaseModel
 
+from cadbuildr.foundation.mixin.sketch_mixin import recorded_registrations, register_elements
+
 from .hash import compute_hash
-from .hooks import HookRegistry, TraversalContext, run_hooks
+from .hooks import HookRegistry, TraversalContext, call_hooks
+from .incremental import DagBuildCache
+from .plan import SCALAR_VALUE_TYPES, ConversionPlan, FieldPlan, get_plan
+from .profiling import ConversionProfile, _perf_counter, active_profile
+from .validation import ConversionValidator, DagValidationError
+
+
+# Flyweight node hashes of scalar parameter nodes:
+# (type id, value type, value) -> node hash. A node's hash depends only on its
+# content, so entries stay valid across conversions and type registries.
+_SCALAR_HASHES: Dict[tuple, str] = {}
+_MAX_SCALAR_HASHES = 65536
+
+
+def _scalar_key(type_id: int, value: Any) -> tuple:
+    value_type = value.__class__
+    # 0.0 == -0.0 but they encode (and hash) differently.
+    if value_type is float and value == 0.0:
+        return (type_id, value_type, value, repr(value))
+    return (type_id, value_type, value)
+
+
+# Most expansions remembered by one conversion (least recently used dropped).
+_MAX_EXPANSIONS = 4096
+
+# Objects holding more models than this, or nested deeper, are not keyed
+# (and so expanded every time): keying them would cost about as much.
+_MAX_KEY_MODELS = 256
+_MAX_KEY_DEPTH = 32
+
+_object_setattr = object.__setattr__
+
+# Returned by _KeyBuilder for values an expansion key cannot describe.
+_UNKEYED = object()
+
+
+class _ExpansionMemo:
+    """
+    The expansions done during one conversion, keyed by the content of the
+    object before expansion (see ``_expansion_key``).
+
+    Each entry holds the node hash the expansion resolved to, the models
+    its original's key describes (``refs``) and the sketch registrations the
+    expansion and the conversion of its result made, as (index in refs of
+    the sketch, element, field values when registered, field values once
+    converted) tuples. A hit repeats those registrations with copies of the
+    elements (see ``_Traversal._replay``).
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self):
+        self.entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[tuple]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, node_hash: str, refs: list, registrations: List[tuple]) -> None:
+        """Remember an expansion, unless it registered elements outside ``refs``."""
+        positions = {id(ref): index for index, ref in enumerate(refs)}
+        recorded = []
+        for sketch, element, values in registrations:
+            index = positions.get(id(sketch))
+            if index is None:
+                return
+            recorded.append((index, element, values, element.__dict__.copy()))
+        self.entries[key] = (node_hash, refs, recorded)
+        self.entries.move_to_end(key)
+        if len(self.entries) > _MAX_EXPANSIONS:
+            self.entries.popitem(last=False)
+
+
+class _KeyBuilder:
+    """Builds one expansion key, see ``_expansion_key``."""
+
+    __slots__ = ("hooks", "refs", "seen", "seen_skipped")
+
+    def __init__(self, hooks: Optional[HookRegistry], refs: list):
+        self.hooks = hooks
+        self.refs = refs
+        # id -> index in refs, of the models keyed by content and of those
+        # only met in skipped fields.
+        self.seen: Dict[int, int] = {}
+        self.seen_skipped: Dict[int, int] = {}
+
+    def entry(self, value: Any, depth: int) -> Any:
+        if value is None:
+            return None
+        value_type = value.__class__
+        if value_type in SCALAR_VALUE_TYPES:
+            return _scalar_key(None, value)
+        if isinstance(value, BaseModel):
+            return self.model_entry(value, value_type, depth)
+        if value_type is list or value_type is tuple:
+            entries = []
+            for item in value:
+                entry = self.entry(item, depth + 1)
+                if entry is _UNKEYED:
+                    return _UNKEYED
+                entries.append(entry)
+            return (value_type, tuple(entries))
+        return _UNKEYED
+
+    def model_entry(self, value: BaseModel, value_type: type, depth: int) -> Any:
+        refs = self.refs
+        index = self.seen.get(id(value))
+        if index is not None:
+            return ("ref", index)
+        plan = get_plan(value, self.hooks)
+        if plan.scalar and value.value.__class__ in SCALAR_VALUE_TYPES:
+            return _scalar_key(value_type, value.value)
+        if value.__pydantic_extra__ or len(refs) >= _MAX_KEY_MODELS or depth >= _MAX_KEY_DEPTH:
+            return _UNKEYED
+        self.seen[id(value)] = len(refs)
+        refs.append(value)
+        values = value.__dict__
+        entries = [value_type]
+        for field_plan in plan.fields:
+            entry = self.entry(values.get(field_plan.name), depth + 1)
+            if entry is _UNKEYED:
+                return _UNKEYED
+            entries.append(entry)
+        for name in plan.skipped:
+            entries.append(self.skipped_entry(values.get(name)))
+        return tuple(entries)
+
+    def skipped_entry(self, value: Any) -> Any:
+        # Not part of the node (a sketch element's sketch), so only which
+        # model it is matters: to map it onto the other object's.
+        if not isinstance(value, BaseModel):
+            return ("skipped", value.__class__)
+        index = self.seen_skipped.get(id(value))
+        if index is None:
+            index = self.seen_skipped[id(value)] = len(self.refs)
+            self.refs.append(value)
+        return ("skipped", value.__class__, index)
+
+
+def _expansion_key(obj: BaseModel, hooks: Optional[HookRegistry], refs: list) -> Optional[tuple]:
+    """
+    Key of ``obj``'s expansion: the content of ``obj`` before expansion.
+
+    Primitives and scalar parameters are keyed by value, other models by
+    class and the raw values of their converted fields, so computed fields
+    are keyed as they are before the expansion fills them in. A model met
+    again is keyed by its position, so the key also records which values
+    are shared. Skipped fields are keyed by which model they hold, not by
+    its content. None if a field holds something else (or extra fields are
+    set), or the object is too large to key.
+
+    Every model the key describes, the models in skipped fields included,
+    is appended to ``refs`` in key order, so the refs of two objects with
+    equal keys correspond one to one.
+    """
+    entry = _KeyBuilder(hooks, refs).entry(obj, 0)
+    return None if entry is _UNKEYED else entry
 
 
 def _get_type_id(type_name: str, type_registry: Dict[str, int]) -> int:
@@ -17,34 +180,6 @@ def _get_type_id(type_name: str, type_registry: Dict[str, int]) -> int:
     return type_registry[type_name]
 
 
-def _expand_type_if_needed(
-    obj: BaseModel,
-    type_name: str,
-    valid_types: set,
-    context: TraversalContext,
-    hooks: Optional[HookRegistry]
-) -> Optional[BaseModel]:
-    """
-    Expand a type if it's not in valid_types and has an expand method.
-    
-    Returns:
-        Expanded object if expansion occurred, None otherwise
-    """
-    if type_name not in valid_types and hasattr(obj, 'expand'):
-        expanded = obj.expand()
-        if expanded is not None:
-            # Run after_expand hook for custom processing (e.g., sketch propagation)
-            # Pass both original and expanded objects via context
-            if hooks:
-                # Store expanded object in context for hooks to access
-                context.expanded_obj = expanded
-                run_hooks("after_expand", obj, context, hooks)
-                expanded = context.expanded_obj  # Hook may have modified it
-            return expanded
-        raise Exception(f"Failed to expand {type_name} into {expanded}")
-    return None
-
-
 def _compute_field_if_needed(obj: BaseModel, field_name: str) -> Any:
     """Compute a field value if it's None and the object has a compute method."""
     field_value = getattr(obj, field_name)
@@ -58,145 +193,576 @@ def _compute_field_if_needed(obj: BaseModel, field_name: str) -> Any:
     return field_value
 
 
-def _should_skip_field(field_name: str, obj: BaseModel, hooks: Optional[HookRegistry], context: TraversalContext) -> bool:
-    """Check if a field should be skipped during processing."""
-    if hooks:
-        # Check both type-specific and wildcard hooks
-        type_name = obj.__class__.__name__
-        hooks_to_check = hooks.get_hooks("should_skip_field", type_name) + hooks.get_hooks("should_skip_field", "*")
-        for hook in hooks_to_check:
-            try:
-                if hook(field_name, obj, context):
-                    return True
-            except Exception:
-                pass
+def _should_skip_field(field_plan: FieldPlan, obj: BaseModel, context: TraversalContext) -> bool:
+    """Ask the field's per-object should_skip_field hooks whether to skip it."""
+    for hook in field_plan.skip_hooks:
+        try:
+            if hook(field_plan.name, obj, context):
+                return True
+        except Exception:
+            pass
     return False
 
 
-def _process_single_field(
-    field_name: str,
+def _run_field_hooks(
+    field_plan: FieldPlan,
     field_value: Any,
     obj: BaseModel,
-    type_name: str,
-    memo: Dict[str, Any],
-    type_registry: Dict[str, int],
-    context: TraversalContext,
-    hooks: Optional[HookRegistry]
-) -> tuple[Optional[Any], Optional[Any]]:
+    context: TraversalContext
+) -> Optional[tuple[Optional[Any], Optional[Any]]]:
     """
-    Process a single field value.
-    
+    Run the field-level hooks for one field.
+
     Returns:
-        Tuple of (param_value, dep_value). One will be None, the other will have the value.
+        The (param_value, dep_value) tuple of a ``process_field`` hook that
+        handled the field, or None if the field should be converted normally.
     """
-    # Run before_field hook
-    if hooks:
-        field_context = TraversalContext(
-            memo=context.memo,
-            type_registry=context.type_registry,
-            valid_types=context.valid_types,
-            current_path=context.current_path,
-            is_first_encounter=context.is_first_encounter,
-            node_hash=context.node_hash,
-            field_name=field_name
-        )
-        run_hooks("before_field", obj, field_context, hooks)
-        
-        # Check if field should be processed as a special case
-        special_hooks = hooks.get_hooks("process_field", f"{type_name}.{field_name}")
-        for hook in special_hooks:
-            try:
-                result = hook(field_name, field_value, obj, field_context)
-                if result is not None:
-                    return result  # Hook handled the field
-            except Exception:
-                pass
-    
-    processing_set = context.processing if hasattr(context, 'processing') else None
+    field_name = field_plan.name
+    field_context = TraversalContext(
+        memo=context.memo,
+        type_registry=context.type_registry,
+        valid_types=context.valid_types,
+        current_path=context.current_path,
+        is_first_encounter=context.is_first_encounter,
+        node_hash=context.node_hash,
+        field_name=field_name
+    )
+    if field_plan.before_field:
+        call_hooks(field_plan.before_field, "before_field", obj, field_context)
 
-    def _convert_nested(value: Any) -> tuple[bool, Any]:
-        if isinstance(value, BaseModel):
-            return True, pydantic_to_dag(value, memo, type_registry, hooks, processing_set)
-        if isinstance(value, list):
-            has_dep = False
-            out = []
-            for item in value:
-                item_dep, converted = _convert_nested(item)
-                has_dep = has_dep or item_dep
-                out.append(converted)
-            return has_dep, out
-        if isinstance(value, tuple):
-            has_dep = False
-            out = []
-            for item in value:
-                item_dep, converted = _convert_nested(item)
-                has_dep = has_dep or item_dep
-                out.append(converted)
-            return has_dep, out
-        if isinstance(value, set):
-            has_dep = False
-            out = []
-            for item in value:
-                item_dep, converted = _convert_nested(item)
-                has_dep = has_dep or item_dep
-                out.append(converted)
-            return has_dep, out
-        if isinstance(value, dict):
-            has_dep = False
-            out = {}
-            for k, item in value.items():
-                item_dep, converted = _convert_nested(item)
-                has_dep = has_dep or item_dep
-                out[k] = converted
-            return has_dep, out
-        return False, value
-
-    has_dep, converted_value = _convert_nested(field_value)
-    if has_dep:
-        return None, converted_value
-    # Primitive value - store in params
-    return converted_value, None
-
-
-def _process_fields(
-    obj: BaseModel,
-    memo: Dict[str, Any],
-    type_registry: Dict[str, int],
-    context: TraversalContext,
-    hooks: Optional[HookRegistry]
-) -> tuple[dict, dict]:
+    # Check if field should be processed as a special case
+    for hook in field_plan.field_hooks:
+        try:
+            result = hook(field_name, field_value, obj, field_context)
+            if result is not None:
+                return result  # Hook handled the field
+        except Exception:
+            pass
+    return None
+
+
+@dataclass
+class TraversalStats:
     """
-    Process all fields of an object.
-    
-    Returns:
-        Tuple of (params, deps)
+    Counters filled in by ``pydantic_to_dag`` when passed a ``stats`` object.
+
+    ``expansion_hits`` counts objects whose node was taken from an identical
+    earlier expansion instead of being expanded and converted again.
+
+    The same instance can be passed to several calls to accumulate totals.
+    ``max_depth`` is the largest number of nodes in progress at once (the
+    work-stack size), and ``depth_histogram`` maps a stack depth to the number
+    of nodes completed at that depth.
     """
-    params = {}
-    deps = {}
-    
-    # Work with actual Pydantic field values, not dumped data
-    for field_name in obj.model_fields.keys():
-        # Check if field should be skipped
-        if _should_skip_field(field_name, obj, hooks, context):
-            continue
-        
-        # Compute field if needed
-        field_value = _compute_field_if_needed(obj, field_name)
-        
-        if field_value is None:
-            continue
-        
-        # Process the field
-        param_value, dep_value = _process_single_field(
-            field_name, field_value, obj, obj.__class__.__name__, memo, type_registry, context, hooks
-        )
-        
-        if param_value is not None:
-            params[field_name] = param_value
-        if dep_value is not None:
-            deps[field_name] = dep_value
-    
-    return params, deps
+    visited: int = 0
+    nodes_created: int = 0
+    memo_hits: int = 0
+    cache_hits: int = 0
+    expansions: int = 0
+    expansion_hits: int = 0
+    max_depth: int = 0
+    depth_histogram: Dict[int, int] = field(default_factory=dict)
+
+
+# Returned by _Traversal.enter when the object was pushed onto the work stack.
+_PENDING = object()
+# Frame.walk value while a field holding a single model waits for its hash.
+_SINGLE = object()
+
+
+class _Frame:
+    """A node under construction on the traversal work stack."""
+
+    __slots__ = (
+        "obj", "obj_id", "plan", "context", "field_index",
+        "field_name", "walk", "params", "deps", "children", "aliases",
+    )
+
+    def __init__(self, obj, plan, context, children, aliases):
+        self.obj = obj
+        self.obj_id = id(obj)
+        self.plan = plan
+        self.context = context
+        self.field_index = 0
+        self.field_name = None
+        # Pending container walk of the current field: a list of
+        # [items iterator, out, is_dict, pending key, has_dep, key in parent].
+        self.walk = None
+        self.params = {}
+        self.deps = {}
+        self.children = children
+        # (original, expanded, expansion key, refs, registrations before the
+        # expansion) of the expansions that resolve to this node, outermost
+        # first.
+        self.aliases = aliases
+
+
+class _Traversal:
+    """
+    Post-order conversion driven by an explicit work stack.
+
+    Each model being converted is a ``_Frame``. A frame walks its fields (and
+    any lists/tuples/sets/dicts inside them) until it reaches a child model,
+    which is entered in turn; when a frame runs out of fields its node is
+    hashed and the hash is handed back to the frame below. Hooks, computed
+    fields, type ids and memo insertion happen in the same order as a
+    depth-first recursive conversion, so the output is identical.
+
+    An object whose expansion matches one already converted (same class and
+    field content, see ``_expansion_key``) resolves to that node's hash
+    without being expanded; hooks do not run for the skipped subtree. The
+    sketch registrations the first expansion made are repeated with copies
+    of its elements, so sketches converted later hold the same elements.
+    With a ``cache`` the cache's identity entries take this role instead.
+    """
+
+    def __init__(self, memo, type_registry, hooks, processing, cache, stats, validator=None, profile=None):
+        self.memo = memo
+        self.type_registry = type_registry
+        self.valid_types = set(type_registry.keys())
+        self.hooks = hooks
+        self.processing = processing
+        self.cache = cache
+        self.stats = stats
+        self.validator = validator
+        self.profile = profile
+        self.expansions = _ExpansionMemo() if cache is None else None
+        # Sketch registrations made so far, while expansions are memoized.
+        self.registrations: Optional[List[tuple]] = None
+        self.stack: List[_Frame] = []
+        if profile is None:
+            self._call_hooks = call_hooks
+            self._should_skip_field = _should_skip_field
+            self._run_field_hooks = _run_field_hooks
+            self._compute_field = _compute_field_if_needed
+        else:
+            self._call_hooks = profile.timed("hooks", call_hooks, 2)
+            self._should_skip_field = profile.timed("hooks", _should_skip_field, 1)
+            self._run_field_hooks = profile.timed("hooks", _run_field_hooks, 2)
+            self._compute_field = profile.timed("compute", _compute_field_if_needed, 0)
+
+    def path(self) -> List[str]:
+        """Object path to the field being converted, one "Type.field" per level."""
+        return [f"{frame.plan.type_name}.{frame.field_name}" for frame in self.stack]
+
+    def run(self, obj: BaseModel) -> str:
+        if self.expansions is None:
+            return self._run(obj)
+        with recorded_registrations() as registrations:
+            self.registrations = registrations
+            return self._run(obj)
+
+    def _run(self, obj: BaseModel) -> str:
+        result = self.enter(obj)
+        stack = self.stack
+        if not stack:
+            return result
+        try:
+            while True:
+                frame = stack[-1]
+                child = self.advance(frame)
+                if child is not None:
+                    result = self.enter(child)
+                    if result is not _PENDING:
+                        self.deliver(frame, result)
+                    continue
+                result = self.finish(frame)
+                stack.pop()
+                if not stack:
+                    return result
+                self.deliver(stack[-1], result)
+        except BaseException:
+            for frame in stack:
+                self.processing.discard(frame.obj_id)
+            stack.clear()
+            if self.profile is not None:
+                self.profile.node_abandoned()
+            raise
+
+    def enter(self, obj: Any) -> Any:
+        """Resolve ``obj`` to its hash, or push a frame and return _PENDING."""
+        cache = self.cache
+        hooks = self.hooks
+        stats = self.stats
+        aliases = None
+        while True:
+            # Handle primitive types
+            if not isinstance(obj, BaseModel):
+                result = obj
+                break
+            if cache is not None:
+                result = cache.lookup(obj)
+                if result is not None:
+                    if stats is not None:
+                        stats.cache_hits += 1
+                    break
+
+            obj_id = id(obj)
+            type_name = obj.__class__.__name__
+            # A true cycle in the object graph cannot be converted to a DAG.
+            if obj_id in self.processing:
+                self._raise_cycle(obj_id, type_name)
+
+            if stats is not None:
+                stats.visited += 1
+
+            plan = get_plan(obj, hooks)
+            if plan.scalar:
+                value = obj.value
+                if value.__class__ in SCALAR_VALUE_TYPES:
+                    result = self._scalar_node(obj, plan, value)
+                    break
+
+            context = None
+            if plan.needs_context:
+                context = TraversalContext(
+                    memo=self.memo,
+                    type_registry=self.type_registry,
+                    valid_types=self.valid_types,
+                    current_path=self.path() if self.validator is not None else []
+                )
+                # Run on_encounter hook (before processing)
+                if plan.on_encounter:
+                    self._call_hooks(plan.on_encounter, "on_encounter", obj, context)
+
+            # Expand types that are not valid DAG node types. Types registered
+            # while converting are never expandable ones, so the live registry
+            # gives the same answer as the initial snapshot.
+            if plan.expandable and type_name not in self.type_registry:
+                key = refs = None
+                start = 0
+                if self.expansions is not None:
+                    refs = []
+                    key = _expansion_key(obj, hooks, refs)
+                    if key is not None:
+                        entry = self.expansions.get(key)
+                        if entry is not None:
+                            result = self._replay(entry, refs)
+                            if stats is not None:
+                                stats.expansion_hits += 1
+                            break
+                        start = len(self.registrations)
+                expanded = self._expand(obj, plan, context)
+                if stats is not None:
+                    stats.expansions += 1
+                if aliases is None:
+                    aliases = []
+                aliases.append((obj, expanded, key, refs, start))
+                obj = expanded
+                continue
+
+            self.processing.add(obj_id)
+            if self.profile is not None:
+                self.profile.node_started(type_name)
+            stack = self.stack
+            stack.append(_Frame(obj, plan, context, [] if cache is not None else None, aliases))
+            if stats is not None and len(stack) > stats.max_depth:
+                stats.max_depth = len(stack)
+            return _PENDING
+
+        if aliases:
+            self._store_aliases(aliases, result)
+        return result
+
+    def _scalar_node(self, obj: BaseModel, plan: ConversionPlan, value: Any) -> str:
+        """Convert a scalar parameter without pushing a frame, reusing its hash."""
+        profile = self.profile
+        if profile is not None:
+            profile.node_started(plan.type_name)
+        type_id = _get_type_id(plan.type_name, self.type_registry)
+        key = _scalar_key(type_id, value)
+        node_hash = _SCALAR_HASHES.get(key)
+        memo = self.memo
+        created = node_hash is None or node_hash not in memo
+        node_content = None
+        if created or self.validator is not None:
+            node_content = {"type": type_id, "params": {"value": value}, "deps": {}}
+        if node_hash is None:
+            node_hash = compute_hash(node_content)
+            if len(_SCALAR_HASHES) >= _MAX_SCALAR_HASHES:
+                _SCALAR_HASHES.clear()
+            _SCALAR_HASHES[key] = node_hash
+            created = node_hash not in memo
+
+        if self.validator is not None:
+            issue = self.validator.node_finished(plan.type_name, node_hash, node_content)
+            if issue is not None:
+                issue.path = self.path() + [plan.type_name]
+                raise DagValidationError(issue)
+
+        if self.cache is not None:
+            self.cache.store(obj, node_hash, ())
+
+        stats = self.stats
+        if stats is not None:
+            # Counted as if the node had been on the work stack.
+            depth = len(self.stack) + 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+            stats.depth_histogram[depth] = stats.depth_histogram.get(depth, 0) + 1
+            if created:
+                stats.nodes_created += 1
+            else:
+                stats.memo_hits += 1
+
+        if created:
+            memo[node_hash] = node_content
+        if profile is not None:
+            profile.node_finished(created)
+        return node_hash
+
+    def _raise_cycle(self, obj_id: int, type_name: str) -> None:
+        path = self.path()
+        if self.validator is not None:
+            start = next((i for i, frame in enumerate(self.stack) if frame.obj_id == obj_id), len(self.stack))
+            cycle = [(frame.obj, frame.plan.type_name, frame.field_name) for frame in self.stack[start:]]
+            issue = self.validator.object_cycle(cycle)
+            issue.path = path + [type_name]
+            raise DagValidationError(issue)
+        raise ValueError(f"Circular reference detected in DAG conversion for {type_name}. "
+                        f"This object (id={obj_id}) is already being processed in the current call stack. "
+                        f"This indicates a true cycle in the object graph that cannot be converted to a DAG. "
+                        f"Object path: {' -> '.join(path + [type_name])}")
+
+    def _expand(self, obj: BaseModel, plan: ConversionPlan, context: Optional[TraversalContext]) -> Any:
+        if self.profile is not None:
+            start = _perf_counter()
+            expanded = obj.expand()
+            self.profile.add_time("expand", plan.type_name, _perf_counter() - start)
+        else:
+            expanded = obj.expand()
+        if expanded is None:
+            raise Exception(f"Failed to expand {plan.type_name} into {expanded}")
+        if plan.after_expand:
+            # Hooks see the expansion on the context and may replace it
+            # (e.g. sketch propagation).
+            context.expanded_obj = expanded
+            self._call_hooks(plan.after_expand, "after_expand", obj, context)
+            expanded = context.expanded_obj
+        return expanded
+
+    def advance(self, frame: _Frame) -> Optional[BaseModel]:
+        """Run ``frame`` up to its next child model; None once all fields are done."""
+        if frame.walk is not None:
+            child = self._walk(frame)
+            if child is not None:
+                return child
+
+        obj = frame.obj
+        fields = frame.plan.fields
+        while frame.field_index < len(fields):
+            field_plan = fields[frame.field_index]
+            frame.field_index += 1
+            if field_plan.skip_hooks and self._should_skip_field(field_plan, obj, frame.context):
+                continue
+
+            field_name = field_plan.name
+            if field_plan.computable:
+                field_value = self._compute_field(obj, field_name)
+            else:
+                field_value = getattr(obj, field_name)
+            if field_value is None:
+                continue
+
+            if field_plan.before_field or field_plan.field_hooks:
+                result = self._run_field_hooks(field_plan, field_value, obj, frame.context)
+                if result is not None:
+                    param_value, dep_value = result
+                    if param_value is not None:
+                        frame.params[field_name] = param_value
+                    if dep_value is not None:
+                        frame.deps[field_name] = dep_value
+                    continue
+
+            if isinstance(field_value, BaseModel):
+                frame.field_name = field_name
+                frame.walk = _SINGLE
+                if frame.children is not None:
+                    frame.children.append(field_value)
+                return field_value
+            if isinstance(field_value, (list, tuple, set)):
+                frame.walk = [[iter(field_value), [], False, None, False, None]]
+            elif isinstance(field_value, dict):
+                frame.walk = [[iter(field_value.items()), {}, True, None, False, None]]
+            else:
+                # Primitive value - store in params
+                frame.params[field_name] = field_value
+                continue
+            frame.field_name = field_name
+            child = self._walk(frame)
+            if child is not None:
+                return child
+        return None
+
+    def _walk(self, frame: _Frame) -> Optional[BaseModel]:
+        """Continue the current field's container walk up to its next model."""
+        walk = frame.walk
+        while walk:
+            top = walk[-1]
+            is_dict = top[2]
+            out = top[1]
+            key = None
+            # Iterating live (rather than over a snapshot) matters: expansions
+            # can append to the very list being walked, e.g. sketch.elements.
+            for item in top[0]:
+                if is_dict:
+                    key, item = item
+                if isinstance(item, BaseModel):
+                    top[3] = key
+                    if frame.children is not None:
+                        frame.children.append(item)
+                    return item
+                if isinstance(item, (list, tuple, set)):
+                    walk.append([iter(item), [], False, None, False, key])
+                    break
+                if isinstance(item, dict):
+                    walk.append([iter(item.items()), {}, True, None, False, key])
+                    break
+                if is_dict:
+                    out[key] = item
+                else:
+                    out.append(item)
+            else:
+                walk.pop()
+                if walk:
+                    parent = walk[-1]
+                    if parent[2]:
+                        parent[1][top[5]] = out
+                    else:
+                        parent[1].append(out)
+                    parent[4] = parent[4] or top[4]
+                else:
+                    frame.walk = None
+                    if top[4]:
+                        frame.deps[frame.field_name] = out
+                    else:
+                        frame.params[frame.field_name] = out
+        return None
+
+    def deliver(self, frame: _Frame, result: Any) -> None:
+        """Hand a child's hash to the field (or container) waiting for it."""
+        walk = frame.walk
+        if walk is _SINGLE:
+            frame.walk = None
+            if result is not None:
+                frame.deps[frame.field_name] = result
+            return
+        top = walk[-1]
+        if top[2]:
+            top[1][top[3]] = result
+        else:
+            top[1].append(result)
+        top[4] = True
+
+    def finish(self, frame: _Frame) -> str:
+        """Build, hash and memoize the node of a frame whose fields are done."""
+        obj = frame.obj
+        plan = frame.plan
+        hooks = self.hooks
+        context = frame.context
+        memo = self.memo
+        stats = self.stats
+
+        type_id = _get_type_id(plan.type_name, self.type_registry)
+
+        node_content = {
+            "type": type_id,
+            "params": frame.params,
+            "deps": frame.deps
+        }
+
+        if plan.before_node:
+            self._call_hooks(plan.before_node, "before_node", obj, context)
+
+        if self.profile is not None:
+            start = _perf_counter()
+            node_hash = compute_hash(node_content)
+            self.profile.add_time("hash", plan.type_name, _perf_counter() - start)
+        else:
+            node_hash = compute_hash(node_content)
+
+        if self.validator is not None:
+            issue = self.validator.node_finished(plan.type_name, node_hash, node_content)
+            if issue is not None:
+                issue.path = self.path()[:-1] + [plan.type_name]
+                raise DagValidationError(issue)
+
+        # Nodes of a type no hook applies to are never seen by a hook, so
+        # they are not recorded as encountered either.
+        if context is not None:
+            context.node_hash = node_hash
+            context.is_first_encounter = hooks.mark_encountered(node_hash)
+            if context.is_first_encounter and plan.on_first_encounter:
+                self._call_hooks(plan.on_first_encounter, "on_first_encounter", obj, context)
+
+        if self.cache is not None:
+            self.cache.store(obj, node_hash, frame.children)
+        if frame.aliases:
+            self._store_aliases(frame.aliases, node_hash)
+
+        if stats is not None:
+            depth = len(self.stack)
+            stats.depth_histogram[depth] = stats.depth_histogram.get(depth, 0) + 1
+
+        if node_hash in memo:
+            if stats is not None:
+                stats.memo_hits += 1
+            created = False
+        else:
+            if plan.after_node:
+                self._call_hooks(plan.after_node, "after_node", obj, context)
+            memo[node_hash] = node_content
+            if stats is not None:
+                stats.nodes_created += 1
+            created = True
+
+        if self.profile is not None:
+            self.profile.node_finished(created)
+
+        self.processing.discard(frame.obj_id)
+        return node_hash
+
+    def _store_aliases(self, aliases: List[tuple], node_hash: str) -> None:
+        # Innermost first, so each original finds its expansion already cached.
+        for original, expanded, key, refs, start in reversed(aliases):
+            if self.cache is not None:
+                self.cache.store(original, node_hash, (expanded,))
+            elif key is not None:
+                self.expansions.put(key, node_hash, refs, self.registrations[start:])
+
+    def _replay(self, entry: tuple, refs: list) -> str:
+        """
+        Repeat a memoized expansion's sketch registrations for the object
+        with the refs ``refs``, and return the expansion's node hash.
+
+        The registered elements are deep-copied with each model of the first
+        original's refs replaced by the corresponding one of ``refs`` (its
+        sketch, its points), so the copies are what expanding this object
+        would have registered: as they were when registered, for the sketch
+        to compare with its elements, then as they were once converted.
+        """
+        node_hash, first_refs, recorded = entry
+        if not recorded:
+            return node_hash
+        memo = {id(first): ref for first, ref in zip(first_refs, refs)}
+        # Created first so that elements referring to each other (a polygon
+        # and its lines) refer to each other's copies.
+        copies = []
+        for _, element, _, _ in recorded:
+            element_copy = memo[id(element)] = element.__class__.__new__(element.__class__)
+            copies.append(element_copy)
+        pairs = []
+        for (index, element, values, _), element_copy in zip(recorded, copies):
+            # As pydantic's BaseModel.__deepcopy__, from the registered values.
+            _object_setattr(element_copy, "__dict__", copy.deepcopy(values, memo))
+            _object_setattr(element_copy, "__pydantic_extra__", copy.deepcopy(element.__pydantic_extra__, memo))
+            _object_setattr(element_copy, "__pydantic_fields_set__", set(element.__pydantic_fields_set__))
+            _object_setattr(element_copy, "__pydantic_private__", copy.deepcopy(element.__pydantic_private__, memo))
+            pairs.append((refs[index], element_copy))
+        register_elements(pairs)
+        for (_, _, _, converted), element_copy in zip(recorded, copies):
+            _object_setattr(element_copy, "__dict__", copy.deepcopy(converted, memo))
+        return node_hash
 
 
 def pydantic_to_dag(
@@ -204,11 +770,19 @@ def pydantic_to_dag(
     memo: Dict[str, Any],
     type_registry: Optional[Dict[str, int]] = None,
     hooks: Optional[HookRegistry] = None,
-    processing: Optional[Set[int]] = None
+    processing: Optional[Set[int]] = None,
+    cache: Optional[DagBuildCache] = None,
+    stats: Optional[TraversalStats] = None,
+    validator: Optional[ConversionValidator] = None,
+    profile: Optional[ConversionProfile] = None
 ) -> str:
     """
-    Convert a Pydantic model to DAG format recursively.
+    Convert a Pydantic model to DAG format.
     Returns the hash ID of the object.
+
+    The traversal uses an explicit work stack rather than recursion, so the
+    depth of the model graph (long ``Frame.top_frame`` chains, deeply nested
+    assemblies) is not limited by Python's recursion limit.
     
     Args:
         obj: Pydantic model instance or primitive value
@@ -216,104 +790,33 @@ def pydantic_to_dag(
         type_registry: Dynamic mapping of type names to integer IDs (defaults to empty dict)
         hooks: Optional hook registry for custom processing
         processing: Set of object IDs currently being processed (for cycle detection)
+        cache: Optional incremental cache; instances with a valid entry return
+            their cached hash without being traversed. Pass ``cache.nodes`` as
+            ``memo`` so cached subtrees stay resolvable.
+        stats: Optional ``TraversalStats`` to fill with traversal counters
+            and work-stack depth statistics.
+        validator: Optional ``ConversionValidator``; the conversion raises
+            ``DagValidationError`` at the first node breaking its rules.
+            Subtrees taken from ``cache`` are not rechecked.
+        profile: Optional ``ConversionProfile`` to record per-type timings
+            in. Defaults to the profile active as a context manager, if any.
         
     Returns:
         Hash ID of the object
     """
     if type_registry is None:
         type_registry = {}
-    
-    valid_types = set(type_registry.keys())
-    
+
     # Handle primitive types
     if not isinstance(obj, BaseModel):
         # For primitives, we don't create nodes, just return the value
         return obj
-    
+
     # Initialize processing set if not provided
     if processing is None:
         processing = set()
-    
-    # Get object identity for cycle detection
-    obj_id = id(obj)
-    
-    # Early cycle detection: check if this object is currently being processed
-    if obj_id in processing:
-        # Circular reference detected - this object is already being processed
-        # We can't compute the hash yet (needs processed fields), but we can
-        # check if it's already in memo by trying a different approach.
-        # For now, we'll raise an error with a clear message.
-        # In the future, we could return a placeholder hash that gets resolved later.
-        type_name = obj.__class__.__name__
-        raise ValueError(f"Circular reference detected in DAG conversion for {type_name}. "
-                        f"This object (id={obj_id}) is already being processed in the current call stack. "
-                        f"This indicates a true cycle in the object graph that cannot be converted to a DAG.")
-    
-    # Get the type name
-    type_name = obj.__class__.__name__
-    
-    # Create context for hooks
-    context = TraversalContext(
-        memo=memo,
-        type_registry=type_registry,
-        valid_types=valid_types,
-        current_path=[]
-    )
-    # Store processing set in context so _process_fields can access it
-    context.processing = processing
-    
-    # Run on_encounter hook (before processing)
-    if hooks:
-        run_hooks("on_encounter", obj, context, hooks)
-    
-    # Check for expansion if valid_types is provided and type is not valid
-    expanded = _expand_type_if_needed(obj, type_name, valid_types, context, hooks)
-    if expanded is not None:
-        return pydantic_to_dag(expanded, memo, type_registry, hooks, processing)
-    
-    # Add object to processing set BEFORE processing fields
-    processing.add(obj_id)
-    try:
-            # Process all fields (may recursively call pydantic_to_dag)
-        params, deps = _process_fields(obj, memo, type_registry, context, hooks)
-        
-        # Get type ID
-        type_id = _get_type_id(type_name, type_registry)
-        
-        # Create node content
-        node_content = {
-            "type": type_id,
-            "params": params,
-            "deps": deps
-        }
-        
-        # Run before_node hook
-        if hooks:
-            run_hooks("before_node", obj, context, hooks)
-        
-        # Compute hash
-        node_hash = compute_hash(node_content)
-        context.node_hash = node_hash
-        
-        # Check if first encounter
-        if hooks:
-            context.is_first_encounter = hooks.mark_encountered(node_hash)
-            if context.is_first_encounter:
-                run_hooks("on_first_encounter", obj, context, hooks)
-        
-        # If already in memo, return the hash
-        if node_hash in memo:
-            return node_hash
-        
-        # Run after_node hook
-        if hooks:
-            run_hooks("after_node", obj, context, hooks)
-        
-        # Add to memo
-        memo[node_hash] = node_content
-        
-        return node_hash
-    finally:
-        # Remove object from processing set after processing (even if error occurred)
-        processing.discard(obj_id)
 
+    if profile is None:
+        profile = active_profile()
+
+    return _Traversal(memo, type_registry, hooks, processing, cache, stats, validator, profile).run(obj)
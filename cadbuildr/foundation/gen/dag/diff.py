@@ -0,0 +1,105 @@
+"""Diffs and patches between formatted DAGs.
+
+Node ids are content hashes, so two builds of a model share every node
+that did not change. ``diff_dag`` turns two formatted DAGs (as returned by
+``show_dag``) into a patch holding only the nodes that differ, and
+``apply_patch`` rebuilds the new DAG from the old one and that patch.
+
+A patch is a plain JSON-serializable dict::
+
+    {
+        "version": "2.0",
+        "baseFingerprint": dag_fingerprint(old),
+        "rootNodeId": new["rootNodeId"],
+        "added": {node_id: node, ...},    # new nodes, or replacements
+        "removed": [node_id, ...],
+        "serializableNodes": {...},       # only when it changed
+    }
+
+Short ids are only stable across builds when both DAGs were formatted with
+the same ``ShortIdMap``; otherwise an unchanged node whose id grew shows up
+as removed and added again. The patch stays correct either way, just larger.
+"""
+
+import hashlib
+from typing import Any, Dict
+
+from .formatting import DAG_VERSION_FORMAT
+
+
+def dag_fingerprint(dag: Dict[str, Any]) -> str:
+    """
+    Identify a formatted DAG by its version, root and node ids.
+
+    Ids already hash node contents, so hashing the sorted ids is enough to
+    tell two DAGs apart without re-encoding every node.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{dag.get('version', '')}\n{dag['rootNodeId']}\n".encode())
+    digest.update("\n".join(sorted(dag["DAG"])).encode())
+    return digest.hexdigest()
+
+
+def diff_dag(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the patch turning the formatted DAG ``old`` into ``new``.
+
+    Runs in O(nodes): ids present in only one DAG are found with set
+    operations, and ids present in both are kept when their contents are
+    equal, which they always are unless a short id was reused for a
+    different node.
+    """
+    old_nodes: Dict[str, Any] = old["DAG"]
+    new_nodes: Dict[str, Any] = new["DAG"]
+
+    old_ids = old_nodes.keys()
+    added = {
+        node_id: node
+        for node_id, node in new_nodes.items()
+        if node_id not in old_ids or old_nodes[node_id] != node
+    }
+    removed = [node_id for node_id in old_nodes if node_id not in new_nodes]
+
+    patch: Dict[str, Any] = {
+        "version": new.get("version", DAG_VERSION_FORMAT),
+        "baseFingerprint": dag_fingerprint(old),
+        "rootNodeId": new["rootNodeId"],
+        "added": added,
+        "removed": removed,
+    }
+    if new.get("serializableNodes") != old.get("serializableNodes"):
+        patch["serializableNodes"] = new.get("serializableNodes")
+    return patch
+
+
+def apply_patch(old: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a patch from ``diff_dag`` to ``old`` and return the new formatted DAG.
+
+    ``old`` is left untouched.
+
+    Raises:
+        ValueError: If ``old`` is not the DAG the patch was computed against.
+    """
+    fingerprint = dag_fingerprint(old)
+    if patch["baseFingerprint"] != fingerprint:
+        raise ValueError(
+            f"DAG patch expects base {patch['baseFingerprint'][:12]}, "
+            f"got {fingerprint[:12]}."
+        )
+
+    nodes = dict(old["DAG"])
+    for node_id in patch["removed"]:
+        nodes.pop(node_id, None)
+    nodes.update(patch["added"])
+
+    root_id = patch["rootNodeId"]
+    if root_id not in nodes:
+        raise ValueError(f"DAG patch root {root_id} is not in the patched DAG.")
+
+    return {
+        "version": patch.get("version", old.get("version", DAG_VERSION_FORMAT)),
+        "rootNodeId": root_id,
+        "DAG": nodes,
+        "serializableNodes": patch.get("serializableNodes", old.get("serializableNodes")),
+    }
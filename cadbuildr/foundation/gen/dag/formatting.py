@@ -1,14 +1,20 @@
 """DAG formatting utilities."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .hash import _truncate_dag_hashes
+from .short_ids import ShortIdMap
 
 
 DAG_VERSION_FORMAT = "2.0"
 
 
-def format_dag(dag: dict, root_node_id: str, type_registry: Dict[str, int]) -> dict:
+def format_dag(
+    dag: dict,
+    root_node_id: str,
+    type_registry: Dict[str, int],
+    id_map: Optional[ShortIdMap] = None,
+) -> dict:
     """
     Format the DAG to include version information and root node.
     
@@ -16,12 +22,14 @@ def format_dag(dag: dict, root_node_id: str, type_registry: Dict[str, int]) -> d
         dag: The DAG dictionary
         root_node_id: The ID of the root node
         type_registry: Mapping of type names to integer IDs
+        id_map: Optional ShortIdMap reused across builds so that a node keeps
+            the same short id in every DAG formatted with it
         
     Returns:
         Formatted DAG with version and metadata
     """
     # Truncate hashes for smaller DAG size
-    truncated_dag, truncated_root_id = _truncate_dag_hashes(dag, root_node_id)
+    truncated_dag, truncated_root_id = _truncate_dag_hashes(dag, root_node_id, id_map=id_map)
     
     return {
         "version": DAG_VERSION_FORMAT,
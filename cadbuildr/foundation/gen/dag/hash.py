@@ -1,15 +1,130 @@
 import hashlib
 import json
-from typing import Dict
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, List, Optional
+
+from .short_ids import ShortIdMap
+
+# Canonical encoding, byte-identical to canonical_json.serialize
+# (json.dumps(value, sort_keys=True)) but without building an encoder and
+# re-sorting keys for every node. Dicts with the same keys (the params/deps of
+# one model class, the node envelope itself) share a pre-sorted list of
+# encoded '"key": ' fragments, and node type ids share their encoded tail.
+
+_INFINITY = float("inf")
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+
+# tuple(dict keys) -> [(key, encoded fragment), ...] in sorted order, or None
+# when the keys are not all str (left to json.dumps).
+_KEY_FRAGMENTS: Dict[tuple, Any] = {}
+_MAX_KEY_FRAGMENTS = 4096
+_NODE_KEYS = ("type", "params", "deps")
+_TYPE_FRAGMENTS: Dict[int, str] = {}
+
+
+def _key_fragments(keys: tuple) -> Any:
+    fragments = _KEY_FRAGMENTS.get(keys)
+    if fragments is None:
+        if all(type(key) is str for key in keys):
+            fragments = [
+                (key, ("{" if i == 0 else ", ") + encode_basestring_ascii(key) + ": ")
+                for i, key in enumerate(sorted(keys))
+            ]
+        else:
+            fragments = False
+        if len(_KEY_FRAGMENTS) >= _MAX_KEY_FRAGMENTS:
+            _KEY_FRAGMENTS.clear()
+        _KEY_FRAGMENTS[keys] = fragments
+    return fragments
+
+
+def _encode_dict(value: dict, out: List[str]) -> None:
+    if not value:
+        out.append("{}")
+        return
+    fragments = _key_fragments(tuple(value))
+    if fragments is False:
+        out.append(json.dumps(value, sort_keys=True))
+        return
+    for key, fragment in fragments:
+        out.append(fragment)
+        _encode_value(value[key], out)
+    out.append("}")
+
+
+def _encode_value(value: Any, out: List[str]) -> None:
+    # Exact type checks: subclasses (str/int enums, ...) take the json.dumps
+    # path, which encodes them the way the reference serializer does.
+    value_type = type(value)
+    if value_type is str:
+        out.append(encode_basestring_ascii(value))
+    elif value_type is float:
+        if value != value:
+            out.append("NaN")
+        elif value == _INFINITY:
+            out.append("Infinity")
+        elif value == -_INFINITY:
+            out.append("-Infinity")
+        else:
+            out.append(_float_repr(value))
+    elif value is True:
+        out.append("true")
+    elif value is False:
+        out.append("false")
+    elif value is None:
+        out.append("null")
+    elif value_type is int:
+        out.append(_int_repr(value))
+    elif value_type is list or value_type is tuple:
+        if not value:
+            out.append("[]")
+            return
+        separator = "["
+        for item in value:
+            out.append(separator)
+            separator = ", "
+            _encode_value(item, out)
+        out.append("]")
+    elif value_type is dict:
+        _encode_dict(value, out)
+    else:
+        out.append(json.dumps(value, sort_keys=True))
+
+
+def encode_canonical(value: Any) -> str:
+    """Return the canonical JSON text of ``value`` (see canonical_json.serialize)."""
+    out: List[str] = []
+    _encode_value(value, out)
+    return "".join(out)
 
 
 def compute_hash(content: Dict) -> str:
-    """Compute SHA-256 hash of content."""
-    content_bytes = json.dumps(content, sort_keys=True).encode("utf-8")
-    return hashlib.sha256(content_bytes).hexdigest()
+    """Compute SHA-256 hash of the canonical JSON encoding of content."""
+    if type(content) is dict and tuple(content) == _NODE_KEYS and type(content["type"]) is int:
+        # Node envelope: keys sort as deps, params, type.
+        out = ['{"deps": ']
+        _encode_value(content["deps"], out)
+        out.append(', "params": ')
+        _encode_value(content["params"], out)
+        type_id = content["type"]
+        tail = _TYPE_FRAGMENTS.get(type_id)
+        if tail is None:
+            tail = _TYPE_FRAGMENTS[type_id] = ', "type": ' + _int_repr(type_id) + "}"
+        out.append(tail)
+    else:
+        out = []
+        _encode_value(content, out)
+    # ensure_ascii output, so the text is plain ASCII.
+    return hashlib.sha256("".join(out).encode("ascii")).hexdigest()
 
 
-def _truncate_dag_hashes(dag: dict, root_hash: str, initial_length: int = 4) -> tuple[dict, str]:
+def _truncate_dag_hashes(
+    dag: dict,
+    root_hash: str,
+    initial_length: int = 4,
+    id_map: Optional[ShortIdMap] = None,
+) -> tuple[dict, str]:
     """
     Post-process DAG to use shorter unique hash IDs.
     
@@ -17,77 +132,21 @@ def _truncate_dag_hashes(dag: dict, root_hash: str, initial_length: int = 4) ->
         dag: Original DAG with full 64-char hash IDs
         root_hash: Full hash of root node
         initial_length: Initial truncation length (default 4)
+        id_map: Optional ShortIdMap shared across builds. Ids it already
+            holds are reused unchanged and new hashes are added to it; without
+            one, ids are the minimal unique prefixes of this DAG's hashes.
         
     Returns:
         Tuple of (truncated_dag, truncated_root_id)
     """
-    def common_prefix_length(a: str, b: str) -> int:
-        """Calculate common prefix length between two strings."""
-        min_len = min(len(a), len(b))
-        i = 0
-        while i < min_len and a[i] == b[i]:
-            i += 1
-        return i
-    
-    def get_min_unique_prefixes(sorted_hashes: list[str], initial_length: int) -> dict[str, int]:
-        """Determine minimal unique prefix length for each hash."""
-        prefixes = {}
-        n = len(sorted_hashes)
-        for i in range(n):
-            current_hash = sorted_hashes[i]
-            prefix_length = initial_length
-            
-            # Compare with previous hash
-            if i > 0:
-                prev_hash = sorted_hashes[i - 1]
-                common_prev = common_prefix_length(current_hash, prev_hash)
-                prefix_length = max(prefix_length, common_prev + 1)
-            
-            # Compare with next hash
-            if i < n - 1:
-                next_hash = sorted_hashes[i + 1]
-                common_next = common_prefix_length(current_hash, next_hash)
-                prefix_length = max(prefix_length, common_next + 1)
-            
-            prefix_length = min(prefix_length, len(current_hash))
-            prefixes[current_hash] = prefix_length
-        
-        return prefixes
-    
-    def build_truncated_ids(sorted_hashes: list[str], prefixes: dict[str, int]) -> dict[str, str]:
-        """Assign truncated IDs based on minimal unique prefixes."""
-        truncated_ids = {}
-        seen_truncated_ids = set()
-        
-        for hash_str in sorted_hashes:
-            prefix_length = prefixes[hash_str]
-            truncated_id = hash_str[:prefix_length]
-            
-            # Handle collisions by incrementing prefix length
-            while truncated_id in seen_truncated_ids and truncated_id != hash_str:
-                prefix_length += 1
-                if prefix_length > len(hash_str):
-                    raise ValueError(f"Cannot truncate hash {hash_str} to a unique ID.")
-                truncated_id = hash_str[:prefix_length]
-            
-            truncated_ids[hash_str] = truncated_id
-            seen_truncated_ids.add(truncated_id)
-        
-        return truncated_ids
-    
-    # Step 1: Sort all hashes
-    sorted_hashes = sorted(dag.keys())
-    
-    # Step 2: Determine minimal unique prefix lengths
-    prefixes = get_min_unique_prefixes(sorted_hashes, initial_length)
-    
-    # Step 3: Assign truncated IDs
-    id_map = build_truncated_ids(sorted_hashes, prefixes)
-    
-    # Step 4: Replace IDs in the DAG
+    if id_map is None:
+        id_map = ShortIdMap(initial_length)
+    short_ids = id_map.assign(dag.keys())
+
+    # Replace IDs in the DAG
     truncated_dag = {}
     for full_hash, node in dag.items():
-        truncated_id = id_map[full_hash]
+        truncated_id = short_ids[full_hash]
         updated_node = {
             "type": node["type"],
             "params": node["params"],
@@ -97,13 +156,12 @@ def _truncate_dag_hashes(dag: dict, root_hash: str, initial_length: int = 4) ->
         for dep_key, dep_value in node.get("deps", {}).items():
             if isinstance(dep_value, list):
                 updated_node["deps"][dep_key] = [
-                    id_map.get(dep, dep) for dep in dep_value
+                    short_ids.get(dep, dep) for dep in dep_value
                 ]
             else:
-                updated_node["deps"][dep_key] = id_map.get(dep_value, dep_value)
+                updated_node["deps"][dep_key] = short_ids.get(dep_value, dep_value)
         
         truncated_dag[truncated_id] = updated_node
     
     # Return truncated DAG and truncated root ID
-    return truncated_dag, id_map[root_hash]
-
+    return truncated_dag, short_ids[root_hash]
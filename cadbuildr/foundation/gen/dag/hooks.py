@@ -1,7 +1,7 @@
 """Hook/plugin system for custom processing during DAG traversal."""
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -17,21 +17,43 @@ class TraversalContext:
     expanded_obj: Optional[Any] = None  # For after_expand hook
 
 
+# Hook types for which hooks registered under "*" apply to every type.
+_WILDCARD_HOOK_TYPES = frozenset({"should_skip_field"})
+
+
 class HookRegistry:
     """Registry for managing hooks during DAG traversal."""
     
     def __init__(self):
         self._hooks: Dict[str, Dict[str, List[Callable]]] = {}
         self._first_encountered: set = set()
+        self._static: set = set()
+        # Bumped whenever the registered hooks change; conversion plans
+        # compiled against an older generation are discarded.
+        self.generation = 0
+        self._plans: Dict[type, Any] = {}
+        # (hook_type, type_name) -> hooks to call, wildcards merged in.
+        self._dispatch: Dict[Tuple[str, str], Tuple[Callable, ...]] = {}
     
-    def register(self, hook_type: str, type_name: str | List[str], callback: Callable) -> None:
+    def register(
+        self,
+        hook_type: str,
+        type_name: str | List[str],
+        callback: Callable,
+        static: bool = False,
+    ) -> None:
         """
         Register a hook for a specific type or types.
+
+        Registering the same callback twice for a type is a no-op.
         
         Args:
             hook_type: Type of hook ('on_encounter', 'on_first_encounter', etc.)
             type_name: Type name(s) to match
             callback: Function to call (obj, context) -> None
+            static: For 'should_skip_field' hooks whose answer depends only on
+                the field name and the object's class. Static hooks are asked
+                once per class instead of once per object.
         """
         if hook_type not in self._hooks:
             self._hooks[hook_type] = {}
@@ -40,7 +62,43 @@ class HookRegistry:
         for name in type_names:
             if name not in self._hooks[hook_type]:
                 self._hooks[hook_type][name] = []
+            if callback in self._hooks[hook_type][name]:
+                continue
             self._hooks[hook_type][name].append(callback)
+            self._changed()
+        if static:
+            self._static.add(callback)
+
+    def has_hooks(self, hook_type: str) -> bool:
+        """Whether any hook of ``hook_type`` is registered, for any type name."""
+        return any(self._hooks.get(hook_type, {}).values())
+
+    def is_static(self, callback: Callable) -> bool:
+        """Whether ``callback`` was registered with ``static=True``."""
+        return callback in self._static
+
+    def _changed(self) -> None:
+        self.generation += 1
+        self._plans.clear()
+        self._dispatch.clear()
+
+    def dispatch(self, hook_type: str, type_name: str) -> Tuple[Callable, ...]:
+        """
+        Return the hooks to call for ``hook_type`` on ``type_name``, in order.
+
+        For hook types that support wildcards, hooks registered under "*"
+        follow the type's own hooks. Results are cached until the next
+        ``register`` or ``clear``.
+        """
+        key = (hook_type, type_name)
+        hooks = self._dispatch.get(key)
+        if hooks is None:
+            by_type = self._hooks.get(hook_type, {})
+            hooks = tuple(by_type.get(type_name, ()))
+            if hook_type in _WILDCARD_HOOK_TYPES and type_name != "*":
+                hooks += tuple(by_type.get("*", ()))
+            self._dispatch[key] = hooks
+        return hooks
     
     def get_hooks(self, hook_type: str, type_name: str) -> List[Callable]:
         """Get all hooks for a specific hook type and type name."""
@@ -50,15 +108,7 @@ class HookRegistry:
     
     def run_hooks(self, hook_type: str, obj: Any, context: TraversalContext) -> None:
         """Execute all hooks for a specific hook type and object type."""
-        type_name = obj.__class__.__name__
-        hooks = self.get_hooks(hook_type, type_name)
-        
-        for hook in hooks:
-            try:
-                hook(obj, context)
-            except Exception as e:
-                # Don't let hook errors break DAG conversion
-                print(f"Warning: Hook {hook_type} for {type_name} raised error: {e}")
+        call_hooks(self.dispatch(hook_type, obj.__class__.__name__), hook_type, obj, context)
     
     def mark_encountered(self, node_hash: str) -> bool:
         """Mark a node as encountered and return True if it's the first time."""
@@ -71,13 +121,30 @@ class HookRegistry:
         """Clear all hooks and encountered nodes (for testing)."""
         self._hooks.clear()
         self._first_encountered.clear()
+        self._static.clear()
+        self._changed()
+
+
+def call_hooks(hooks: Sequence[Callable], hook_type: str, obj: Any, context: TraversalContext) -> None:
+    """Call (obj, context) hooks in order, reporting rather than raising their errors."""
+    for hook in hooks:
+        try:
+            hook(obj, context)
+        except Exception as e:
+            # Don't let hook errors break DAG conversion
+            print(f"Warning: Hook {hook_type} for {obj.__class__.__name__} raised error: {e}")
 
 
 # Global hook registry (can be overridden by passing HookRegistry to conversion)
 _global_registry = HookRegistry()
 
 
-def register_hook(hook_type: str, type_name: str | List[str], callback: Optional[Callable] = None):
+def register_hook(
+    hook_type: str,
+    type_name: str | List[str],
+    callback: Optional[Callable] = None,
+    static: bool = False,
+):
     """
     Register a hook. Can be used as decorator or function.
     
@@ -91,12 +158,12 @@ def register_hook(hook_type: str, type_name: str | List[str], callback: Optional
     if callback is None:
         # Used as decorator
         def decorator(func: Callable) -> Callable:
-            _global_registry.register(hook_type, type_name, func)
+            _global_registry.register(hook_type, type_name, func, static=static)
             return func
         return decorator
     else:
         # Used as function
-        _global_registry.register(hook_type, type_name, callback)
+        _global_registry.register(hook_type, type_name, callback, static=static)
 
 
 def get_hooks(hook_type: str, type_name: str) -> List[Callable]:
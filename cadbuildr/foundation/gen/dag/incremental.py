@@ -0,0 +1,168 @@
+"""Identity-keyed node cache for incremental DAG rebuilds."""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..runtime.tracking import register_tracker, unregister_tracker
+
+
+def iter_dep_ids(deps: Any) -> Iterator[str]:
+    """Yield the node ids referenced by a node's ``deps``, in field order."""
+    stack = [iter(deps.values())]
+    while stack:
+        for value in stack[-1]:
+            if isinstance(value, str):
+                yield value
+            elif isinstance(value, (list, tuple)):
+                stack.append(iter(value))
+                break
+            elif isinstance(value, dict):
+                stack.append(iter(value.values()))
+                break
+        else:
+            stack.pop()
+
+
+def collect_reachable(nodes: Dict[str, Any], root_id: str) -> Dict[str, Any]:
+    """
+    Return the nodes reachable from ``root_id`` in post-order.
+
+    Post-order (children first, first completion wins) is exactly the order in
+    which ``pydantic_to_dag`` inserts nodes into a fresh memo, so the result
+    formats to the same DAG as a from-scratch conversion.
+    """
+    out: Dict[str, Any] = {}
+    if root_id not in nodes:
+        return out
+    entered = {root_id}
+    stack = [(root_id, iter_dep_ids(nodes[root_id].get("deps", {})))]
+    while stack:
+        node_id, children = stack[-1]
+        for child in children:
+            if child not in entered and child in nodes:
+                entered.add(child)
+                stack.append((child, iter_dep_ids(nodes[child].get("deps", {}))))
+                break
+        else:
+            stack.pop()
+            out[node_id] = nodes[node_id]
+    return out
+
+
+class DagBuildCache:
+    """
+    Cache of converted nodes keyed by model instance, for edit-rebuild loops.
+
+    Pass the same cache to successive ``show_dag`` / ``pydantic_to_dag`` calls.
+    An instance whose entry is still valid returns its node hash without being
+    traversed, so a rebuild only walks the path from edited objects up to the
+    root. Entries are dropped when the instance, or anything below it, reports
+    a mutation through ``mark_dirty`` (field assignment on parameter-bearing
+    models and generated methods do this automatically).
+
+    Hooks do not run for cached subtrees.
+    """
+
+    def __init__(self) -> None:
+        # Persistent memo: full node hash -> node content.
+        self.nodes: Dict[str, Any] = {}
+        # id(obj) -> (obj, node_hash, child ids). Holding obj keeps its id stable.
+        self._entries: Dict[int, Tuple[Any, str, Tuple[int, ...]]] = {}
+        self._parents: Dict[int, Set[int]] = {}
+        self._type_registry: Optional[Dict[str, int]] = None
+        self._root: Any = None
+        self.hits = 0
+        self.misses = 0
+        register_tracker(self)
+
+    def close(self) -> None:
+        """Stop tracking mutations and drop all cached state."""
+        unregister_tracker(self)
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every cached node and entry."""
+        self.nodes.clear()
+        self._entries.clear()
+        self._parents.clear()
+        self._type_registry = None
+        self._root = None
+
+    def begin(self, root: Any, type_registry: Dict[str, int]) -> None:
+        """Prepare for a build of ``root`` against ``type_registry``."""
+        # Cached nodes embed type ids, so they are only reusable under the
+        # registry they were built with.
+        if self._type_registry is not None and self._type_registry != type_registry:
+            self.clear()
+        # show_dag wraps Parts/Assemblies in a fresh root object per call; drop
+        # the previous wrapper so they don't pile up.
+        if self._root is not None and self._root is not root:
+            self._entries.pop(id(self._root), None)
+        self._root = root
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, obj: Any) -> Optional[str]:
+        """Return the cached node hash for ``obj``, or None if it must be rebuilt."""
+        entry = self._entries.get(id(obj))
+        if entry is not None and entry[0] is obj and entry[1] in self.nodes:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def store(self, obj: Any, node_hash: str, children: Iterable[Any]) -> None:
+        """Record ``obj`` -> ``node_hash``, built from the ``children`` instances."""
+        child_ids = tuple(id(child) for child in children)
+        # A child mutated while its parent was still being built has no entry;
+        # caching the parent would then hide that change.
+        entries = self._entries
+        if any(child_id not in entries for child_id in child_ids):
+            return
+        obj_id = id(obj)
+        entries[obj_id] = (obj, node_hash, child_ids)
+        for child_id in child_ids:
+            self._parents.setdefault(child_id, set()).add(obj_id)
+
+    def seed(self, obj: Any, node_hash: str) -> None:
+        """Record ``obj`` -> ``node_hash`` for a node converted elsewhere (e.g. a worker)."""
+        self._entries[id(obj)] = (obj, node_hash, ())
+
+    def invalidate(self, obj: Any) -> None:
+        """Drop ``obj``'s entry and the entries of everything built on it."""
+        entries = self._entries
+        parents = self._parents
+        stack = [id(obj)]
+        while stack:
+            obj_id = stack.pop()
+            # Ancestors of an uncached entry are already uncached.
+            if entries.pop(obj_id, None) is None:
+                continue
+            stack.extend(parents.pop(obj_id, ()))
+
+    def finish(self, root_hash: str, type_registry: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Complete a build: return the DAG reachable from ``root_hash`` and drop
+        nodes (and entries) that are no longer part of it.
+        """
+        self._type_registry = dict(type_registry)
+        reachable = collect_reachable(self.nodes, root_hash)
+        if len(reachable) != len(self.nodes):
+            self.nodes = dict(reachable)
+            stale: List[int] = [
+                obj_id
+                for obj_id, (_, node_hash, _children) in self._entries.items()
+                if node_hash not in reachable
+            ]
+            for obj_id in stale:
+                del self._entries[obj_id]
+                self._parents.pop(obj_id, None)
+        return reachable
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the last build."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "nodes": len(self.nodes),
+        }
@@ -0,0 +1,157 @@
+"""Process-pool DAG conversion of an assembly's components."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .conversion import pydantic_to_dag
+from .hooks import HookRegistry
+from .incremental import DagBuildCache
+
+# Hooks whose side effects would happen in the worker processes and be lost.
+_OBSERVER_HOOK_TYPES = ("on_encounter", "on_first_encounter", "before_node", "after_node", "before_field")
+
+# (components, type_registry, hooks) of the conversion a worker process
+# serves, set by _init_worker in the worker only.
+_WORKER_STATE: Optional[Tuple[List[Any], Dict[str, int], Optional[HookRegistry]]] = None
+
+
+def _init_worker(components: List[Any], type_registry: Dict[str, int], hooks: Optional[HookRegistry]) -> None:
+    # Forked workers inherit the initializer's arguments, so the models
+    # never have to be pickled on the way in.
+    global _WORKER_STATE
+    _WORKER_STATE = (components, type_registry, hooks)
+
+
+def _convert_component(index: int) -> Tuple[str, Dict[str, Any], Dict[str, int]]:
+    components, type_registry, hooks = _WORKER_STATE
+    type_registry = dict(type_registry)
+    memo: Dict[str, Any] = {}
+    node_hash = pydantic_to_dag(components[index], memo, type_registry, hooks)
+    return node_hash, memo, type_registry
+
+
+def _iter_models(values: Iterable[Any]) -> Iterator[BaseModel]:
+    """Yield the models in ``values``, looking inside lists, tuples, sets and dicts."""
+    stack = [values]
+    while stack:
+        items = stack.pop()
+        for value in items:
+            if isinstance(value, BaseModel):
+                yield value
+            elif isinstance(value, (list, tuple, set)):
+                stack.append(value)
+            elif isinstance(value, dict):
+                stack.append(value.values())
+
+
+def _iter_children(obj: BaseModel) -> Iterator[BaseModel]:
+    values = list(obj.__dict__.values())
+    if obj.__pydantic_extra__:
+        values.extend(obj.__pydantic_extra__.values())
+    return _iter_models(values)
+
+
+def _is_expandable(obj: BaseModel, type_registry: Dict[str, int]) -> bool:
+    return obj.__class__.__name__ not in type_registry and hasattr(obj.__class__, "expand")
+
+
+def _shares_mutable_state(groups: List[List[Any]], type_registry: Dict[str, int]) -> bool:
+    """
+    Whether separately converted groups of objects could observe each other.
+
+    Expansion mutates models (an expanded sketch element registers its
+    replacement in ``sketch.elements``), so an object reachable from two
+    groups converts differently depending on which group saw it first if an
+    expandable object is reachable from it. Sharing anything else is safe.
+    """
+    owner: Dict[int, int] = {}
+    shared: List[BaseModel] = []
+    for index, roots in enumerate(groups):
+        stack = list(_iter_models(roots))
+        while stack:
+            obj = stack.pop()
+            seen_by = owner.get(id(obj))
+            if seen_by is not None:
+                if seen_by != index:
+                    shared.append(obj)
+                continue
+            owner[id(obj)] = index
+            stack.extend(_iter_children(obj))
+
+    clean = set()
+    for start in shared:
+        stack = [start]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in clean:
+                continue
+            if _is_expandable(obj, type_registry):
+                return True
+            clean.add(id(obj))
+            stack.extend(_iter_children(obj))
+    return False
+
+
+def convert_parallel(
+    root: BaseModel,
+    type_registry: Dict[str, int],
+    hooks: Optional[HookRegistry],
+    workers: int,
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Convert ``root.components`` in a process pool and assemble the DAG.
+
+    Each worker converts one component subtree into its own memo. The memos
+    are merged (shared nodes collapse by hash), the root is converted on top
+    with the component hashes already known, and the nodes are put back in
+    the post-order a serial ``pydantic_to_dag`` would produce.
+
+    Returns:
+        (root_hash, memo), or None when the conversion must stay serial: no
+        fork start method, fewer than two components, hooks with side effects,
+        components that share expandable state, or components introducing
+        types missing from ``type_registry`` (their ids depend on serial
+        encounter order).
+    """
+    components = getattr(root, "components", None)
+    if workers < 2 or not isinstance(components, list) or len(components) < 2:
+        return None
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+    if hooks and any(hooks.has_hooks(hook_type) for hook_type in _OBSERVER_HOOK_TYPES):
+        return None
+    # The root's own fields are converted in this process, after the workers.
+    root_fields = [value for name, value in root.__dict__.items() if name != "components"]
+    groups = [root_fields] + [[component] for component in components]
+    if _shares_mutable_state(groups, type_registry):
+        return None
+
+    workers = min(workers, len(components))
+    # A few chunks per worker: fewer round trips, still balanced.
+    chunksize = max(1, len(components) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(components, dict(type_registry), hooks),
+    ) as pool:
+        results = list(pool.map(_convert_component, range(len(components)), chunksize=chunksize))
+
+    cache = DagBuildCache()
+    try:
+        for component, (node_hash, memo, worker_registry) in zip(components, results):
+            if worker_registry != type_registry:
+                return None
+            cache.nodes.update(memo)
+            cache.seed(component, node_hash)
+        cache.begin(root, type_registry)
+        root_hash = pydantic_to_dag(root, cache.nodes, type_registry, hooks, cache=cache)
+        return root_hash, cache.finish(root_hash, type_registry)
+    finally:
+        cache.close()
+
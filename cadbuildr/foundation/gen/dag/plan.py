@@ -0,0 +1,146 @@
+"""Per-class conversion plans for pydantic_to_dag.
+
+Everything the converter needs to know about a model class that does not
+depend on the instance (field order, statically skipped fields, which fields
+can be computed, which hooks apply) is worked out once and reused for every
+object of that class. Plans built against a HookRegistry are cached on it and
+dropped whenever a hook is registered or the registry is cleared.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..runtime.computable import Computable
+from .hooks import HookRegistry, TraversalContext
+
+# Plans for conversions without a hook registry.
+_BARE_PLANS: Dict[type, "ConversionPlan"] = {}
+
+# Value types a scalar parameter node may hold (exact types, see ``scalar``).
+SCALAR_VALUE_TYPES = frozenset({bool, int, float, str})
+
+_NODE_HOOK_TYPES = ("on_encounter", "after_expand", "before_node", "on_first_encounter", "after_node")
+
+
+class FieldPlan:
+    """How to convert one field of a model class."""
+
+    __slots__ = ("name", "skip_hooks", "computable", "before_field", "field_hooks")
+
+    def __init__(
+        self,
+        name: str,
+        skip_hooks: Tuple[Callable, ...],
+        computable: bool,
+        before_field: Tuple[Callable, ...],
+        field_hooks: Tuple[Callable, ...],
+    ):
+        self.name = name
+        # should_skip_field hooks that must still be asked per object.
+        self.skip_hooks = skip_hooks
+        # Whether a None value may be filled in by obj.compute(name).
+        self.computable = computable
+        self.before_field = before_field
+        # process_field hooks registered for "<Type>.<field>".
+        self.field_hooks = field_hooks
+
+
+class ConversionPlan:
+    """Instance-independent conversion facts for one model class."""
+
+    __slots__ = (
+        "type_name", "fields", "skipped", "expandable", "needs_context", "scalar",
+        "on_encounter", "after_expand", "before_node", "on_first_encounter", "after_node",
+    )
+
+    def __init__(self, cls: type, obj: BaseModel, hooks: Optional[HookRegistry]):
+        type_name = cls.__name__
+        self.type_name = type_name
+        self.expandable = hasattr(cls, "expand")
+
+        node_hooks: Dict[str, Tuple[Callable, ...]] = {}
+        for hook_type in _NODE_HOOK_TYPES:
+            node_hooks[hook_type] = hooks.dispatch(hook_type, type_name) if hooks else ()
+        self.on_encounter = node_hooks["on_encounter"]
+        self.after_expand = node_hooks["after_expand"]
+        self.before_node = node_hooks["before_node"]
+        self.on_first_encounter = node_hooks["on_first_encounter"]
+        self.after_node = node_hooks["after_node"]
+
+        fields = []
+        skipped_fields = []
+        if hooks:
+            skip_hooks = hooks.dispatch("should_skip_field", type_name)
+            before_field = hooks.dispatch("before_field", type_name)
+            probe_context = TraversalContext(memo={}, type_registry={}, valid_types=set())
+        else:
+            skip_hooks = before_field = ()
+        for name, field_info in cls.model_fields.items():
+            dynamic_skips = []
+            skipped = False
+            for hook in skip_hooks:
+                if not hooks.is_static(hook):
+                    dynamic_skips.append(hook)
+                    continue
+                try:
+                    skipped = bool(hook(name, obj, probe_context))
+                except Exception:
+                    skipped = False
+                if skipped:
+                    break
+            if skipped:
+                skipped_fields.append(name)
+                continue
+            field_hooks = hooks.dispatch("process_field", f"{type_name}.{name}") if hooks else ()
+            fields.append(FieldPlan(
+                name,
+                tuple(dynamic_skips),
+                _is_computable(cls, field_info),
+                before_field,
+                field_hooks,
+            ))
+        self.fields = tuple(fields)
+        # Names of the statically skipped fields.
+        self.skipped = tuple(skipped_fields)
+
+        self.needs_context = bool(
+            any(node_hooks.values())
+            or any(fp.skip_hooks or fp.before_field or fp.field_hooks for fp in self.fields)
+        )
+        # Scalar parameters (FloatParameter(value=0.0), ...) become a node with
+        # a single "value" param and no deps; with no hooks or computation
+        # involved their node depends on nothing but the value.
+        self.scalar = bool(
+            type_name.endswith("Parameter")
+            and not self.expandable
+            and not self.needs_context
+            and len(self.fields) == 1
+            and self.fields[0].name == "value"
+            and not self.fields[0].computable
+            and tuple(cls.model_fields) == ("value",)
+        )
+
+
+def _is_computable(cls: type, field_info: Any) -> bool:
+    """Whether ``obj.compute(name)`` can produce a value for this field."""
+    compute = getattr(cls, "compute", None)
+    if compute is None:
+        return False
+    if compute is not Computable.compute:
+        return True
+    # Computable.compute only succeeds with @compute or @default metadata.
+    meta = field_info.json_schema_extra
+    return isinstance(meta, dict) and (
+        isinstance(meta.get("compute"), dict) or isinstance(meta.get("default"), dict)
+    )
+
+
+def get_plan(obj: BaseModel, hooks: Optional[HookRegistry]) -> ConversionPlan:
+    """Return the conversion plan for ``obj``'s class under ``hooks``."""
+    cls = obj.__class__
+    plans = hooks._plans if hooks else _BARE_PLANS
+    plan = plans.get(cls)
+    if plan is None:
+        plan = plans[cls] = ConversionPlan(cls, obj, hooks)
+    return plan
@@ -0,0 +1,230 @@
+"""Per-type timing (and optional allocation) profile of DAG conversion.
+
+Pass a ``ConversionProfile`` to ``pydantic_to_dag`` / ``show_dag``, or use it
+as a context manager to profile every conversion run inside the block::
+
+    with ConversionProfile() as profile:
+        show_dag(assembly)
+    print(profile.table())
+    data = profile.report()  # JSON-serializable
+
+Conversions that are not profiled only pay a few ``is None`` checks.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_perf_counter = time.perf_counter
+
+# Profiles activated with ``with ConversionProfile():``, innermost last.
+_ACTIVE: List["ConversionProfile"] = []
+
+
+def active_profile() -> Optional["ConversionProfile"]:
+    """Return the innermost profile activated as a context manager, if any."""
+    return _ACTIVE[-1] if _ACTIVE else None
+
+
+@dataclass
+class TypeProfile:
+    """
+    Counters for one model type.
+
+    ``total_time`` includes the conversion of child nodes, ``self_time``
+    does not. The expand/compute/hooks/hash times are parts of
+    ``self_time``. Expansion and the hooks that run before a node is
+    started (``on_encounter``, ``after_expand``) are attributed to the
+    original type but, as that node has not started, their time is part of
+    the parent's ``self_time``.
+    """
+    count: int = 0
+    nodes_created: int = 0
+    memo_hits: int = 0
+    total_time: float = 0.0
+    self_time: float = 0.0
+    expand_count: int = 0
+    expand_time: float = 0.0
+    compute_count: int = 0
+    compute_time: float = 0.0
+    hook_calls: int = 0
+    hook_time: float = 0.0
+    hash_time: float = 0.0
+    alloc_bytes: int = 0  # net traced allocation, excluding children
+
+    @property
+    def memo_hit_rate(self) -> float:
+        finished = self.nodes_created + self.memo_hits
+        return self.memo_hits / finished if finished else 0.0
+
+
+class ConversionProfile:
+    """
+    Collects a per-type profile of the conversions it is passed to.
+
+    Args:
+        trace_allocations: Also record net allocations per type with
+            ``tracemalloc`` (started for the duration of the profile if it
+            is not running already). This slows conversion down noticeably.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.types: Dict[str, TypeProfile] = {}
+        self.phases: Dict[str, float] = {}
+        # [type name, start time, child time, start memory, child memory]
+        self._stack: List[list] = []
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "ConversionProfile":
+        self.start()
+        _ACTIVE.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _ACTIVE.remove(self)
+        self.stop()
+
+    def start(self) -> None:
+        """Start tracemalloc if allocations are traced and it is not running."""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        """Stop tracemalloc if :meth:`start` started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _type(self, type_name: str) -> TypeProfile:
+        entry = self.types.get(type_name)
+        if entry is None:
+            entry = self.types[type_name] = TypeProfile()
+        return entry
+
+    def _memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    # -- recording, called by the conversion ------------------------------
+
+    def node_started(self, type_name: str) -> None:
+        memory = self._memory() if self.trace_allocations else 0
+        self._stack.append([type_name, _perf_counter(), 0.0, memory, 0])
+
+    def node_finished(self, created: bool) -> None:
+        type_name, start, child_time, start_memory, child_memory = self._stack.pop()
+        elapsed = _perf_counter() - start
+        entry = self._type(type_name)
+        entry.count += 1
+        if created:
+            entry.nodes_created += 1
+        else:
+            entry.memo_hits += 1
+        entry.total_time += elapsed
+        entry.self_time += elapsed - child_time
+        allocated = 0
+        if self.trace_allocations:
+            allocated = self._memory() - start_memory
+            entry.alloc_bytes += allocated - child_memory
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += elapsed
+            parent[4] += allocated
+
+    def node_abandoned(self) -> None:
+        """Drop the in-progress nodes of a conversion that raised."""
+        self._stack.clear()
+
+    def add_time(self, kind: str, type_name: str, elapsed: float) -> None:
+        entry = self._type(type_name)
+        if kind == "expand":
+            entry.expand_count += 1
+            entry.expand_time += elapsed
+        elif kind == "compute":
+            entry.compute_count += 1
+            entry.compute_time += elapsed
+        elif kind == "hooks":
+            entry.hook_calls += 1
+            entry.hook_time += elapsed
+        elif kind == "hash":
+            entry.hash_time += elapsed
+
+    def timed(self, kind: str, fn: Callable, obj_arg: int) -> Callable:
+        """Wrap ``fn`` to add its run time to the type of its ``obj_arg``-th argument."""
+        add_time = self.add_time
+
+        def wrapper(*args: Any) -> Any:
+            start = _perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                add_time(kind, type(args[obj_arg]).__name__, _perf_counter() - start)
+
+        return wrapper
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to the ``name`` phase."""
+        start = _perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + _perf_counter() - start
+
+    # -- output -----------------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        """Return the profile as JSON-serializable data."""
+        types = {}
+        for type_name, entry in self.types.items():
+            data = asdict(entry)
+            data["memo_hit_rate"] = entry.memo_hit_rate
+            types[type_name] = data
+        created = sum(entry.nodes_created for entry in self.types.values())
+        hits = sum(entry.memo_hits for entry in self.types.values())
+        return {
+            "phases": dict(self.phases),
+            "totals": {
+                "nodes": created + hits,
+                "nodes_created": created,
+                "memo_hits": hits,
+                "memo_hit_rate": hits / (created + hits) if created + hits else 0.0,
+                "self_time": sum(entry.self_time for entry in self.types.values()),
+                "expand_time": sum(entry.expand_time for entry in self.types.values()),
+                "compute_time": sum(entry.compute_time for entry in self.types.values()),
+                "hook_time": sum(entry.hook_time for entry in self.types.values()),
+                "hash_time": sum(entry.hash_time for entry in self.types.values()),
+                "alloc_bytes": sum(entry.alloc_bytes for entry in self.types.values()),
+            },
+            "types": types,
+        }
+
+    def table(self, sort: str = "self_time", limit: Optional[int] = 20) -> str:
+        """Return a text table of the per-type profile, slowest first."""
+        rows = sorted(self.types.items(), key=lambda item: getattr(item[1], sort), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+        header = (
+            f"{'type':<28} {'count':>7} {'hit%':>5} {'total ms':>9} {'self ms':>8} "
+            f"{'expand':>7} {'compute':>8} {'hooks':>7} {'hash':>7}"
+        )
+        if self.trace_allocations:
+            header += f" {'alloc kB':>9}"
+        lines = [header, "-" * len(header)]
+        for type_name, entry in rows:
+            line = (
+                f"{type_name[:28]:<28} {entry.count:>7} {entry.memo_hit_rate * 100:>5.0f} "
+                f"{entry.total_time * 1000:>9.1f} {entry.self_time * 1000:>8.1f} "
+                f"{entry.expand_time * 1000:>7.1f} {entry.compute_time * 1000:>8.1f} "
+                f"{entry.hook_time * 1000:>7.1f} {entry.hash_time * 1000:>7.1f}"
+            )
+            if self.trace_allocations:
+                line += f" {entry.alloc_bytes / 1024:>9.1f}"
+            lines.append(line)
+        if self.phases:
+            lines.append("")
+            lines.extend(f"{name}: {seconds * 1000:.1f} ms" for name, seconds in self.phases.items())
+        return "\n".join(lines)
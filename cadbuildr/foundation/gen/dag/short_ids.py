@@ -0,0 +1,129 @@
+"""Short node ids: minimal unique hash prefixes, optionally stable across builds."""
+
+import bisect
+from itertools import repeat
+from operator import xor
+from typing import Dict, Iterable, List, Optional
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Calculate common prefix length between two strings."""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _adjacent_prefix_lengths(sorted_ids: List[str]) -> List[int]:
+    """Common prefix length of each consecutive pair in ``sorted_ids``."""
+    if len(sorted_ids) < 2:
+        return []
+    widths = set(map(len, sorted_ids))
+    try:
+        if len(widths) != 1:
+            raise ValueError
+        # Hex digests: the xor of two values has as many leading zero nibbles
+        # as the strings share leading characters.
+        values = list(map(int, sorted_ids, repeat(16)))
+    except ValueError:
+        return [_common_prefix_length(a, b) for a, b in zip(sorted_ids, sorted_ids[1:])]
+    bits = widths.pop() * 4
+    differing = map(int.bit_length, map(xor, values, values[1:]))
+    return [(bits - n) >> 2 for n in differing]
+
+
+class ShortIdMap:
+    """
+    Append-only mapping from full node hashes to short ids.
+
+    A hash gets the shortest prefix (at least ``initial_length`` characters)
+    that is not a prefix of any other hash the map knows about and does not
+    collide with an id already handed out. Once assigned, an id never changes,
+    so passing the same map to successive ``format_dag`` / ``show_dag`` calls
+    keeps a node's id stable across rebuilds even when new nodes with similar
+    hashes appear. The first assignment from an empty map gives exactly the
+    ids of the per-build truncation.
+
+    Assignment costs O(k log n) for k new hashes against n known ones, plus a
+    sorted merge when a build adds many hashes at once.
+    """
+
+    def __init__(self, initial_length: int = 4):
+        self.initial_length = initial_length
+        self._short: Dict[str, str] = {}
+        self._taken: set = set()
+        # Every hash ever assigned, sorted, for neighbour lookups.
+        self._sorted: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._short)
+
+    def __contains__(self, full_hash: object) -> bool:
+        return full_hash in self._short
+
+    def get(self, full_hash: str) -> Optional[str]:
+        """Return the id assigned to ``full_hash``, if any."""
+        return self._short.get(full_hash)
+
+    def assign(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Return ids for ``hashes``, assigning ids to hashes seen for the first time."""
+        hashes = list(hashes)
+        short = self._short
+        new = sorted({h for h in hashes if h not in short})
+        if new:
+            self._assign_new(new)
+        return {h: short[h] for h in hashes}
+
+    def _assign_new(self, new: List[str]) -> None:
+        known = self._sorted
+        taken = self._taken
+        initial_length = self.initial_length
+
+        # Shortest unique prefix against neighbours in the sorted new batch...
+        common = _adjacent_prefix_lengths(new)
+        lengths = [
+            max(initial_length, left + 1, right + 1)
+            for left, right in zip([-1] + common, common + [-1])
+        ]
+        # ...and against the nearest hashes assigned in earlier builds.
+        if known:
+            for i, full_hash in enumerate(new):
+                position = bisect.bisect_left(known, full_hash)
+                if position > 0:
+                    lengths[i] = max(lengths[i], _common_prefix_length(full_hash, known[position - 1]) + 1)
+                if position < len(known):
+                    lengths[i] = max(lengths[i], _common_prefix_length(full_hash, known[position]) + 1)
+
+        short = self._short
+        for full_hash, length in zip(new, lengths):
+            short_id = full_hash[:length]
+            # Handle collisions with ids assigned earlier by lengthening
+            while short_id in taken and short_id != full_hash:
+                length += 1
+                if length > len(full_hash):
+                    raise ValueError(f"Cannot truncate hash {full_hash} to a unique ID.")
+                short_id = full_hash[:length]
+            short[full_hash] = short_id
+            taken.add(short_id)
+
+        if len(new) < 64:
+            for full_hash in new:
+                bisect.insort(known, full_hash)
+        else:
+            # Two sorted runs: timsort merges them in linear time.
+            known.extend(new)
+            known.sort()
+
+    def as_dict(self) -> Dict[str, str]:
+        """Full hash -> short id for every assignment, in assignment order."""
+        return dict(self._short)
+
+    @classmethod
+    def from_dict(cls, ids: Dict[str, str], initial_length: int = 4) -> "ShortIdMap":
+        """Restore a map saved with :meth:`as_dict`."""
+        id_map = cls(initial_length)
+        id_map._short.update(ids)
+        id_map._taken.update(ids.values())
+        id_map._sorted = sorted(ids)
+        return id_map
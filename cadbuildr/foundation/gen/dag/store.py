@@ -0,0 +1,190 @@
+"""Persistent content-addressed node store.
+
+``NodeStore`` keeps DAG nodes on disk in SQLite, keyed by their full node
+hash. Because ids are content hashes, a node stored by one build or project
+is valid for every other one, so standard parts exported once never have to
+be serialized or written again (see ``stream_dag(store=...)``).
+
+The store is bounded: when the stored node data grows past ``max_bytes`` the
+least recently used nodes are evicted, except those the write that grew it
+adds or keeps.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_last_used ON nodes (last_used);
+"""
+
+# Lookups hold at most this many ids per query (SQLite's variable limit).
+_BATCH = 500
+
+
+class NodeStore:
+    """
+    SQLite-backed store of DAG nodes keyed by full node hash, with LRU eviction.
+
+    Args:
+        path: Database file, created if missing. ``":memory:"`` keeps the
+            store in memory for the lifetime of the object.
+        max_bytes: Bound on the total size of stored node data. Inserting
+            past it evicts least recently used nodes down to
+            ``evict_to * max_bytes``.
+        evict_to: Fraction of ``max_bytes`` to shrink to when evicting.
+    """
+
+    def __init__(self, path: str = ":memory:", max_bytes: int = 256 * 1024 * 1024, evict_to: float = 0.9):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evict_to = evict_to
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        size, tick = self._db.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM nodes").fetchone()
+        self._bytes = size
+        self._tick = tick
+        # Ids read since the last write; their recency is updated in one batch.
+        self._touched: List[str] = []
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = 0
+
+    def close(self) -> None:
+        """Flush pending recency updates and close the database."""
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> "NodeStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def __contains__(self, node_id: object) -> bool:
+        found = self._db.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone() is not None
+        self._count(found, node_id)
+        return found
+
+    def _count(self, found: bool, node_id: Any) -> None:
+        if found:
+            self.hits += 1
+            self._touched.append(node_id)
+        else:
+            self.misses += 1
+
+    def get(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Return the node stored under ``node_id``, or None."""
+        row = self._db.execute("SELECT data FROM nodes WHERE id = ?", (node_id,)).fetchone()
+        self._count(row is not None, node_id)
+        return json.loads(row[0]) if row is not None else None
+
+    def get_many(self, node_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the stored nodes among ``node_ids`` (missing ids are left out)."""
+        node_ids = list(dict.fromkeys(node_ids))
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(node_ids), _BATCH):
+            batch = node_ids[start:start + _BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(f"SELECT id, data FROM nodes WHERE id IN ({placeholders})", batch)
+            for node_id, data in rows:
+                found[node_id] = json.loads(data)
+        self.hits += len(found)
+        self.misses += len(node_ids) - len(found)
+        self._touched.extend(found)
+        return found
+
+    def put(self, node_id: str, node: Dict[str, Any]) -> None:
+        """Store ``node`` under ``node_id``."""
+        self.put_many([(node_id, node)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], keep: Iterable[str] = ()) -> None:
+        """
+        Store several ``(node_id, node)`` pairs in one transaction.
+
+        Eviction never removes the nodes of ``items`` or the ids in ``keep``
+        (the nodes a stream written with this store refers to), only older
+        ones. Raises ValueError, storing nothing, when those nodes alone take
+        more than ``max_bytes``.
+        """
+        items = list(items)
+        size_before, puts_before, touched_before = self._bytes, self.puts, self._touched
+        try:
+            with self._db:
+                # Nodes read before this write are older than the ones it adds.
+                self._flush_touched()
+                self._tick += 1
+                tick = self._tick
+                insert = self._db.cursor()
+                for node_id, node in items:
+                    data = json.dumps(node, separators=(",", ":"))
+                    insert.execute("INSERT OR IGNORE INTO nodes VALUES (?, ?, ?, ?)", (node_id, data, len(data), tick))
+                    # Ids already stored hold the same content and are left alone.
+                    if insert.rowcount == 1:
+                        self._bytes += len(data)
+                        self.puts += 1
+                if self._bytes > self.max_bytes:
+                    self._evict({node_id for node_id, _ in items}.union(keep))
+        except BaseException:
+            # The transaction was rolled back.
+            self._bytes, self.puts, self._touched = size_before, puts_before, touched_before
+            raise
+
+    def flush(self) -> None:
+        """Write pending recency updates for nodes read since the last write."""
+        if self._touched:
+            with self._db:
+                self._flush_touched()
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        self._tick += 1
+        self._db.executemany(
+            "UPDATE nodes SET last_used = ? WHERE id = ?",
+            [(self._tick, node_id) for node_id in dict.fromkeys(self._touched)],
+        )
+        self._touched = []
+
+    def _evict(self, protected: Set[str]) -> None:
+        target = int(self.max_bytes * self.evict_to)
+        victims = []
+        freed = 0
+        rows = self._db.execute("SELECT id, size FROM nodes ORDER BY last_used")
+        for node_id, size in rows:
+            if self._bytes - freed <= target:
+                break
+            if node_id not in protected:
+                victims.append((node_id,))
+                freed += size
+        if self._bytes - freed > self.max_bytes:
+            raise ValueError(
+                f"The {len(protected)} nodes written or kept take more than max_bytes={self.max_bytes}; "
+                "use a larger NodeStore."
+            )
+        self._db.executemany("DELETE FROM nodes WHERE id = ?", victims)
+        self._bytes -= freed
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters since the store was opened, and its current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "puts": self.puts,
+            "evictions": self.evictions,
+            "nodes": len(self),
+            "bytes": self._bytes,
+        }
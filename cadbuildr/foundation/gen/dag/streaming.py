@@ -0,0 +1,176 @@
+"""Streaming DAG export.
+
+``DagStreamWriter`` stands in for the memo dict of ``pydantic_to_dag``: each
+node is written out the moment it is finalized (children always before their
+parents) and only its hash is kept, so exporting a DAG never holds the node
+contents, a truncated copy and the formatted dict in memory at once.
+
+Two layouts are supported, both carrying full 64-character node ids:
+
+``ndjson``
+    A header line ``{"version": ..., "format": "ndjson"}``, one
+    ``{"id": ..., "type": ..., "params": ..., "deps": ...}`` line per node,
+    then a footer line ``{"rootNodeId": ..., "serializableNodes": ...}``.
+``json``
+    A single JSON document ``{"version", "DAG", "rootNodeId",
+    "serializableNodes"}`` whose ``DAG`` object is written node by node.
+
+``read_dag_stream`` turns either layout back into the formatted DAG that
+``show_dag`` returns (with truncated ids).
+
+With a ``NodeStore``, nodes the store already holds are not serialized or
+written at all and new nodes are added to it when the export finishes; the
+stream then only reads back with the same store.
+"""
+
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .formatting import DAG_VERSION_FORMAT, format_dag
+from .incremental import collect_reachable, iter_dep_ids
+from .store import NodeStore
+
+STREAM_MODES = ("ndjson", "json")
+
+
+class DagStreamWriter:
+    """
+    Write-through memo for ``pydantic_to_dag`` that emits nodes to ``fp``.
+
+    Supports the membership test and item assignment the converter uses;
+    node contents are not retained, so hooks cannot read earlier nodes back
+    from ``context.memo``. Call :meth:`finish` once conversion is done to
+    write the footer.
+
+    Args:
+        fp: Text stream to write to (an open file, ``socket.makefile("w")``,
+            ``io.StringIO``, ...). It is not closed by the writer.
+        mode: ``"ndjson"`` or ``"json"``.
+        store: Optional NodeStore. Nodes it already holds are skipped; the
+            others are written and added to it by :meth:`finish`.
+    """
+
+    def __init__(self, fp: IO[str], mode: str = "ndjson", store: Optional[NodeStore] = None):
+        if mode not in STREAM_MODES:
+            raise ValueError(f"Unknown DAG stream mode {mode!r}; expected one of {STREAM_MODES}.")
+        self.fp = fp
+        self.mode = mode
+        self._ids: Set[str] = set()
+        self._finished = False
+        self.store = store
+        self._new: List[Tuple[str, Dict[str, Any]]] = []
+        self.skipped = 0
+        if mode == "ndjson":
+            fp.write(json.dumps({"version": DAG_VERSION_FORMAT, "format": "ndjson"}) + "\n")
+        else:
+            fp.write(json.dumps({"version": DAG_VERSION_FORMAT})[:-1] + ', "DAG": {')
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __getitem__(self, node_id: str) -> Any:
+        raise KeyError(f"{node_id!r}: node contents are not retained by DagStreamWriter")
+
+    def __setitem__(self, node_id: str, node: Dict[str, Any]) -> None:
+        if node_id in self._ids:
+            return
+        if self.store is not None:
+            if node_id in self.store:
+                self._ids.add(node_id)
+                self.skipped += 1
+                return
+            self._new.append((node_id, node))
+        if self.mode == "ndjson":
+            line = {"id": node_id}
+            line.update(node)
+            self.fp.write(json.dumps(line) + "\n")
+        else:
+            separator = "\n" if not self._ids else ",\n"
+            self.fp.write(f"{separator}{json.dumps(node_id)}: {json.dumps(node)}")
+        self._ids.add(node_id)
+
+    def finish(self, root_id: str, type_registry: Dict[str, int]) -> None:
+        """
+        Write the footer carrying the root id and the type registry.
+
+        With a store, raises ValueError before writing the footer when the
+        nodes of this export do not fit in the store's ``max_bytes``.
+        """
+        if self._finished:
+            raise RuntimeError("DagStreamWriter.finish() was already called.")
+        self._finished = True
+        if self.store is not None:
+            # Keeps every node of this export, skipped ones included, in the
+            # store the stream is read back with.
+            self.store.put_many(self._new, keep=self._ids)
+            self._new = []
+        footer = {"rootNodeId": root_id, "serializableNodes": type_registry}
+        if self.mode == "ndjson":
+            self.fp.write(json.dumps(footer) + "\n")
+        else:
+            self.fp.write("\n}, " + json.dumps(footer)[1:] + "\n")
+        self.fp.flush()
+
+
+def _fill_from_store(nodes: Dict[str, Any], root_id: str, store: Optional[NodeStore]) -> Dict[str, Any]:
+    """Add the nodes a stream skipped because ``store`` held them."""
+    wanted = [root_id] if root_id not in nodes else []
+    for node in nodes.values():
+        wanted.extend(dep for dep in iter_dep_ids(node["deps"]) if dep not in nodes)
+    if not wanted:
+        return nodes
+    if store is None:
+        raise ValueError("DAG stream references nodes it does not contain; pass the NodeStore it was written with.")
+    nodes = dict(nodes)
+    while wanted:
+        found = store.get_many(wanted)
+        missing = set(wanted) - found.keys()
+        if missing:
+            raise ValueError(f"{len(missing)} DAG nodes are neither in the stream nor in the store (evicted?).")
+        nodes.update(found)
+        wanted = list(
+            {dep for node in found.values() for dep in iter_dep_ids(node["deps"]) if dep not in nodes}
+        )
+    # Restore the order of a direct conversion.
+    return collect_reachable(nodes, root_id)
+
+
+def read_dag_stream(fp: IO[str], store: Optional[NodeStore] = None) -> Dict[str, Any]:
+    """
+    Read a stream written by ``DagStreamWriter`` into a formatted DAG.
+
+    ``store`` supplies the nodes skipped by a writer that had one.
+    """
+    first = fp.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        header = None
+
+    if isinstance(header, dict) and header.get("format") == "ndjson":
+        nodes: Dict[str, Any] = {}
+        footer = None
+        for line in fp:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            node_id = record.pop("id", None)
+            if node_id is None:
+                footer = record
+                break
+            nodes[node_id] = record
+        if footer is None:
+            raise ValueError("DAG stream ended without a footer; the export was not finished.")
+    else:
+        document = json.loads(first + fp.read())
+        nodes = document["DAG"]
+        footer = document
+
+    nodes = _fill_from_store(nodes, footer["rootNodeId"], store)
+    return format_dag(nodes, footer["rootNodeId"], footer["serializableNodes"])
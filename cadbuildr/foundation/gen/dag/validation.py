@@ -1,6 +1,15 @@
 """Cycle detection and DAG validation."""
 
-from typing import Any, Dict, Callable, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Callable, List, Optional, Sequence, Tuple
+
+from .incremental import iter_dep_ids
+
+# (node type, link field) pairs whose links must not form cycles.
+DEFAULT_LINK_RULES: Tuple[Tuple[str, str], ...] = (("Frame", "top_frame"),)
+
+# Plane frames that must hang off their component frame, not the origin.
+PLANE_FRAME_NAMES = frozenset({"yx", "yz", "zy", "xz", "zx"})
 
 
 def _build_node_info(dag_dict: dict, node_type_id: int, link_field: str) -> dict:
@@ -19,49 +28,51 @@ def _build_node_info(dag_dict: dict, node_type_id: int, link_field: str) -> dict
     return node_info
 
 
-def _dfs_follow_link(
-    node_id: str,
+def _follow_links(
     dag_dict: dict,
     node_type_id: int,
     link_field: str,
-    visited: set,
-    rec_stack: set,
-    path: list
-) -> tuple[bool, list]:
-    """DFS following a specific link field in nodes of a specific type."""
-    if node_id not in dag_dict:
-        return False, []
-    
-    node = dag_dict[node_id]
-    # Only check nodes of the specified type
-    if node.get("type") != node_type_id:
-        return False, []
-    
-    # If node is in recursion stack, we found a cycle
-    if node_id in rec_stack:
-        cycle_path = path + [node_id]
-        return True, cycle_path
-    
-    # If already visited (but not in stack), no cycle through this path
-    if node_id in visited:
-        return False, []
-    
-    visited.add(node_id)
-    rec_stack.add(node_id)
-    
-    # Follow the specified link field
-    if "deps" in node and link_field in node["deps"]:
-        link_id = node["deps"][link_field]
-        if link_id and isinstance(link_id, str):
-            has_cycle, cycle_path = _dfs_follow_link(
-                link_id, dag_dict, node_type_id, link_field, visited, rec_stack, path + [node_id]
-            )
-            if has_cycle:
-                rec_stack.remove(node_id)
-                return True, cycle_path
-    
-    rec_stack.remove(node_id)
-    return False, []
+    candidates: Optional[set] = None,
+) -> list:
+    """
+    Find a cycle along ``link_field`` between nodes of type ``node_type_id``.
+
+    Each node has at most one link, so this is a pointer chase from every
+    node of the type, in DAG order. A chase that reaches a node an earlier
+    chase already cleared stops there, which keeps the search O(nodes).
+    ``candidates`` restricts the search to a subset of node ids.
+
+    Returns:
+        The path from the first start node that reaches a cycle, ending with
+        the repeated node, or an empty list.
+    """
+    cleared = set()
+    for start_id, start in dag_dict.items():
+        if start.get("type") != node_type_id or start_id in cleared:
+            continue
+        if candidates is not None and start_id not in candidates:
+            continue
+        path = []
+        on_path = set()
+        node_id = start_id
+        while True:
+            node = dag_dict.get(node_id)
+            if node is None or node.get("type") != node_type_id:
+                break
+            if candidates is not None and node_id not in candidates:
+                break
+            if node_id in on_path:
+                return path + [node_id]
+            if node_id in cleared:
+                break
+            path.append(node_id)
+            on_path.add(node_id)
+            link_id = node.get("deps", {}).get(link_field)
+            if not link_id or not isinstance(link_id, str):
+                break
+            node_id = link_id
+        cleared.update(path)
+    return []
 
 
 def has_link_cycle(
@@ -92,18 +103,8 @@ def has_link_cycle(
     # Build node info map
     node_info = _build_node_info(dag_dict, node_type_id, link_field)
     
-    # Check all nodes of the specified type
-    for node_id, node in dag_dict.items():
-        if node.get("type") == node_type_id:
-            visited = set()
-            rec_stack = set()
-            has_cycle, cycle_path = _dfs_follow_link(
-                node_id, dag_dict, node_type_id, link_field, visited, rec_stack, []
-            )
-            if has_cycle:
-                return True, cycle_path, node_info
-    
-    return False, [], node_info
+    cycle_path = _follow_links(dag_dict, node_type_id, link_field)
+    return bool(cycle_path), cycle_path, node_info
 
 
 def print_node_hierarchy_report(dag: Dict[str, Any], node_info: dict, node_type_name: str, link_field: str):
@@ -114,41 +115,6 @@ def print_node_hierarchy_report(dag: Dict[str, Any], node_info: dict, node_type_
         print(f"  {node_id} ({info['name']}) -> {link_field}: {info[link_field]} ({link_name})")
 
 
-def _dfs_general(node: str, dag_dict: dict, visited: set, rec_stack: set) -> bool:
-    """DFS for general cycle detection."""
-    # Skip if node doesn't exist in DAG
-    if node not in dag_dict:
-        return False
-    
-    # If the node is already in the recursion stack, we found a cycle
-    if node in rec_stack:
-        return True
-    # If the node is already visited, skip it
-    if node in visited:
-        return False
-    
-    # Mark the node as visited and add it to the recursion stack
-    visited.add(node)
-    rec_stack.add(node)
-    
-    # Recur for all the dependencies (children) of the node
-    node_content = dag_dict[node]
-    if "deps" in node_content:
-        for child in node_content["deps"].values():
-            # If the child is a list, iterate over each element
-            if isinstance(child, list):
-                for item in child:
-                    if isinstance(item, str) and _dfs_general(item, dag_dict, visited, rec_stack):
-                        return True
-            elif isinstance(child, str):
-                if _dfs_general(child, dag_dict, visited, rec_stack):
-                    return True
-    
-    # Remove the node from the recursion stack
-    rec_stack.remove(node)
-    return False
-
-
 def has_cycle(dag: Dict[str, Any]) -> bool:
     """
     Check if a directed acyclic graph (DAG) has a cycle.
@@ -167,13 +133,299 @@ def has_cycle(dag: Dict[str, Any]) -> bool:
     else:
         dag_dict = dag
     
-    # Iterate through all nodes in the graph
-    visited = set()
-    for node in dag_dict:
-        if node not in visited:
-            rec_stack = set()
-            if _dfs_general(node, dag_dict, visited, rec_stack):
-                return True
-    
-    return False
+    return not validate_dag({"DAG": dag_dict}, link_rules=(), check_plane_frames=False).ok
+
+
+def _node_children(dag_dict: dict, deps: Dict[str, Any]) -> List[str]:
+    """Ids of the nodes of ``dag_dict`` referenced by ``deps``."""
+    children = []
+    for value in deps.values():
+        if type(value) is str:
+            if value in dag_dict:
+                children.append(value)
+        elif type(value) is list and all(type(item) is str for item in value):
+            children.extend(item for item in value if item in dag_dict)
+        elif isinstance(value, (list, tuple, dict)):
+            children.extend(child for child in iter_dep_ids({"": value}) if child in dag_dict)
+    return children
+
+
+def _children_of(dag_dict: dict) -> Dict[str, List[str]]:
+    """Map each node id to the ids of its deps that are nodes of the DAG."""
+    return {node_id: _node_children(dag_dict, node.get("deps", {})) for node_id, node in dag_dict.items()}
+
+
+def _cyclic_nodes(children: Dict[str, List[str]]) -> set:
+    """
+    Return the nodes left over by Kahn's algorithm: nodes on a cycle and
+    everything below one. Empty iff the graph is acyclic.
+    """
+    indegree = dict.fromkeys(children, 0)
+    for child_ids in children.values():
+        for child in child_ids:
+            indegree[child] += 1
+    ready = [node_id for node_id, count in indegree.items() if count == 0]
+    removed = 0
+    while ready:
+        node_id = ready.pop()
+        removed += 1
+        for child in children[node_id]:
+            count = indegree[child] - 1
+            indegree[child] = count
+            if not count:
+                ready.append(child)
+    if removed == len(children):
+        return set()
+    return {node_id for node_id, count in indegree.items() if count > 0}
+
+
+def _find_cycle(children: Dict[str, List[str]], cyclic: set) -> List[str]:
+    """Return one cycle among ``cyclic`` nodes, first node repeated at the end."""
+    # Every leftover node keeps a leftover parent, so walking parents
+    # backwards never gets stuck and must eventually repeat a node.
+    parent_of: Dict[str, str] = {}
+    for node_id in cyclic:
+        for child in children[node_id]:
+            if child in cyclic:
+                parent_of.setdefault(child, node_id)
+    node_id = next(iter(cyclic))
+    seen: Dict[str, int] = {}
+    walk: List[str] = []
+    while node_id not in seen:
+        seen[node_id] = len(walk)
+        walk.append(node_id)
+        node_id = parent_of[node_id]
+    cycle = walk[seen[node_id]:]
+    cycle.reverse()
+    return cycle + [cycle[0]]
+
+
+def _node_name(dag_dict: dict, node: Dict[str, Any], default: Any = "") -> Any:
+    name_id = node.get("deps", {}).get("name", "")
+    return dag_dict.get(name_id, {}).get("params", {}).get("value", default)
+
+
+@dataclass
+class DagIssue:
+    """One problem found by ``validate_dag`` or a validating conversion."""
+
+    kind: str  # "link_cycle", "cycle" or "plane_frame_origin"
+    title: str
+    message: str
+    node_ids: List[str] = field(default_factory=list)
+    details: Dict[str, Any] = field(default_factory=dict)
+    # Object path ("Type.field" per level) when found during conversion.
+    path: List[str] = field(default_factory=list)
+
+
+class DagValidationError(ValueError):
+    """Raised by a validating ``pydantic_to_dag`` at the first issue found."""
+
+    def __init__(self, issue: DagIssue):
+        message = issue.message
+        if issue.path:
+            message += f"\n  Object path: {' -> '.join(issue.path)}"
+        super().__init__(message)
+        self.issue = issue
+
+
+def _link_cycle_issue(node_type_name: str, link_field: str, cycle_ids: List[str], cycle_names: List[Any]) -> DagIssue:
+    # Cycles found during conversion have no node ids yet.
+    ids_line = f"  Cycle path (IDs): {' -> '.join(cycle_ids)}\n" if cycle_ids else ""
+    return DagIssue(
+        kind="link_cycle",
+        title=f"{node_type_name} Cycle",
+        message=(
+            f"ERROR: {node_type_name} cycle detected in DAG!\n"
+            f"{ids_line}"
+            f"  Cycle path (names): {' -> '.join(map(str, cycle_names))}\n"
+            f"  This will cause infinite loop in frontend. DAG not sent."
+        ),
+        node_ids=cycle_ids,
+        details={"node_type": node_type_name, "link_field": link_field},
+    )
+
+
+def _plane_frame_issue(frame_name: str, node_id: str, top_frame_id: str) -> DagIssue:
+    return DagIssue(
+        kind="plane_frame_origin",
+        title="Plane Frame Points to Origin",
+        message=(
+            f"ERROR: Plane frame '{frame_name}' ({node_id}) points to 'origin' instead of component frame. "
+            f"This will cause frontend infinite loop. DAG not sent."
+        ),
+        node_ids=[node_id, top_frame_id],
+    )
+
+
+@dataclass
+class DagValidationReport:
+    """Result of ``validate_dag``; issues are ordered by severity."""
+
+    issues: List[DagIssue] = field(default_factory=list)
+    node_count: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+def validate_dag(
+    dag: Dict[str, Any],
+    link_rules: Sequence[Tuple[str, str]] = DEFAULT_LINK_RULES,
+    check_plane_frames: bool = True,
+) -> DagValidationReport:
+    """
+    Check a formatted DAG before it is sent to a viewer or kernel.
+
+    One walk over the nodes checks the plane-frame rule (a plane frame such
+    as ``xz`` whose ``top_frame`` is ``origin``) and whether every node's
+    deps appear before it. They do in DAGs built by ``show_dag``, which
+    proves there is no cycle. Otherwise Kahn's algorithm finds every node
+    on or below a cycle; link cycles are a subset of general cycles, so the
+    ``link_rules`` are only followed inside those leftover nodes. Nothing
+    recurses, so arbitrarily long chains are fine, and the cost is
+    O(nodes + edges).
+
+    Args:
+        dag: Formatted DAG (``{"DAG": ..., "serializableNodes": ...}``)
+        link_rules: (type name, field) pairs whose links must not cycle
+        check_plane_frames: Whether to apply the plane-frame rule
+
+    Returns:
+        A DagValidationReport; link cycles come first, then the general
+        cycle, then plane-frame issues.
+    """
+    dag_dict = dag.get("DAG", {})
+    serializable_nodes = dag.get("serializableNodes", {})
+    frame_type_id = serializable_nodes.get("Frame", -1) if check_plane_frames else -1
+
+    # show_dag lists children before parents; while that holds, the node
+    # order itself is a topological order and no cycle is possible.
+    seen = set()
+    in_order = True
+    plane_issues: List[DagIssue] = []
+    for node_id, node in dag_dict.items():
+        if in_order:
+            for value in node.get("deps", {}).values():
+                if type(value) is str:
+                    if value not in seen and value in dag_dict:
+                        in_order = False
+                        break
+                elif any(child not in seen for child in _node_children(dag_dict, {"": value})):
+                    in_order = False
+                    break
+            seen.add(node_id)
+        if frame_type_id == -1 or node.get("type") != frame_type_id:
+            continue
+        frame_name = _node_name(dag_dict, node)
+        top_frame_id = node["deps"].get("top_frame")
+        if frame_name in PLANE_FRAME_NAMES and top_frame_id:
+            top_frame = dag_dict.get(top_frame_id)
+            if top_frame and _node_name(dag_dict, top_frame) == "origin":
+                plane_issues.append(_plane_frame_issue(frame_name, node_id, top_frame_id))
+
+    report = DagValidationReport(node_count=len(dag_dict))
+    report.issues.extend(plane_issues)
+    if in_order:
+        return report
+    children = _children_of(dag_dict)
+    cyclic = _cyclic_nodes(children)
+    cycle_issues: List[DagIssue] = []
+    if cyclic:
+        for node_type_name, link_field in link_rules:
+            node_type_id = serializable_nodes.get(node_type_name, -1)
+            if node_type_id == -1:
+                continue
+            cycle_path = _follow_links(dag_dict, node_type_id, link_field, cyclic)
+            if not cycle_path:
+                continue
+            cycle_names = [_node_name(dag_dict, dag_dict[node_id], "unknown") for node_id in cycle_path]
+            issue = _link_cycle_issue(node_type_name, link_field, cycle_path, cycle_names)
+            issue.details["node_info"] = _build_node_info(dag_dict, node_type_id, link_field)
+            cycle_issues.append(issue)
+        cycle_issues.append(DagIssue(
+            kind="cycle",
+            title="General Cycle",
+            message="ERROR: General cycle detected in DAG! This will cause infinite loop in frontend. DAG not sent.",
+            node_ids=_find_cycle(children, cyclic),
+            details={"nodes_on_or_below_cycles": len(cyclic)},
+        ))
+    report.issues[:0] = cycle_issues
+    return report
+
+
+def _object_name(obj: Any) -> Any:
+    name = getattr(obj, "name", None)
+    return getattr(name, "value", name) if name is not None else "unknown"
+
+
+class ConversionValidator:
+    """
+    Checks ``validate_dag``'s invariants while ``pydantic_to_dag`` runs.
+
+    Passed as ``pydantic_to_dag(..., validator=...)`` (``show_dag(validate=True)``
+    creates one); the conversion raises ``DagValidationError`` with the object
+    path of the offending node as soon as an issue is found instead of after
+    the whole DAG is built:
+
+    - plane frames whose ``top_frame`` is ``origin``, checked as each frame
+      node is finalized from the names of the nodes finalized before it;
+    - cycles in the object graph, reported as link cycles when every object
+      on the cycle is linked through one of the ``link_rules``.
+
+    Content-hashed nodes cannot form cycles, so these are the only cycles a
+    conversion can hit.
+    """
+
+    def __init__(
+        self,
+        link_rules: Sequence[Tuple[str, str]] = DEFAULT_LINK_RULES,
+        check_plane_frames: bool = True,
+    ):
+        self.link_rules = list(link_rules)
+        self.check_plane_frames = check_plane_frames
+        # Node hash -> value, for nodes of the form {"params": {"value": str}}.
+        self._names: Dict[str, str] = {}
+        # Frame node hash -> frame name.
+        self._frame_names: Dict[str, Any] = {}
+
+    def node_finished(self, type_name: str, node_hash: str, node: Dict[str, Any]) -> Optional[DagIssue]:
+        """Record a finalized node; return the issue it raises, if any."""
+        if not self.check_plane_frames:
+            return None
+        params = node["params"]
+        if len(params) == 1 and type(params.get("value")) is str:
+            self._names[node_hash] = params["value"]
+            return None
+        if type_name != "Frame":
+            return None
+        deps = node["deps"]
+        frame_name = self._names.get(deps.get("name", ""), "")
+        self._frame_names[node_hash] = frame_name
+        top_frame_id = deps.get("top_frame")
+        if frame_name in PLANE_FRAME_NAMES and top_frame_id and self._frame_names.get(top_frame_id) == "origin":
+            return _plane_frame_issue(frame_name, node_hash, top_frame_id)
+        return None
+
+    def object_cycle(self, cycle: List[Tuple[Any, str, Optional[str]]]) -> DagIssue:
+        """
+        Describe a cycle in the object graph.
 
+        Args:
+            cycle: (object, type name, field followed) for each object on the
+                cycle, starting with the object that was reached again.
+        """
+        type_names = {type_name for _, type_name, _ in cycle}
+        if len(type_names) == 1:
+            (type_name,) = type_names
+            # A type can have several link fields, each its own rule.
+            for rule_type_name, link_field in self.link_rules:
+                if rule_type_name == type_name and all(field_name == link_field for _, _, field_name in cycle):
+                    names = [_object_name(obj) for obj, _, _ in cycle]
+                    return _link_cycle_issue(type_name, link_field, [], names + names[:1])
+        return DagIssue(
+            kind="cycle",
+            title="General Cycle",
+            message="ERROR: General cycle detected in DAG! This will cause infinite loop in frontend. DAG not sent.",
+        )
@@ -14,6 +14,9 @@ from .helpers import (
 from .computable import Computable
 from .expandable import Expandable, run_expand
 from .parameter_fields_mixin import ParameterFieldsMixin
+from .tracking import mark_dirty
+from .trusted import construct_trusted
+from .schema_builds import build_deferred_schemas, schema_build_times
 
 __all__ = [
     "register_compute_fn",
@@ -24,6 +27,10 @@ __all__ = [
     "Computable",
     "Expandable",
     "ParameterFieldsMixin",
+    "mark_dirty",
+    "construct_trusted",
+    "build_deferred_schemas",
+    "schema_build_times",
     "_eval_expr",
     "run_compute",
     "run_method",
@@ -1,59 +1,85 @@
 """Computable mixin for types with @compute fields."""
 
-from typing import Any
+from typing import Any, Optional, Set, Tuple
 
 from .helpers import _eval_expr, run_compute
 
 
-class Computable:
-    """Mixin for types with @compute fields."""
-    
-    def __getattribute__(self, name: str) -> Any:
-        """
-        Override __getattribute__ to lazily compute fields when they're None.
-        This is called for ALL attribute access, so we can intercept None values.
-        """
-        # Get the value using the parent class's __getattribute__ to avoid infinite recursion
+# (id(instance), field name) of the @compute fields being computed, so a
+# compute that reads its own field sees None instead of recursing.
+_COMPUTING: Set[Tuple[int, str]] = set()
+
+# Computable classes whose @compute fields have their descriptors installed.
+_INSTALLED: Set[type] = set()
+
+
+class _ComputedField:
+    """
+    Data descriptor for a @compute field: reads that find None compute the
+    value and cache it on the instance.
+
+    Pydantic keeps field values in the instance ``__dict__``; the descriptor
+    only takes over attribute reads of the field, so every other attribute
+    read on the model stays a plain lookup.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            # Field names are not class attributes of pydantic models.
+            raise AttributeError(self.name)
+        name = self.name
         try:
-            value = super().__getattribute__(name)
-        except AttributeError:
-            # Attribute doesn't exist, let Pydantic handle it
-            raise
-        
-        # If value is None and this is a computed field, compute it
-        if value is None and not name.startswith('_'):
+            value = instance.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if value is None:
+            key = (id(instance), name)
+            if key in _COMPUTING:
+                return None
+            _COMPUTING.add(key)
             try:
-                model_fields = super().__getattribute__('__class__').model_fields
-                if name in model_fields:
-                    fld = model_fields[name]
-                    meta = fld.json_schema_extra or {}
-                    
-                    # If field has @compute metadata, compute it now
-                    if 'compute' in meta:
-                        # Check if we're already computing this field (prevent infinite recursion)
-                        computing_key = f'_computing_{name}'
-                        try:
-                            is_computing = super().__getattribute__(computing_key)
-                        except AttributeError:
-                            is_computing = False
-                        
-                        if not is_computing:
-                            # Mark as computing
-                            object.__setattr__(self, computing_key, True)
-                            try:
-                                computed_value = self.compute(name)
-                                # Cache the computed value
-                                object.__setattr__(self, name, computed_value)
-                                return computed_value
-                            finally:
-                                # Unmark as computing
-                                object.__setattr__(self, computing_key, False)
+                value = instance.compute(name)
             except (AttributeError, ValueError, KeyError):
-                # Not a model field or computation failed, return None
-                pass
-        
+                # Computation failed, the field stays None
+                return None
+            finally:
+                _COMPUTING.discard(key)
+            # Cache the computed value
+            instance.__dict__[name] = value
         return value
-    
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        del instance.__dict__[self.name]
+
+
+def _install_compute_fields(cls: type) -> None:
+    """Put a _ComputedField on ``cls`` for each of its @compute fields."""
+    for name, field_info in cls.model_fields.items():
+        meta = field_info.json_schema_extra
+        if isinstance(meta, dict) and "compute" in meta and not isinstance(cls.__dict__.get(name), _ComputedField):
+            setattr(cls, name, _ComputedField(name))
+    _INSTALLED.add(cls)
+
+
+class Computable:
+    """Mixin for types with @compute fields."""
+
+    def __new__(cls, *args: Any, **kwargs: Any):
+        # Generated models list BaseModel before this mixin, which rules out
+        # the pydantic class hooks; the first instance of each class (before
+        # which nothing can read its fields) installs the descriptors instead.
+        if cls not in _INSTALLED:
+            _install_compute_fields(cls)
+        return super().__new__(cls)
+
     def compute(self, field_name: str) -> Any:
         """Compute value for field with @compute directive."""
         if not hasattr(self.__class__, "model_fields"):
@@ -1,10 +1,20 @@
 """Expandable mixin for types with @expand directive."""
 
 import json
-from typing import Any, Dict, get_args, get_origin, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin, Union
 from pydantic import BaseModel
 
 from .helpers import _EXPAND_CUSTOM, _eval_expr
+from .schema_builds import ensure_schema_built
+
+
+# Parsed @expand templates of the classes whose 'result' field carries one.
+_TEMPLATES: Dict[type, dict] = {}
+
+# Compiled expansion plans, one per expandable class.
+_PLANS: Dict[type, "_ExpansionPlan"] = {}
+
+_MISSING = object()
 
 
 class Expandable:
@@ -17,33 +27,9 @@ class Expandable:
         expansion_data_source = getattr(self, "__expansion__", None)
 
         if expansion_data_source is None:
-            if "result" in self.__class__.model_fields:
-                result_field_info = self.__class__.model_fields["result"]
-                meta_on_result_field = result_field_info.json_schema_extra or {}
-                expand_meta_on_field = meta_on_result_field.get("expand")
-                if expand_meta_on_field and isinstance(expand_meta_on_field, dict) and "into" in expand_meta_on_field:
-                    into_value = expand_meta_on_field["into"]
-                    if isinstance(into_value, dict):
-                        # 'into' is already a dict - use directly
-                        expansion_data_source = into_value
-                    else:
-                        # 'into' is still a string - parse it (backward compatibility)
-                        try:
-                            expansion_data_source = json.loads(into_value)
-                        except json.JSONDecodeError as e:
-                            raise ValueError(
-                                f"Failed to parse 'into' JSON for field 'result' in {self.__class__.__name__}: {e}\n"
-                                f"Content: {into_value[:100] if isinstance(into_value, str) else str(into_value)[:100]}..."
-                            )
-                else:
-                     raise ValueError(
-                        f"Type {self.__class__.__name__} is Expandable but has no __expansion__ attribute "
-                        f"and its 'result' field lacks valid @expand metadata."
-                    )
-            else:
-                 raise ValueError(
-                    f"Type {self.__class__.__name__} is Expandable but has no __expansion__ attribute or 'result' field to source expansion data."
-                )
+            expansion_data_source = _TEMPLATES.get(self.__class__)
+            if expansion_data_source is None:
+                expansion_data_source = _TEMPLATES[self.__class__] = _result_template(self.__class__)
 
         if not isinstance(expansion_data_source, dict):
             raise ValueError(
@@ -53,6 +39,34 @@ class Expandable:
         return run_expand(self, expansion_data_source)
 
 
+def _result_template(cls: type) -> Any:
+    """Return the @expand 'into' template of the 'result' field of ``cls``."""
+    if "result" in cls.model_fields:
+        result_field_info = cls.model_fields["result"]
+        meta_on_result_field = result_field_info.json_schema_extra or {}
+        expand_meta_on_field = meta_on_result_field.get("expand")
+        if expand_meta_on_field and isinstance(expand_meta_on_field, dict) and "into" in expand_meta_on_field:
+            into_value = expand_meta_on_field["into"]
+            if isinstance(into_value, dict):
+                # 'into' is already a dict - use directly
+                return into_value
+            # 'into' is still a string - parse it (backward compatibility)
+            try:
+                return json.loads(into_value)
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f"Failed to parse 'into' JSON for field 'result' in {cls.__name__}: {e}\n"
+                    f"Content: {into_value[:100] if isinstance(into_value, str) else str(into_value)[:100]}..."
+                )
+        raise ValueError(
+            f"Type {cls.__name__} is Expandable but has no __expansion__ attribute "
+            f"and its 'result' field lacks valid @expand metadata."
+        )
+    raise ValueError(
+        f"Type {cls.__name__} is Expandable but has no __expansion__ attribute or 'result' field to source expansion data."
+    )
+
+
 def run_expand(inst, expansion_dict_resolved: dict):
     if "fn" in expansion_dict_resolved:
         fn_name = expansion_dict_resolved["fn"]
@@ -60,27 +74,43 @@ def run_expand(inst, expansion_dict_resolved: dict):
             raise ValueError(f"Custom expand function '{fn_name}' not registered.")
         return _EXPAND_CUSTOM[fn_name](inst, expansion_dict_resolved)
 
+    # The plan of a class is reused for as long as it expands the same template.
+    cls = inst.__class__
+    plan = _PLANS.get(cls)
+    if plan is None or plan.template is not expansion_dict_resolved:
+        target_cls = _target_class(cls)
+        if target_cls is None:
+            raise ValueError(
+                f"Cannot determine target class for expansion of {cls.__name__}. "
+                f"Make sure the expanded field has a proper type annotation."
+            )
+        plan = _PLANS[cls] = _ExpansionPlan(cls, expansion_dict_resolved, target_cls)
+    return plan.build(inst)
+
+
+def _target_class(cls: type) -> Optional[type]:
+    """Resolve the annotation of the 'result' field of ``cls``, None if it cannot be."""
     # For default expansion, we need to detect the target class
     # Look for the 'result' field to get its type annotation
-    if hasattr(inst.__class__, 'model_fields') and 'result' in inst.__class__.model_fields:
+    if hasattr(cls, 'model_fields') and 'result' in cls.model_fields:
         from typing import get_type_hints
         from importlib import import_module
         try:
             # Get the module namespace to resolve forward references
-            mod = import_module(inst.__class__.__module__)
+            mod = import_module(cls.__module__)
             ns = vars(mod)  # globalns/locals for hints
-            
+
             # Also import from models module to get all types (needed when using TYPE_CHECKING imports)
             try:
                 # Try to import models module: gen.models.smoothie_from_fruit_and_addon -> gen.models
-                models_module_name = inst.__class__.__module__.rsplit('.', 1)[0]
+                models_module_name = cls.__module__.rsplit('.', 1)[0]
                 models_mod = import_module(models_module_name)
                 # Update namespace with all types from models module
                 ns.update({k: v for k, v in vars(models_mod).items() if not k.startswith('_')})
             except (ImportError, ValueError):
                 pass  # Fallback to just using the current module
-            
-            type_hints = get_type_hints(inst.__class__, ns, ns)
+
+            type_hints = get_type_hints(cls, ns, ns)
             target_cls = type_hints.get('result')
             if target_cls:
                 # Unwrap Optional[X] to X (Optional[X] is Union[X, None])
@@ -91,143 +121,184 @@ def run_expand(inst, expansion_dict_resolved: dict):
                     non_none_args = [arg for arg in args if arg is not type(None)]
                     if len(non_none_args) == 1:
                         target_cls = non_none_args[0]
-                
-                return _default_expand(inst, expansion_dict_resolved, target_cls=target_cls)
-        except (ImportError, NameError, AttributeError) as e:
+                return target_cls
+        except (ImportError, NameError, AttributeError):
             # Fallback if type hints can't be resolved
             pass
+    return None
 
-    # Fallback: if we can't determine target class, raise an error
-    raise ValueError(
-        f"Cannot determine target class for expansion of {inst.__class__.__name__}. "
-        f"Make sure the expanded field has a proper type annotation."
-    )
 
+class _ExpansionPlan:
+    """
+    An @expand template compiled against the annotations of its target class.
 
-def _default_expand(instance: Any, expansion_template: Dict[str, Any], *, target_cls) -> Any:
+    Compiling resolves, once per template, what the expansion engine would
+    otherwise decide on every call: which field annotation each template
+    value is built with, which union member a ``__typename`` selects, the
+    attribute each ``$placeholder`` reads and which fields of each built
+    model are @compute fields. Building then only reads the placeholders off
+    the instance and constructs the models.
     """
-    Generic Pydantic model-based expansion engine.
-    Replaces placeholders like "$field_name" with instance attribute values.
-    Recursively builds Pydantic model instances instead of raw dictionaries.
 
-    Args:
-        instance: The model instance from which to pull placeholder values
-        expansion_template: The dictionary template guiding the expansion
-        target_cls: The Pydantic model class to instantiate
+    __slots__ = ("template", "target_cls", "build")
+
+    def __init__(self, owner_cls: type, template: Dict[str, Any], target_cls):
+        self.template = template
+        self.target_cls = target_cls
+        self.build = _ModelBuilder(owner_cls, template, target_cls)
 
-    Returns:
-        Fully instantiated Pydantic model of type target_cls
-    """
-    def _substitute_value(value, field_annotation):
-        """Recursively substitute values based on type annotation."""
-        # 1. Placeholder substitution
-        if isinstance(value, str) and value.startswith("$"):
-            attr_name = value[1:]  # Remove "$" prefix
-            # Try to get attribute - prioritize exact match, then model fields only
-            attr_value = None
-            if hasattr(instance, attr_name):
-                attr_value = getattr(instance, attr_name)
-            else:
-                # Try case-insensitive match in model_fields only (not all dir() attributes)
-                # This prevents matching enum classes like Size instead of field size
-                if hasattr(instance.__class__, 'model_fields'):
-                    for field_name in instance.__class__.model_fields.keys():
-                        if field_name.lower() == attr_name.lower():
-                            attr_value = getattr(instance, field_name)
-                            break
-            
-            # If the value is None and the field is computable, compute it first
-            if attr_value is None and hasattr(instance, 'compute'):
-                try:
-                    attr_value = instance.compute(attr_name)
-                except (ValueError, AttributeError) as e:
-                    # Let the error propagate with context
-                    raise ValueError(f"Failed to compute placeholder {value!r} on {instance.__class__.__name__}: {e}") from e
-            
-            if attr_value is None:
-                raise ValueError(f"Placeholder {value!r} (field '{attr_name}') not found on {instance.__class__.__name__}")
-            
-            return attr_value
-
-        # 2. Recurse based on annotation
-        origin = get_origin(field_annotation) or field_annotation
-
-        # Handle List types
-        if isinstance(value, list) and origin is list:
-            args = get_args(field_annotation)
-            if args:
-                elem_type = args[0]
-                return [_substitute_value(v, elem_type) for v in value]
-            else:
-                return value
-
-        # Handle Union types (including discriminated unions with __typename)
-        if isinstance(value, dict) and origin is Union:
-            args = get_args(field_annotation)
-            
-            # If dict has __typename, use it to pick the right type from Union
-            if "__typename" in value:
-                typename = value["__typename"]
-                for arg in args:
-                    if hasattr(arg, '__name__') and arg.__name__ == typename:
-                        return _build_model(value, arg)
-                raise ValueError(f"No type matching __typename='{typename}' found in Union {field_annotation}")
-            
-            # No __typename - try each union member to see which one validates
-            for arg in args:
-                if arg is type(None):  # Skip NoneType
-                    continue
-                try:
-                    return _build_model(value, arg)
-                except Exception:
-                    continue  # Try next type
-            
-            # None of the union members worked
-            raise ValueError(f"Could not match {value} to any type in Union {field_annotation}")
 
-        # Handle nested Pydantic models
-        if isinstance(value, dict) and isinstance(origin, type) and issubclass(origin, BaseModel):
-            return _build_model(value, origin)
+class _ModelBuilder:
+    """Builds one model of the template; a callable taking the expanded instance."""
 
-        # Primitive value - return as-is
-        return value
+    __slots__ = ("model_cls", "fields", "compute_fields")
 
-    def _build_model(src_dict: dict, model_cls):
-        """Build a Pydantic model from a dictionary using field annotations."""
+    def __init__(self, owner_cls: type, src_dict: dict, model_cls):
+        self.model_cls = model_cls
+        # None when model_cls is not a Pydantic model, which is an error
+        # only if this builder is reached.
+        self.fields: Optional[List[Tuple[str, Callable]]] = None
+        self.compute_fields: List[Tuple[str, Any]] = []
         if not hasattr(model_cls, 'model_fields'):
+            return
+        # The field annotations are unresolved until the schema is built.
+        ensure_schema_built(model_cls)
+        self.fields = [
+            (field_name, _compile_value(owner_cls, src_dict[field_name], field_info.annotation))
+            for field_name, field_info in model_cls.model_fields.items()
+            if field_name in src_dict
+        ]
+        # If field is missing and computed, it will use default=None and be computed later
+        for field_name, field_info in model_cls.model_fields.items():
+            meta = field_info.json_schema_extra or {}
+            if "compute" in meta:
+                self.compute_fields.append((field_name, meta["compute"]))
+
+    def __call__(self, instance: Any) -> Any:
+        model_cls = self.model_cls
+        if self.fields is None:
             raise ValueError(f"{model_cls.__name__} is not a Pydantic model")
 
-        data = {}
-        
-        for field_name, field_info in model_cls.model_fields.items():
-            if field_name in src_dict:
-                field_annotation = field_info.annotation
-                data[field_name] = _substitute_value(src_dict[field_name], field_annotation)
-            # If field is missing and not computed, let Pydantic handle the error
-            # If field is missing and computed, it will use default=None and be computed later
+        data = {field_name: substitute(instance) for field_name, substitute in self.fields}
 
         # Create instance with available fields (computed fields will be None by default)
         try:
-            instance = model_cls(**data)
+            built = model_cls(**data)
         except Exception as e:
             raise ValueError(f"@expand could not build {model_cls.__name__}: {e}") from e
-        
+
         # Now compute any computed fields that are None
-        for field_name, field_info in model_cls.model_fields.items():
-            if getattr(instance, field_name, None) is None:
-                meta = field_info.json_schema_extra or {}
-                compute_meta = meta.get("compute")
-                if compute_meta and isinstance(compute_meta, dict):
-                    try:
-                        computed_value = instance.compute(field_name)
-                        setattr(instance, field_name, computed_value)
-                    except Exception as e:
-                        raise ValueError(
-                            f"Failed to compute field '{field_name}' for {model_cls.__name__}. "
-                            f"Make sure the compute function '{compute_meta.get('fn')}' is registered."
-                        ) from e
-        
-        return instance
-
-    return _build_model(expansion_template, target_cls)
+        for field_name, compute_meta in self.compute_fields:
+            if getattr(built, field_name, None) is None and compute_meta and isinstance(compute_meta, dict):
+                try:
+                    computed_value = built.compute(field_name)
+                    setattr(built, field_name, computed_value)
+                except Exception as e:
+                    raise ValueError(
+                        f"Failed to compute field '{field_name}' for {model_cls.__name__}. "
+                        f"Make sure the compute function '{compute_meta.get('fn')}' is registered."
+                    ) from e
+
+        return built
+
+
+def _compile_value(owner_cls: type, value: Any, field_annotation) -> Callable[[Any], Any]:
+    """Compile one template value into a callable taking the expanded instance."""
+    # 1. Placeholder substitution
+    if isinstance(value, str) and value.startswith("$"):
+        return _compile_placeholder(owner_cls, value)
+
+    # 2. Recurse based on annotation
+    origin = get_origin(field_annotation) or field_annotation
+
+    # Handle List types
+    if isinstance(value, list) and origin is list:
+        args = get_args(field_annotation)
+        if args:
+            elements = [_compile_value(owner_cls, v, args[0]) for v in value]
+            return lambda instance: [element(instance) for element in elements]
+        return lambda instance: value
+
+    # Handle Union types (including discriminated unions with __typename)
+    if isinstance(value, dict) and origin is Union:
+        args = get_args(field_annotation)
+
+        # If dict has __typename, use it to pick the right type from Union
+        if "__typename" in value:
+            typename = value["__typename"]
+            for arg in args:
+                if hasattr(arg, '__name__') and arg.__name__ == typename:
+                    return _ModelBuilder(owner_cls, value, arg)
+
+            def no_member(instance):
+                raise ValueError(f"No type matching __typename='{typename}' found in Union {field_annotation}")
+            return no_member
+
+        # No __typename - try each union member to see which one validates
+        members = [_ModelBuilder(owner_cls, value, arg) for arg in args if arg is not type(None)]
+
+        def first_member(instance):
+            for build in members:
+                try:
+                    return build(instance)
+                except Exception:
+                    continue  # Try next type
+            # None of the union members worked
+            raise ValueError(f"Could not match {value} to any type in Union {field_annotation}")
+        return first_member
+
+    # Handle nested Pydantic models
+    if isinstance(value, dict) and isinstance(origin, type) and issubclass(origin, BaseModel):
+        return _ModelBuilder(owner_cls, value, origin)
+
+    # Primitive value - return as-is
+    return lambda instance: value
+
+
+def _compile_placeholder(owner_cls: type, value: str) -> Callable[[Any], Any]:
+    """Compile a ``$field_name`` placeholder read off the expanded instance."""
+    attr_name = value[1:]  # Remove "$" prefix
+    # If there is no attribute of that name, fall back to a case-insensitive
+    # match in model_fields only (not all dir() attributes). This prevents
+    # matching enum classes like Size instead of field size.
+    fallback = next(
+        (field_name for field_name in getattr(owner_cls, 'model_fields', {}) if field_name.lower() == attr_name.lower()),
+        None,
+    )
+
+    def placeholder(instance):
+        attr_value = getattr(instance, attr_name, _MISSING)
+        if attr_value is _MISSING:
+            attr_value = getattr(instance, fallback) if fallback is not None else None
+
+        # If the value is None and the field is computable, compute it first
+        if attr_value is None and hasattr(instance, 'compute'):
+            try:
+                attr_value = instance.compute(attr_name)
+            except (ValueError, AttributeError) as e:
+                # Let the error propagate with context
+                raise ValueError(f"Failed to compute placeholder {value!r} on {instance.__class__.__name__}: {e}") from e
+
+        if attr_value is None:
+            raise ValueError(f"Placeholder {value!r} (field '{attr_name}') not found on {instance.__class__.__name__}")
+
+        return attr_value
+
+    return placeholder
+
+
+def _default_expand(instance: Any, expansion_template: Dict[str, Any], *, target_cls) -> Any:
+    """
+    Generic Pydantic model-based expansion engine.
+    Replaces placeholders like "$field_name" with instance attribute values.
+    Recursively builds Pydantic model instances instead of raw dictionaries.
 
+    Args:
+        instance: The model instance from which to pull placeholder values
+        expansion_template: The dictionary template guiding the expansion
+        target_cls: The Pydantic model class to instantiate
+
+    Returns:
+        Fully instantiated Pydantic model of type target_cls
+    """
+    return _ExpansionPlan(instance.__class__, expansion_template, target_cls).build(instance)
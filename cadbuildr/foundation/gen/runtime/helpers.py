@@ -1,11 +1,14 @@
 """Runtime helpers for GraphQL codegen - registration functions and expression evaluation."""
 
 import ast
+import copy
 import json
 import re
 import math
 from itertools import chain
-from typing import Any, Callable, Dict, Iterable, Optional, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from .tracking import _TRACKERS, mark_dirty
 
 # Global registries for compute, expand, method, and cast functions
 _COMPUTE: Dict[str, Callable[[Any, str, dict], Any]] = {}
@@ -34,25 +37,228 @@ def _eval_expr(root, expr: str, local_vars: Optional[Dict[str, Any]] = None):
       • Dot-separated steps (`a.b.c`)
       • Optional filter   (`parts[is Fruit]`)
     Returns either a single value or a list, depending on the path.
+
+    Everything that depends only on ``expr`` (literal handling, how it is
+    evaluated, its code object and the base eval namespace) is worked out
+    once per expression string; each call only binds ``root``'s fields and
+    ``local_vars``.
     """
-    # Handle simple scalar values and literals (for @default)
+    compiled = _COMPILED.get(expr)
+    if compiled is None:
+        compiled = _COMPILED[expr] = _CompiledExpr(expr)
+
+    if compiled.literal is not None:
+        return compiled.literal()
+    # @default factories (``_eval_expr({}, expr)``) also accept literal lists/dicts.
+    if compiled.container is not _NO_VALUE and type(root) is dict and not root and local_vars is None:
+        return copy.deepcopy(compiled.container)
+
+    if compiled.uses_eval:
+        namespace = None
+        try:
+            namespace = _bind_namespace(compiled, root, local_vars)
+            return eval(compiled.code, namespace)
+        except NameError as e:
+            # If a type is still not found, try to import it dynamically
+            missing_name = str(e).split("'")[1] if "'" in str(e) else None
+            if missing_name and missing_name[0].isupper() and namespace is not None:  # Likely a type name
+                models_mod = _import_models_module(_models_module_name(root)) if root else None
+                if models_mod is not None and hasattr(models_mod, missing_name):
+                    namespace[missing_name] = getattr(models_mod, missing_name)
+                    return eval(compiled.code, namespace)
+            _raise_eval_error(compiled, root, e)
+        except Exception as e:
+            _raise_eval_error(compiled, root, e)
+        # Only fall back to path evaluation for simple path-like expressions
+
+    # Original path evaluation logic (only for instance methods with a root object)
+    if root is None:
+        raise ValueError(f"Cannot use path evaluation on None root for expression: {expr}")
+    return _eval_path(root, compiled.steps if compiled.steps is not None else _path_steps(expr))
+
+
+# Marks a _CompiledExpr attribute that does not apply.
+_NO_VALUE = object()
+
+# Compiled expressions, keyed by expression string.
+_COMPILED: Dict[str, "_CompiledExpr"] = {}
+
+# models module name -> (registered type count, base eval namespace).
+_BASE_NAMESPACES: Dict[Optional[str], Tuple[int, Dict[str, Any]]] = {}
+
+
+class _CompiledExpr:
+    """What ``_eval_expr`` needs to know about one expression string."""
+
+    __slots__ = ("expr", "literal", "container", "uses_eval", "raises", "code", "steps")
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        # Factory for the simple literals handled before classification.
+        self.literal = _simple_literal(expr)
+        # Literal list/dict/... value, for @default factories.
+        self.container = _NO_VALUE
+        self.uses_eval = False
+        # Whether an eval failure is an error rather than a cue to try a path.
+        self.raises = False
+        self.code = None
+        self.steps = None
+        if self.literal is not None:
+            return
+        try:
+            value = ast.literal_eval(expr)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            pass
+        else:
+            if isinstance(value, (list, dict, set, tuple)):
+                self.container = value
+
+        has_list_comprehension, has_complex_ops, has_path_filter, starts_with_type = _classify_expr(expr)
+        self.raises = has_list_comprehension or has_complex_ops
+        self.uses_eval = has_list_comprehension or (has_complex_ops and not has_path_filter) or starts_with_type
+        if self.uses_eval:
+            try:
+                self.code = compile(expr, "<expr>", "eval")
+            except SyntaxError:
+                # eval raises the SyntaxError again, handled like any eval error.
+                self.code = expr
+        else:
+            try:
+                self.steps = _path_steps(expr)
+            except ValueError:
+                # Invalid tokens raise when a path evaluation is attempted.
+                self.steps = None
+
+
+def _simple_literal(expr: str) -> Optional[Callable[[], Any]]:
+    """Factory for '[]', '{}', numbers and quoted strings, or None."""
+    if expr == '[]':
+        return list
+    if expr == '{}':
+        return dict
+    stripped = expr.replace('.', '').replace('-', '')
+    if stripped.isdigit() or stripped.replace('e', '').replace('E', '').replace('+', '').isdigit():
+        try:
+            value = float(expr)
+        except ValueError:
+            return None
+        return lambda: value
+    if (expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'")):
+        value = expr[1:-1]  # Remove quotes
+        return lambda: value
+    return None
+
+
+def _models_module_name(root) -> Optional[str]:
+    """Module whose types ``root``'s expressions may use (the generated models)."""
+    # Get the module of the root object (if available)
+    if root and hasattr(root, '__class__') and hasattr(root.__class__, '__module__'):
+        module_name = root.__class__.__module__
+        # Try to import models module: gen.models.smoothie -> gen.models
+        return module_name.rsplit('.', 1)[0] if '.' in module_name else module_name
+    if root is None or (isinstance(root, dict) and not root):
+        # When root is None (static methods) or {} (default expressions),
+        # infer models module from runtime module location
+        # Runtime module: {package}.gen.runtime.helpers -> Models module: {package}.gen.models
+        current_module = __name__
+        if '.gen.runtime.helpers' in current_module:
+            return current_module.replace('.gen.runtime.helpers', '.gen.models')
+        if '.gen.runtime' in current_module:
+            return current_module.replace('.gen.runtime', '.gen.models').rsplit('.', 1)[0]
+        if 'runtime' in current_module:
+            return current_module.replace('runtime', 'models').rsplit('.', 1)[0]
+    return None
+
+
+def _import_models_module(models_module_name: Optional[str]):
+    if not models_module_name:
+        return None
     try:
-        # Handle empty list
-        if expr == '[]':
-            return []
-        # Handle empty dict
-        if expr == '{}':
-            return {}
-        # Try to parse as a simple number or string literal
-        if expr.replace('.', '').replace('-', '').isdigit() or expr.replace('.', '').replace('-', '').replace('e', '').replace('E', '').replace('+', '').isdigit():
-            return float(expr)
-        elif expr.startswith('"') and expr.endswith('"'):
-            return expr[1:-1]  # Remove quotes
-        elif expr.startswith("'") and expr.endswith("'"):
-            return expr[1:-1]  # Remove quotes
-    except:
-        pass
-    
+        from importlib import import_module
+        return import_module(models_module_name)
+    except Exception:
+        return None
+
+
+def _base_namespace(models_module_name: Optional[str]) -> Dict[str, Any]:
+    """
+    ``math``, the registered types and the models module's types.
+
+    Cached per models module and rebuilt when more types get registered
+    (models register themselves as they are imported).
+    """
+    cached = _BASE_NAMESPACES.get(models_module_name)
+    if cached is not None and cached[0] == len(_TYPE_REGISTRY):
+        return cached[1]
+    # Create a safe namespace with commonly needed modules and the current object
+    namespace = {'math': math}
+    # Add all registered types to the namespace (from type registry)
+    namespace.update(_TYPE_REGISTRY)
+    # Also add types from models module (for cases where types aren't registered yet)
+    models_mod = _import_models_module(models_module_name)
+    if models_mod is not None:
+        try:
+            # Add all uppercase names (likely types) from models module
+            for name in dir(models_mod):
+                if name[0].isupper() and not name.startswith('_'):
+                    if name not in namespace:
+                        namespace[name] = getattr(models_mod, name)
+        except AttributeError:
+            pass
+    _BASE_NAMESPACES[models_module_name] = (len(_TYPE_REGISTRY), namespace)
+    return namespace
+
+
+def _bind_namespace(compiled: _CompiledExpr, root, local_vars: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The eval namespace for one call: the base namespace plus root fields and locals."""
+    namespace = dict(_base_namespace(_models_module_name(root)))
+    if isinstance(root, dict):
+        namespace.update(root)
+    elif root is not None:
+        # Bind through `getattr`, not `vars(root)` / `root.__dict__`. The
+        # raw-dict path bypasses attribute hooks (Computable's lazy-compute
+        # field descriptors in particular), which means @compute fields read
+        # as None when one @compute references another. Going through getattr
+        # lets Computable trigger and cache the dependent fields before this
+        # expression evaluates.
+        #
+        # Every field is bound, not just the ones the expression reads: the
+        # computes this triggers fill in fields that end up in the DAG.
+        # Pydantic v2 model fields live on `__class__.model_fields`; plain
+        # objects fall back to their `__dict__` keys.
+        model_cls = type(root)
+        if hasattr(model_cls, "model_fields"):
+            fields = model_cls.model_fields.keys()
+        else:
+            fields = list(getattr(root, "__dict__", ()))
+        for field_name in fields:
+            try:
+                namespace[field_name] = getattr(root, field_name)
+            except (AttributeError, ValueError):
+                namespace[field_name] = None
+    # If root is None (static methods), just use registry namespace + local_vars
+
+    # Add method parameters to evaluation context
+    if local_vars:
+        # Filter out 'self' which is already in namespace via root
+        for key, value in local_vars.items():
+            if key != 'self':
+                namespace[key] = value
+    return namespace
+
+
+def _raise_eval_error(compiled: _CompiledExpr, root, error: Exception) -> None:
+    """Raise for a failed eval, unless the expression may still be a path."""
+    # If eval fails for static methods (root is None), re-raise since path evaluation won't work
+    if root is None:
+        raise ValueError(f"Failed to evaluate static method expression '{compiled.expr}': {error}")
+    # For instance methods with complex expressions, also re-raise - don't fall back to path evaluation
+    if compiled.raises:
+        raise ValueError(f"Failed to evaluate expression '{compiled.expr}': {error}")
+
+
+def _classify_expr(expr: str):
+    """Return ``(has_list_comprehension, has_complex_ops, has_path_filter, starts_with_type)``."""
     # Handle complex expressions (function calls, math operations, array indexing, list comprehensions, etc.)
     # Use AST parsing for more robust detection
     has_path_filter = '[is ' in expr or '[isinstance(' in expr
@@ -127,161 +333,24 @@ def _eval_expr(root, expr: str, local_vars: Optional[Dict[str, Any]] = None):
             # Unknown syntax, try eval anyway
             has_complex_ops = True
     
-    if has_list_comprehension or (has_complex_ops and not has_path_filter) or starts_with_type:
-        # This looks like a function call or complex expression, use eval
-        try:
-            # Create a safe namespace with commonly needed modules and the current object
-            namespace = {'math': math}
-            
-            # Add all registered types to the namespace (from type registry)
-            namespace.update(_TYPE_REGISTRY)
-            
-            # Also try to import types from models module (for cases where types aren't registered yet)
-            try:
-                from importlib import import_module
-                import inspect
-                
-                models_module_name = None
-                
-                # Get the module of the root object (if available)
-                if root and hasattr(root, '__class__') and hasattr(root.__class__, '__module__'):
-                    module_name = root.__class__.__module__
-                    # Try to import models module: gen.models.smoothie -> gen.models
-                    models_module_name = module_name.rsplit('.', 1)[0] if '.' in module_name else module_name
-                elif root is None or (isinstance(root, dict) and not root):
-                    # When root is None (static methods) or {} (default expressions),
-                    # infer models module from runtime module location
-                    # Runtime module: {package}.gen.runtime.helpers -> Models module: {package}.gen.models
-                        try:
-                            # Use __name__ from this function's module (helpers.py)
-                            # This will be something like 'smoothies.gen.runtime.helpers'
-                            current_module = __name__
-                            if current_module and '.gen.runtime.helpers' in current_module:
-                                # Replace.gen.runtime.helpers with.gen.models
-                                models_module_name = current_module.replace('.gen.runtime.helpers', '.gen.models')
-                            elif current_module and '.gen.runtime' in current_module:
-                                # Replace.gen.runtime with.gen.models (handles.gen.runtime.something)
-                                models_module_name = current_module.replace('.gen.runtime', '.gen.models').rsplit('.', 1)[0]
-                            elif current_module and 'runtime' in current_module:
-                                # Fallback: try to replace 'runtime' with 'models' in module path
-                                models_module_name = current_module.replace('runtime', 'models').rsplit('.', 1)[0]
-                        except Exception:
-                            pass
-                
-                if models_module_name:
-                    try:
-                        models_mod = import_module(models_module_name)
-                        # Add all uppercase names (likely types) from models module
-                        for name in dir(models_mod):
-                            if name[0].isupper() and not name.startswith('_'):
-                                if name not in namespace:
-                                    namespace[name] = getattr(models_mod, name)
-                    except (ImportError, AttributeError):
-                        pass
-            except Exception:
-                pass
-            
-            if isinstance(root, dict):
-                namespace.update(root)
-            elif root is not None:
-                # Build the namespace through `getattr`, not `vars(root)` /
-                # `root.__dict__`. The raw-dict path bypasses any custom
-                # `__getattribute__` (Computable's lazy-compute hook in
-                # particular), which means @compute fields read as None when
-                # one @compute references another. Going through getattr lets
-                # Computable trigger and cache the dependent fields before
-                # this expression evaluates.
-                #
-                # Pydantic v2 model fields live on `__class__.model_fields`;
-                # iterate those when available, falling back to `__dict__`
-                # keys for plain objects.
-                model_cls = type(root)
-                if hasattr(model_cls, "model_fields"):
-                    for field_name in model_cls.model_fields.keys():
-                        try:
-                            namespace[field_name] = getattr(root, field_name)
-                        except (AttributeError, ValueError):
-                            namespace[field_name] = None
-                elif hasattr(root, "__dict__"):
-                    for key in list(root.__dict__.keys()):
-                        try:
-                            namespace[key] = getattr(root, key)
-                        except (AttributeError, ValueError):
-                            namespace[key] = None
-            # If root is None (static methods), just use registry namespace + local_vars
-            
-            # Add method parameters to evaluation context
-            if local_vars:
-                # Filter out 'self' which is already in namespace via root
-                params = {k: v for k, v in local_vars.items() if k != 'self'}
-                namespace.update(params)
-            
-            return eval(expr, namespace, namespace)
-        except NameError as e:
-            # If a type is still not found, try to import it dynamically
-            missing_name = str(e).split("'")[1] if "'" in str(e) else None
-            if missing_name and missing_name[0].isupper():  # Likely a type name
-                try:
-                    from importlib import import_module
-                    import inspect
-                    
-                    models_module_name = None
-                    
-                    # Try to import from models module
-                    if root and hasattr(root, '__class__') and hasattr(root.__class__, '__module__'):
-                        module_name = root.__class__.__module__
-                        models_module_name = module_name.rsplit('.', 1)[0] if '.' in module_name else module_name
-                    elif root is None or (isinstance(root, dict) and not root):
-                        # When root is None or {}, infer models module from runtime module location
-                        try:
-                            # Use __module__ from this function's module (helpers.py)
-                            current_module = __name__
-                            if current_module and '.gen.runtime' in current_module:
-                                models_module_name = current_module.replace('.gen.runtime', '.gen.models')
-                            elif current_module and 'runtime' in current_module:
-                                models_module_name = current_module.replace('runtime', 'models')
-                        except Exception:
-                            pass
-                    
-                    if models_module_name:
-                        try:
-                            models_mod = import_module(models_module_name)
-                            if hasattr(models_mod, missing_name):
-                                namespace[missing_name] = getattr(models_mod, missing_name)
-                                return eval(expr, namespace, namespace)
-                        except (ImportError, AttributeError):
-                            pass
-                except Exception:
-                    pass
-            # If eval fails for static methods (root is None), re-raise since path evaluation won't work
-            if root is None:
-                raise ValueError(f"Failed to evaluate static method expression '{expr}': {e}")
-            # For instance methods with complex expressions, also re-raise - don't fall back to path evaluation
-            if has_list_comprehension or has_complex_ops:
-                raise ValueError(f"Failed to evaluate expression '{expr}': {e}")
-            # Only fall back to path evaluation for simple path-like expressions
-            pass
-        except Exception as e:
-            # If eval fails for static methods (root is None), re-raise since path evaluation won't work
-            if root is None:
-                raise ValueError(f"Failed to evaluate static method expression '{expr}': {e}")
-            # For instance methods with complex expressions, also re-raise - don't fall back to path evaluation
-            if has_list_comprehension or has_complex_ops:
-                raise ValueError(f"Failed to evaluate expression '{expr}': {e}")
-            # Only fall back to path evaluation for simple path-like expressions
-            pass
-    
-    # Original path evaluation logic (only for instance methods with a root object)
-    if root is None:
-        raise ValueError(f"Cannot use path evaluation on None root for expression: {expr}")
-    items: Iterable[Any] = [root]
+    return has_list_comprehension, has_complex_ops, has_path_filter, starts_with_type
 
+
+def _path_steps(expr: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a path expression into ``(attr, type filter)`` steps."""
+    steps = []
     for step in expr.split("."):
         m = _EXPR_RE.match(step)
         if not m:
             raise ValueError(f"Invalid expr token: {step!r}")
+        steps.append((m["attr"], m["type"]))
+    return steps
+
 
-        attr, want_type = m["attr"], m["type"]
+def _eval_path(root, steps: List[Tuple[str, Optional[str]]]):
+    items: Iterable[Any] = [root]
+
+    for attr, want_type in steps:
         next_items = []
         for it in items:
             value = getattr(it, attr)
@@ -332,25 +401,48 @@ def register_method_fn(name: str):
     return _wrap
 
 
+# Call adapters of method functions: fn_name -> (method_fn, parameter names).
+# An entry applies only while it was built for the registered function.
+_METHOD_ADAPTERS: Dict[str, Tuple[Callable[..., Any], frozenset]] = {}
+
+
+def _method_adapter(fn_name: str, method_fn: Callable[..., Any]) -> Tuple[Callable[..., Any], frozenset]:
+    import inspect
+    sig = inspect.signature(method_fn)
+    adapter = (method_fn, frozenset(p for p in sig.parameters.keys() if p != 'inst'))
+    _METHOD_ADAPTERS[fn_name] = adapter
+    return adapter
+
+
 def run_method(inst, fn_name: str, local_vars: Optional[Dict[str, Any]] = None):
     """Execute a registered method function with optional parameters."""
-    if fn_name not in _METHOD:
+    method_fn = _METHOD.get(fn_name)
+    if method_fn is None:
         raise ValueError(f"Method fn '{fn_name}' not registered")
     
-    method_fn = _METHOD[fn_name]
-    
     if local_vars is None:
         # Zero-parameter method (backward compatible)
-        return method_fn(inst)
-    
-    # Parametrized method - pass arguments
-    import inspect
-    sig = inspect.signature(method_fn)
-    param_names = [p for p in sig.parameters.keys() if p != 'inst']
+        result = method_fn(inst)
+    else:
+        # Parametrized method - pass arguments. The signature is inspected
+        # once per registered function.
+        adapter = _METHOD_ADAPTERS.get(fn_name)
+        if adapter is None or adapter[0] is not method_fn:
+            adapter = _method_adapter(fn_name, method_fn)
+        param_names = adapter[1]
+
+        if param_names.issuperset(local_vars):
+            result = method_fn(inst, **local_vars)
+        else:
+            # Extract only the parameters the function expects
+            kwargs = {k: v for k, v in local_vars.items() if k in param_names}
+            result = method_fn(inst, **kwargs)
     
-    # Extract only the parameters the function expects
-    kwargs = {k: v for k, v in local_vars.items() if k in param_names}
-    return method_fn(inst, **kwargs)
+    # Methods mutate their instance in place (e.g. `operations.append`), which
+    # field-assignment tracking cannot see.
+    if _TRACKERS and inst is not None:
+        mark_dirty(inst)
+    return result
 
 
 def register_expand_fn(name: str):
@@ -3,11 +3,29 @@
 from typing import Any
 from typing import get_origin, get_args
 
+from pydantic import BaseModel
+
+from .tracking import _TRACKERS, mark_dirty
+
+_MISSING = object()
+
 
 class ParameterFieldsMixin:
     """Mixin for auto-casting primitives to Parameter types on field assignment."""
     
     def __setattr__(self, name: str, value: Any) -> None:
+        if _TRACKERS and name in self.__class__.model_fields:
+            previous = self.__dict__.get(name, _MISSING)
+            self._set_field_value(name, value)
+            # Re-assigning the same child model is not a change: the child
+            # reports its own mutations.
+            current = self.__dict__.get(name, _MISSING)
+            if current is not previous or not isinstance(current, BaseModel):
+                mark_dirty(self)
+            return
+        self._set_field_value(name, value)
+
+    def _set_field_value(self, name: str, value: Any) -> None:
         if hasattr(self, '__class__') and hasattr(self.__class__, 'model_fields'):
             if name in self.__class__.model_fields:
                 field_info = self.__class__.model_fields[name]
@@ -21,7 +39,7 @@ class ParameterFieldsMixin:
                             break
                 if isinstance(field_annotation, type) and field_annotation.__name__.endswith('Parameter'):
                     if isinstance(value, field_annotation):
-                        super().__setattr__(name, value)
+                        super(ParameterFieldsMixin, self).__setattr__(name, value)
                         return
                     if isinstance(value, (bool, int, float, str)):
                         if hasattr(field_annotation, '_cast'):
@@ -36,7 +54,7 @@ class ParameterFieldsMixin:
                                     value = field_annotation(**casted)
                             except (TypeError, ValueError):
                                 pass
-        super().__setattr__(name, value)
+        super(ParameterFieldsMixin, self).__setattr__(name, value)
 
 
 
@@ -0,0 +1,106 @@
+"""Deferred pydantic schema builds of the generated models, with per-class timings.
+
+The generated modules only import the types they reference under
+``TYPE_CHECKING``, so every model is incomplete until it is rebuilt against
+the models package namespace. Each schema walks most of the model graph and
+rebuilding all of them made up most of the cost of importing the models,
+while a script validates a handful. ``defer_schema_builds`` therefore leaves
+the models incomplete and builds each one on its first validation or
+serialization instead. The import hook of the models package
+(``cadbuildr.foundation.lazy_imports``) calls it in place of the package's
+``model_rebuild()`` calls.
+"""
+
+import sys
+import time
+from typing import Any, Dict, Iterable, Mapping, get_origin
+
+# Deferred model class -> namespace its annotations resolve in (the globals
+# of its module, or of the deferred base for a subclass).
+_NAMESPACES: Dict[type, Mapping[str, Any]] = {}
+
+# Class name -> seconds its schema build took, in build order.
+_BUILD_TIMES: Dict[str, float] = {}
+
+
+class _DeferredBuild:
+    """Stands in for the validator or serializer of a deferred model."""
+
+    __slots__ = ("cls", "attr")
+
+    def __init__(self, cls: type, attr: str):
+        self.cls = cls
+        self.attr = attr
+
+    def __getattr__(self, name: str) -> Any:
+        ensure_schema_built(self.cls)
+        return getattr(getattr(self.cls, self.attr), name)
+
+
+def _defer(cls: type, namespace: Mapping[str, Any]) -> None:
+    _NAMESPACES[cls] = namespace
+    cls.__pydantic_validator__ = _DeferredBuild(cls, "__pydantic_validator__")
+    cls.__pydantic_serializer__ = _DeferredBuild(cls, "__pydantic_serializer__")
+
+
+def _defer_subclass(cls: type, **kwargs: Any) -> None:
+    # A subclass (``class Brick(Part)``) re-evaluates the annotations it
+    # inherits in its own module, where the model names may be undefined.
+    if not cls.__pydantic_complete__:
+        _defer(cls, _namespace_of(cls))
+
+
+def _namespace_of(cls: type) -> Mapping[str, Any]:
+    for base in cls.__mro__:
+        namespace = _NAMESPACES.get(base)
+        if namespace is not None:
+            return namespace
+    return {}
+
+
+def defer_schema_builds(namespace: Mapping[str, Any], models: Iterable[type]) -> None:
+    """
+    Leave ``models`` incomplete until their first validation or serialization.
+
+    The classes and unions of ``namespace`` (the models package) are added to
+    the globals of each model's module, as if it imported them at runtime, so
+    that the forward references resolve there, including when pydantic
+    builds a schema itself (a user model with a ``Point`` field,
+    ``model_json_schema``).
+    """
+    names = {
+        name: value
+        for name, value in namespace.items()
+        if not name.startswith("_") and (isinstance(value, type) or get_origin(value) is not None)
+    }
+    for cls in models:
+        if cls.__pydantic_complete__:
+            continue
+        module_globals = vars(sys.modules[cls.__module__])
+        for name, value in names.items():
+            module_globals.setdefault(name, value)
+        _defer(cls, module_globals)
+        cls.__pydantic_init_subclass__ = classmethod(_defer_subclass)
+
+
+def ensure_schema_built(cls: type) -> None:
+    """Build the schema of ``cls`` now if it was deferred and is still incomplete."""
+    if cls.__pydantic_complete__:
+        return
+    start = time.perf_counter()
+    cls.model_rebuild(_types_namespace=_namespace_of(cls))
+    _BUILD_TIMES[cls.__name__] = time.perf_counter() - start
+
+
+def build_deferred_schemas() -> None:
+    """
+    Build every deferred schema, e.g. in a server before it forks workers or
+    before timing code that should not include first-use builds.
+    """
+    for cls in list(_NAMESPACES):
+        ensure_schema_built(cls)
+
+
+def schema_build_times() -> Dict[str, float]:
+    """Seconds each model's schema build took so far, by class name in build order."""
+    return dict(_BUILD_TIMES)
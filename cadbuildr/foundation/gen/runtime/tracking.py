@@ -0,0 +1,32 @@
+"""Mutation tracking for incremental DAG rebuilds.
+
+Trackers (e.g. ``DagBuildCache``) subscribe here to learn when a model
+instance changes. Models report their own mutations: ``ParameterFieldsMixin``
+on field assignment and ``run_method`` after a generated method ran on an
+instance. In-place edits that bypass both (``sketch.elements.append(...)``
+from user code) must call :func:`mark_dirty` explicitly.
+"""
+
+import weakref
+from typing import Any
+
+# Weak so a dropped cache stops receiving notifications without an explicit close().
+_TRACKERS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def register_tracker(tracker: Any) -> None:
+    """Subscribe ``tracker`` (an object with ``invalidate(obj)``) to mutations."""
+    _TRACKERS.add(tracker)
+
+
+def unregister_tracker(tracker: Any) -> None:
+    """Stop notifying ``tracker`` about mutations."""
+    _TRACKERS.discard(tracker)
+
+
+def mark_dirty(obj: Any) -> None:
+    """Report that ``obj`` changed so trackers drop anything derived from it."""
+    if not _TRACKERS:
+        return
+    for tracker in list(_TRACKERS):
+        tracker.invalidate(obj)
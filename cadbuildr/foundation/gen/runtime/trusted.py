@@ -0,0 +1,65 @@
+"""Trusted construction of models the library builds from already-valid values."""
+
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+from .schema_builds import ensure_schema_built
+
+_object_setattr = object.__setattr__
+
+# cls -> (field names in order, optional fields, extra allowed, has post-init)
+_PLANS: Dict[type, Tuple[List[str], Dict[str, FieldInfo], bool, bool]] = {}
+
+
+def _plan(cls: type) -> Tuple[List[str], Dict[str, FieldInfo], bool, bool]:
+    # Trusted objects skip validation, which is what builds a deferred schema
+    # and resolves the field annotations later assignments cast against.
+    ensure_schema_built(cls)
+    fields = cls.__pydantic_fields__
+    plan = (
+        list(fields),
+        {name: field for name, field in fields.items() if not field.is_required()},
+        cls.model_config.get("extra") == "allow",
+        bool(cls.__pydantic_post_init__),
+    )
+    _PLANS[cls] = plan
+    return plan
+
+
+def construct_trusted(cls: type, **values: Any) -> BaseModel:
+    """
+    Build ``cls`` from field values that are already what validation would
+    produce, without running validation or the @cast/@ordered ``__init__``.
+
+    Like ``model_construct``, unset fields get their defaults and
+    ``model_post_init`` runs, so sketch elements still register with their
+    sketch. Values must be keyword field names (no aliases, no extra fields)
+    of the exact validated type, e.g. ``float`` for a ``float`` field.
+    """
+    plan = _PLANS.get(cls)
+    if plan is None:
+        plan = _plan(cls)
+    names, optional, extra_allowed, post_init = plan
+
+    fields_values: Dict[str, Any] = {}
+    for name in names:
+        if name in values:
+            fields_values[name] = values[name]
+        elif name in optional:
+            fields_values[name] = optional[name].get_default(
+                call_default_factory=True, validated_data=fields_values
+            )
+        else:
+            raise TypeError(f"{cls.__name__}: missing value for required field '{name}'")
+
+    # cls.__new__ so that mixins hooking instance creation (Computable) run.
+    obj = cls.__new__(cls)
+    _object_setattr(obj, "__dict__", fields_values)
+    _object_setattr(obj, "__pydantic_fields_set__", set(values))
+    _object_setattr(obj, "__pydantic_extra__", {} if extra_allowed else None)
+    _object_setattr(obj, "__pydantic_private__", None)
+    if post_init:
+        obj.model_post_init(None)
+    return obj
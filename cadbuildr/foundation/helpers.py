@@ -14,12 +14,15 @@ from .gen.models import (
     Line,
     Assembly,
     BoolParameter,
+    FloatParameter,
     Sketch,
+    Point,
     Point3D,
     Material,
     MaterialOptions,
 )
-from .gen.runtime import run_method
+from .gen.runtime import construct_trusted, run_method
+from .mixin.sketch_mixin import deferred_registration
 from .draw import Draw
 from .constants import ColorSpec, resolve_color
 
@@ -403,6 +406,29 @@ def _point3d_to_array(self: Point3D) -> "np.ndarray":
 setattr(Point3D, "to_array", _point3d_to_array)
 
 
+def _point_from_array(cls: type, sketch: Sketch, xy: Any) -> list[Point]:
+    """Points on ``sketch`` at the rows of an (n, 2) array of x, y coordinates.
+
+    The coordinates are plain floats, so the Points are built without
+    validation and register with the sketch in one batch."""
+    coords = np.asarray(xy, dtype=float)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError(f"Point.from_array expects an (n, 2) array, got shape {coords.shape}")
+    with deferred_registration():
+        return [
+            construct_trusted(
+                cls,
+                sketch=sketch,
+                x=construct_trusted(FloatParameter, value=x),
+                y=construct_trusted(FloatParameter, value=y),
+            )
+            for x, y in coords.tolist()
+        ]
+
+
+setattr(Point, "from_array", classmethod(_point_from_array))
+
+
 def anchor_plane(anchor: Any, name: Optional[str] = None) -> Plane:
     """Sketching plane at an anchor (XY = the anchor plane, Z = mate axis).
 
@@ -0,0 +1,124 @@
+"""Import hooks for the generated ``gen`` and ``gen.models`` packages.
+
+``cadbuildr.foundation`` imports its models on first use (PEP 562), but
+they can also be imported directly (``from cadbuildr.foundation.gen.models
+import Part``). Either way the models are only usable once the modules that
+register compute/method functions and patch the model classes have run, so
+an import hook runs them right after the models package itself. The same
+hook defers the schema builds the models package asks for (see
+``gen.runtime.schema_builds``).
+
+The generated ``gen`` package star-imports the models, so importing
+``gen.runtime`` or ``gen.dag`` would load them too. Its code therefore only
+runs on the first lookup of a name in it. Both hooks leave the generated
+files as the codegen writes them.
+"""
+
+import sys
+import threading
+from importlib import import_module
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import PathFinder
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+
+# Submodules of the top-level package that register against the models.
+REGISTRATION_MODULES = ("compute_functions", "shape_methods", "helpers")
+
+
+class _WrappedLoader(Loader):
+    """Delegates to the loader the path finder found."""
+
+    def __init__(self, loader: Loader, package: str):
+        self.loader = loader
+        self.package = package
+
+    def create_module(self, spec: Any) -> Any:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self.loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        # get_source, get_filename, ... for inspect and tracebacks.
+        return getattr(self.loader, name)
+
+
+class _ModelsLoader(_WrappedLoader):
+    """Runs the models package with its schema builds deferred, then the registration modules."""
+
+    def exec_module(self, module: Any) -> None:
+        from .gen.runtime.schema_builds import defer_schema_builds
+
+        prefix = f"{module.__name__}."
+        rebuild = BaseModel.__dict__["model_rebuild"]
+
+        def deferred_rebuild(cls: type, *args: Any, **kwargs: Any) -> Optional[bool]:
+            # The models package calls ``Model.model_rebuild()`` for each of
+            # its classes once they are all imported; calls with arguments
+            # (pydantic's own, ensure_schema_built's) still rebuild.
+            if args or kwargs or not cls.__module__.startswith(prefix):
+                return rebuild.__func__(cls, *args, **kwargs)
+            defer_schema_builds(vars(module), (cls,))
+            return None
+
+        BaseModel.model_rebuild = classmethod(deferred_rebuild)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            BaseModel.model_rebuild = rebuild
+        for name in REGISTRATION_MODULES:
+            import_module(f"{self.package}.{name}")
+
+
+class _GenLoader(_WrappedLoader):
+    """Runs the ``gen`` package's code on the first lookup of a name in it (PEP 562)."""
+
+    def exec_module(self, module: Any) -> None:
+        lock = threading.RLock()
+        state = {"loaded": False, "loading": False}
+
+        def __getattr__(name: str) -> Any:
+            if not (name.startswith("__") and name != "__all__"):
+                with lock:
+                    if not state["loaded"] and not state["loading"]:
+                        state["loading"] = True
+                        try:
+                            self.loader.exec_module(module)
+                        finally:
+                            state["loading"] = False
+                        state["loaded"] = True
+                        del module.__getattr__
+                if name in module.__dict__:
+                    return module.__dict__[name]
+            raise AttributeError(f"module {module.__name__!r} has no attribute {name!r}")
+
+        module.__getattr__ = __getattr__
+
+
+class _GenFinder(MetaPathFinder):
+    """Finds the generated ``gen`` and models packages and wraps their loaders."""
+
+    def __init__(self, package: str):
+        self.package = package
+        self.loaders = {f"{package}.gen": _GenLoader, f"{package}.gen.models": _ModelsLoader}
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]], target: Any = None) -> Any:
+        loader_class = self.loaders.get(fullname)
+        if loader_class is None:
+            return None
+        spec = PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = loader_class(spec.loader, self.package)
+        return spec
+
+
+def install_models_hook(package: str) -> None:
+    """Import the registration modules of ``package`` whenever its models are imported."""
+    if f"{package}.gen.models" in sys.modules:
+        for name in REGISTRATION_MODULES:
+            import_module(f"{package}.{name}")
+        return
+    if not any(isinstance(finder, _GenFinder) and finder.package == package for finder in sys.meta_path):
+        sys.meta_path.insert(0, _GenFinder(package))
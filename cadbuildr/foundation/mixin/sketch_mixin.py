@@ -1,5 +1,101 @@
 from __future__ import annotations
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cadbuildr.foundation.gen.runtime.helpers import _METHOD, run_method
+
+# Registrations collected by the active ``deferred_registration()`` block, as
+# (sketch, element) pairs in creation order. A context variable, so that each
+# thread (and asyncio task) collects into its own block.
+_DEFERRED: ContextVar[Optional[List[Tuple[Any, Any]]]] = ContextVar(
+    "deferred_registration", default=None
+)
+
+# Registrations recorded by the active ``recorded_registrations()`` block.
+_RECORDED: ContextVar[Optional[List[Tuple[Any, Any, Dict[str, Any]]]]] = ContextVar(
+    "recorded_registrations", default=None
+)
+
+
+@contextmanager
+def deferred_registration() -> Iterator[None]:
+    """
+    Collect the sketch registrations of the elements created in the block and
+    make them when it exits (also when it raises), in creation order.
+
+    Sketches are handed all their new elements at once through the
+    ``add_elements_method`` method fn when one is registered, which can
+    de-duplicate them without comparing each one against the whole sketch.
+    Nothing in the block may rely on the elements being registered yet.
+    Nested blocks register with the outermost one; blocks in other threads
+    are independent.
+    """
+    if _DEFERRED.get() is not None:
+        yield
+        return
+    pending: List[Tuple[Any, Any]] = []
+    token = _DEFERRED.set(pending)
+    try:
+        yield
+    finally:
+        _DEFERRED.reset(token)
+        _register(pending)
+
+
+@contextmanager
+def recorded_registrations() -> Iterator[List[Tuple[Any, Any, Dict[str, Any]]]]:
+    """
+    Record the sketch registrations of the elements created in the block
+    (and of those passed to ``register_elements``) in creation order, in the
+    list the block yields, as (sketch, element, values) triples.
+
+    ``values`` is a shallow copy of the element's field values when it asked
+    to be registered, before computed fields were filled in: the sketch
+    compares it with its elements as it was then. Elements are recorded
+    whether or not the sketch already held an equal one. Nested blocks
+    record into the outermost block's list.
+    """
+    recorded = _RECORDED.get()
+    if recorded is not None:
+        yield recorded
+        return
+    recorded = []
+    token = _RECORDED.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _RECORDED.reset(token)
+
+
+def register_elements(pairs: List[Tuple[Any, Any]]) -> None:
+    """
+    Register (sketch, element) pairs as if each element had just been
+    created, e.g. copies of elements made without running ``model_post_init``.
+    """
+    recorded = _RECORDED.get()
+    if recorded is not None:
+        recorded.extend((sketch, element, element.__dict__.copy()) for sketch, element in pairs)
+    pending = _DEFERRED.get()
+    if pending is not None:
+        pending.extend(pairs)
+    else:
+        _register(pairs)
+
+
+def _register(pending: List[Tuple[Any, Any]]) -> None:
+    groups: Dict[int, Tuple[Any, List[Any]]] = {}
+    for sketch, element in pending:
+        group = groups.get(id(sketch))
+        if group is None:
+            group = groups[id(sketch)] = (sketch, [])
+        group[1].append(element)
+    for sketch, elements in groups.values():
+        if "add_elements_method" in _METHOD:
+            run_method(sketch, "add_elements_method", {"elements": elements})
+        else:
+            for element in elements:
+                sketch.add_element(element)
 
 
 class SketchElementMixin:
@@ -22,4 +118,11 @@ class SketchElementMixin:
         # Best-effort registration; don't crash if missing method
         add = getattr(sketch, "add_element", None)
         if callable(add):
-            add(self)
+            recorded = _RECORDED.get()
+            if recorded is not None:
+                recorded.append((sketch, self, self.__dict__.copy()))
+            pending = _DEFERRED.get()
+            if pending is not None:
+                pending.append((sketch, self))
+            else:
+                add(self)
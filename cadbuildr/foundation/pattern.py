@@ -8,14 +8,14 @@ if TYPE_CHECKING:
     from.gen.models import Point, Sketch
 
 
-def _make_point(sketch: "Sketch", x: float, y: float) -> "Point":
-    """Construct a Point on the given sketch.
+def _make_points(sketch: "Sketch", xy: np.ndarray) -> list["Point"]:
+    """Construct a Point on the given sketch for each row of an (n, 2) array.
 
     Done lazily inside the function so importing pattern.py before the
     generated models are registered (codegen-time) doesn't blow up."""
-    from.gen.models import Point, FloatParameter
+    from.gen.models import Point
 
-    return Point(sketch=sketch, x=FloatParameter(value=x), y=FloatParameter(value=y))
+    return Point.from_array(sketch, xy)
 
 
 class GridLocations:
@@ -45,25 +45,21 @@ class GridLocations:
         self.n_x = int(n_x)
         self.n_y = int(n_y)
 
-    def positions(self) -> list["Point"]:
-        """Return n_x * n_y Points centered on `self.center`."""
+    def positions_array(self) -> np.ndarray:
+        """Return the (n_x * n_y, 2) coordinates, row by row along y."""
         cx = self.center.x.value
         cy = self.center.y.value
-        sketch = self.center.sketch
         # Center the grid so the anchor is the geometric centroid.
         x0 = cx - (self.n_x - 1) * self.x_pitch / 2.0
         y0 = cy - (self.n_y - 1) * self.y_pitch / 2.0
-        out: list["Point"] = []
-        for j in range(self.n_y):
-            for i in range(self.n_x):
-                out.append(
-                    _make_point(
-                        sketch,
-                        x0 + i * self.x_pitch,
-                        y0 + j * self.y_pitch,
-                    )
-                )
-        return out
+        xs = x0 + np.arange(self.n_x) * self.x_pitch
+        ys = y0 + np.arange(self.n_y) * self.y_pitch
+        xx, yy = np.meshgrid(xs, ys)
+        return np.column_stack((xx.ravel(), yy.ravel()))
+
+    def positions(self) -> list["Point"]:
+        """Return n_x * n_y Points centered on `self.center`."""
+        return _make_points(self.center.sketch, self.positions_array())
 
 
 
@@ -92,22 +88,23 @@ class HexLocations:
         self.pitch = float(pitch)
         self.n_radial = int(n_radial)
 
-    def positions(self) -> list["Point"]:
+    def positions_array(self) -> np.ndarray:
+        """Return the (3·k² - 3·k + 1, 2) coordinates, ordered by q then r."""
         cx = self.center.x.value
         cy = self.center.y.value
-        sketch = self.center.sketch
         n = self.n_radial - 1  # ring index range is [-n, n]
-        out: list["Point"] = []
         # Axial coords (q, r). Cube-coord constraint: |q + r| ≤ n.
+        k = np.arange(-n, n + 1)
+        q, r = np.meshgrid(k, k, indexing="ij")
+        inside = np.abs(q + r) <= n
+        q, r = q[inside], r[inside]
         sqrt3_2 = math.sqrt(3) / 2.0
-        for q in range(-n, n + 1):
-            r_min = max(-n, -q - n)
-            r_max = min(n, -q + n)
-            for r in range(r_min, r_max + 1):
-                x = self.pitch * (q + r / 2.0)
-                y = self.pitch * r * sqrt3_2
-                out.append(_make_point(sketch, cx + x, cy + y))
-        return out
+        x = self.pitch * (q + r / 2.0)
+        y = self.pitch * r * sqrt3_2
+        return np.column_stack((cx + x, cy + y))
+
+    def positions(self) -> list["Point"]:
+        return _make_points(self.center.sketch, self.positions_array())
 
 
 class PolarLocations:
@@ -136,44 +133,47 @@ class PolarLocations:
         self.start_angle_deg = float(start_angle_deg)
         self.angular_range_deg = float(angular_range_deg)
 
-    def positions(self) -> list["Point"]:
+    def positions_array(self) -> np.ndarray:
+        """Return the (count, 2) coordinates in angular order."""
         cx = self.center.x.value
         cy = self.center.y.value
-        sketch = self.center.sketch
         if math.isclose(abs(self.angular_range_deg), 360.0):
             step = self.angular_range_deg / self.count
         else:
             step = self.angular_range_deg / max(self.count - 1, 1)
-        out: list["Point"] = []
-        for i in range(self.count):
-            theta = math.radians(self.start_angle_deg + i * step)
-            out.append(
-                _make_point(
-                    sketch,
-                    cx + self.radius * math.cos(theta),
-                    cy + self.radius * math.sin(theta),
-                )
-            )
-        return out
+        theta = np.radians(self.start_angle_deg + np.arange(self.count) * step)
+        return np.column_stack(
+            (cx + self.radius * np.cos(theta), cy + self.radius * np.sin(theta))
+        )
+
+    def positions(self) -> list["Point"]:
+        return _make_points(self.center.sketch, self.positions_array())
 
 
 class Locations:
     """Explicit list of (x, y) offsets relative to an anchor.
 
     The simplest pattern: hand
-    the user full control over where each point lands."""
+    the user full control over where each point lands. `offsets` is a
+    sequence of pairs or an (n, 2) array."""
 
-    def __init__(self, center: "Point", offsets: Sequence[tuple[float, float]]):
-        if not offsets:
+    def __init__(
+        self, center: "Point", offsets: "Sequence[tuple[float, float]] | np.ndarray"
+    ):
+        offsets = np.asarray(offsets, dtype=float)
+        if offsets.size == 0:
             raise ValueError("Locations requires at least one offset")
+        if offsets.ndim != 2 or offsets.shape[1] != 2:
+            raise ValueError(f"Locations expects (x, y) offsets, got shape {offsets.shape}")
         self.center = center
-        self.offsets = [(float(x), float(y)) for x, y in offsets]
+        self.offsets = [(x, y) for x, y in offsets.tolist()]
+
+    def positions_array(self) -> np.ndarray:
+        """Return the (n, 2) coordinates of the offsets from `self.center`."""
+        return np.array(self.offsets) + (self.center.x.value, self.center.y.value)
 
     def positions(self) -> list["Point"]:
-        cx = self.center.x.value
-        cy = self.center.y.value
-        sketch = self.center.sketch
-        return [_make_point(sketch, cx + dx, cy + dy) for dx, dy in self.offsets]
+        return _make_points(self.center.sketch, self.positions_array())
 
 
 class CircularPattern:
@@ -0,0 +1,24 @@
+"""Shared fixtures: the brick assembly most DAG tests convert.
+
+The assembly is defined once, in benchmarks/assemblies.py, so the tests
+and the benchmarks convert the same models.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from assemblies import Brick, make_assy as build_assembly  # noqa: E402
+
+
+@pytest.fixture
+def make_brick():
+    return Brick
+
+
+@pytest.fixture
+def make_assy():
+    return build_assembly
@@ -0,0 +1,71 @@
+"""Batched sketch registration through add_elements_method."""
+
+from cadbuildr.foundation.gen.models import Arc, Line, Part, Point, Sketch
+from cadbuildr.foundation.gen.runtime.helpers import _METHOD
+from cadbuildr.foundation.mixin.sketch_mixin import deferred_registration
+
+
+def _describe(element):
+    if isinstance(element, Point):
+        return ("Point", element.x.value, element.y.value)
+    points = [getattr(element, name) for name in ("p1", "p2", "p3") if hasattr(element, name)]
+    return (type(element).__name__, *map(_describe, points))
+
+
+def _build(sketch):
+    """Duplicates, shared points, and elements mutated after registration."""
+    registered = Point(sketch, 1.0, 2.0)
+    line = Line(p1=registered, p2=Point(sketch, 3.0, 3.0))
+    registered.x.value = 5.0
+    with deferred_registration():
+        Point(sketch, 5.0, 2.0)  # equal to the mutated point
+        Point(sketch, 1.0, 2.0)  # equal to its value when it was registered
+        Line(p1=Point(sketch, 5.0, 2.0), p2=Point(sketch, 3.0, 3.0))  # equal to ``line``
+        Arc(p1=Point(sketch, 0.0, 0.0), p2=Point(sketch, -0.0, 1.0), p3=Point(sketch, 1.0, 0.0))
+        moved = Point(sketch, 7.0, 7.0)
+        Point(sketch, 7.0, 2.0)
+        moved.y.value = 2.0  # before the block registers it
+    line.p2.y.value = 4.0
+    with deferred_registration():
+        Line(p1=Point(sketch, 5.0, 2.0), p2=Point(sketch, 3.0, 3.0))
+        Line(p1=Point(sketch, 5.0, 2.0), p2=Point(sketch, 3.0, 4.0))
+    return [_describe(element) for element in sketch.elements]
+
+
+def test_keyed_registration_matches_the_equality_scan(monkeypatch):
+    keyed = _build(Sketch(Part().xy()))
+
+    monkeypatch.delitem(_METHOD, "add_elements_method")
+    scanned = _build(Sketch(Part().xy()))
+
+    assert keyed == scanned
+    assert keyed.count(("Point", 5.0, 2.0)) == 1
+    assert ("Point", 1.0, 2.0) in keyed
+    assert keyed.count(("Line", ("Point", 5.0, 2.0), ("Point", 3.0, 4.0))) == 1
+    assert ("Line", ("Point", 5.0, 2.0), ("Point", 3.0, 3.0)) in keyed
+
+
+def test_elements_referencing_another_sketch_fall_back_to_equality():
+    sketch, other = Sketch(Part().xy()), Sketch(Part().xy())
+    far = Point(other, 1.0, 1.0)
+    with deferred_registration():
+        first = Line(p1=Point(sketch, 0.0, 0.0), p2=far)
+        Line(p1=Point(sketch, 0.0, 0.0), p2=far)
+
+    assert [element for element in sketch.elements if isinstance(element, Line)] == [first]
+
+
+def test_overridden_add_element_gets_every_element():
+    class RecordingSketch(Sketch):
+        def add_element(self, element):
+            added.append(element)
+            return super().add_element(element)
+
+    added = []
+    sketch = RecordingSketch(Part().xy())
+    added.clear()
+    with deferred_registration():
+        points = [Point(sketch, 1.0, 1.0), Point(sketch, 1.0, 1.0)]
+
+    assert added == points
+    assert sketch.elements.count(points[0]) == 1
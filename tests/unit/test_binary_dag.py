@@ -0,0 +1,54 @@
+"""Binary DAG encoding must round-trip the formatted JSON DAG."""
+
+import json
+
+import pytest
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import decode_dag, encode_dag
+
+
+def test_round_trip_matches_format_dag_json(make_assy):
+    dag = show_dag(make_assy(5, position=lambda i: [float(i * 10), -0.0, 1e-300]))
+
+    data = encode_dag(dag)
+
+    assert json.dumps(decode_dag(data)) == json.dumps(dag)
+    assert len(data) < len(json.dumps(dag)) / 2
+
+
+def test_round_trip_of_mixed_values():
+    dag = {
+        "version": "2.0",
+        "rootNodeId": "b2",
+        "DAG": {
+            "a1": {"type": 0, "params": {"value": 2.5}, "deps": {}},
+            "a10": {"type": 1, "params": {"value": "a1"}, "deps": {}},
+            "b2": {
+                "type": 2,
+                "params": {
+                    "ints": [0, -1, 63, -64, 2**80, -(2**80)],
+                    "flags": [True, False, None],
+                    "floats": [1.5, -0.0, 1e308],
+                    "nested": {"name": "雪 é", "empty": [], "obj": {}},
+                },
+                "deps": {
+                    "single": "a1",
+                    "items": ["a1", "a10", 3.0, "not-a-node"],
+                    "by_key": {"x": ["a10"]},
+                },
+            },
+        },
+        "serializableNodes": {"FloatParameter": 0, "StringParameter": 1, "Thing": 2},
+    }
+
+    assert json.dumps(decode_dag(encode_dag(dag))) == json.dumps(dag)
+
+
+def test_rejects_foreign_or_truncated_data(make_assy):
+    data = encode_dag(show_dag(make_assy(1)))
+
+    with pytest.raises(ValueError, match="magic"):
+        decode_dag(b"{}" + data)
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_dag(data[: len(data) // 2])
@@ -0,0 +1,53 @@
+"""Lazily computed @compute fields on Computable models."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from cadbuildr.foundation.gen.runtime import Computable
+from cadbuildr.foundation.gen.runtime.computable import _ComputedField
+
+
+class Doubler(BaseModel, Computable):
+    value: int
+    double: Optional[int] = Field(default=None, json_schema_extra={"compute": {"expr": "value * 2"}})
+    loop: Optional[int] = Field(default=None, json_schema_extra={"compute": {"expr": "loop + 1"}})
+    plain: Optional[int] = None
+
+
+def test_compute_fields_fill_in_on_first_read():
+    doubler = Doubler(value=4)
+
+    assert doubler.__dict__["double"] is None
+    assert doubler.double == 8
+    assert doubler.__dict__["double"] == 8
+    assert doubler.plain is None
+
+    doubler.value = 5
+    doubler.double = None
+    assert doubler.double == 10
+
+
+def test_only_compute_fields_get_descriptors():
+    Doubler(value=1)
+
+    assert isinstance(Doubler.__dict__["double"], _ComputedField)
+    assert "plain" not in Doubler.__dict__ and "value" not in Doubler.__dict__
+    assert "__getattribute__" not in vars(Computable)
+
+
+def test_self_referencing_compute_stays_none():
+    doubler = Doubler(value=1)
+
+    assert doubler.loop is None
+    assert doubler.loop is None
+
+
+def test_subclasses_inherit_compute_fields():
+    class Tripler(Doubler):
+        triple: Optional[int] = Field(default=None, json_schema_extra={"compute": {"expr": "value * 3"}})
+
+    tripler = Tripler(value=2)
+
+    assert tripler.double == 4 and tripler.triple == 6
+    assert tripler.model_dump()["double"] == 4
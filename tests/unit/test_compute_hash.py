@@ -0,0 +1,47 @@
+"""compute_hash must match hashing canonical_json.serialize output."""
+
+import enum
+import hashlib
+import math
+
+import pytest
+
+from cadbuildr.foundation.gen.dag.canonical_json import serialize
+from cadbuildr.foundation.gen.dag.hash import compute_hash, encode_canonical
+
+
+class Color(str, enum.Enum):
+    RED = "red"
+
+
+class Level(enum.IntEnum):
+    HIGH = 3
+
+
+CASES = [
+    {"type": 3, "params": {"value": 1.5}, "deps": {}},
+    {"type": 0, "params": {}, "deps": {"frame": "ab" * 32, "items": ["cd" * 32, ["ef" * 32]]}},
+    {"type": 7, "params": {"b": True, "a": False, "n": None, "i": -12, "big": 2**70}, "deps": {}},
+    {"type": 1, "params": {"f": [0.1, -0.0, 1e-300, 1e300, 3.0, 123456789.125]}, "deps": {}},
+    {"type": 1, "params": {"special": [math.nan, math.inf, -math.inf]}, "deps": {}},
+    {"type": 2, "params": {"s": 'quote " back \\ tab \t nl \n é 雪 \U0001f600'}, "deps": {}},
+    {"type": 2, "params": {"nested": {"z": {"y": [1, {"b": 2, "a": 1}]}, "a": ()}}, "deps": {}},
+    {"type": 2, "params": {"int_keys": {2: "b", 1: "a"}}, "deps": {}},
+    {"type": 2, "params": {"enums": [Color.RED, Level.HIGH]}, "deps": {}},
+    {"params": {"value": 1}, "type": 3.0, "deps": {}},
+    {"Zeta": 1, "alpha": 2, "_x": 3, "é": 4},
+    [],
+    {},
+]
+
+
+@pytest.mark.parametrize("value", CASES)
+def test_encoding_matches_canonical_json(value):
+    expected = serialize(value)
+    assert encode_canonical(value) == expected
+    assert compute_hash(value) == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+
+
+def test_unserializable_values_still_raise():
+    with pytest.raises(TypeError):
+        compute_hash({"type": 1, "params": {"value": object()}, "deps": {}})
@@ -0,0 +1,137 @@
+"""Per-class conversion plans and their hook registry invalidation."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
+from cadbuildr.foundation.gen.dag import HookRegistry, pydantic_to_dag
+from cadbuildr.foundation.gen.dag.plan import get_plan
+
+
+class Leaf(BaseModel):
+    value: float = 1.0
+
+
+class Holder(BaseModel):
+    leaf: Leaf
+    items: List[Leaf] = []
+    secret: Optional[str] = None
+    label: str = "x"
+
+
+def _holders(n):
+    return [Holder(leaf=Leaf(value=float(i)), items=[Leaf()], secret="s") for i in range(n)]
+
+
+def test_setup_foundation_hooks_is_idempotent():
+    registry = HookRegistry()
+    setup_foundation_hooks(registry)
+    generation = registry.generation
+
+    setup_foundation_hooks(registry)
+
+    assert registry.generation == generation
+    assert len(registry.get_hooks("should_skip_field", "*")) == 2
+
+
+def test_static_skip_hook_runs_once_per_class():
+    calls = []
+
+    def skip_secret(field_name, obj, context):
+        calls.append(field_name)
+        return field_name == "secret"
+
+    registry = HookRegistry()
+    registry.register("should_skip_field", "Holder", skip_secret, static=True)
+    memo = {}
+    for holder in _holders(5):
+        pydantic_to_dag(holder, memo, {}, registry)
+
+    assert calls == ["leaf", "items", "secret", "label"]
+    assert all("secret" not in node["params"] for node in memo.values())
+
+
+def test_dynamic_skip_hook_runs_per_object():
+    calls = []
+
+    def skip_secret(field_name, obj, context):
+        calls.append(field_name)
+        return field_name == "secret"
+
+    registry = HookRegistry()
+    registry.register("should_skip_field", "Holder", skip_secret)
+    for holder in _holders(3):
+        pydantic_to_dag(holder, {}, {}, registry)
+
+    assert calls == ["leaf", "items", "secret", "label"] * 3
+
+
+def test_registering_a_hook_rebuilds_plans():
+    registry = HookRegistry()
+    holder = _holders(1)[0]
+    plan = get_plan(holder, registry)
+    assert get_plan(holder, registry) is plan
+
+    registry.register(
+        "process_field", "Holder.label", lambda name, value, obj, ctx: (value.upper(), None)
+    )
+    memo = {}
+    root = pydantic_to_dag(holder, memo, {}, registry)
+
+    assert get_plan(holder, registry) is not plan
+    assert memo[root]["params"]["label"] == "X"
+
+
+def test_dispatch_tables_merge_wildcards_and_skip_unhooked_types():
+    registry = HookRegistry()
+    seen = []
+    registry.register("should_skip_field", "*", lambda name, obj, ctx: False, static=True)
+    registry.register("after_node", "Leaf", lambda obj, ctx: seen.append(ctx.node_hash))
+
+    table = registry.dispatch("should_skip_field", "Holder")
+    assert len(table) == 1
+    assert registry.dispatch("should_skip_field", "Holder") is table
+    assert registry.dispatch("after_node", "Holder") == ()
+
+    memo = {}
+    pydantic_to_dag(_holders(1)[0], memo, {}, registry)
+
+    # Only Leaf nodes had a hook, so only they were recorded as encountered.
+    assert len(seen) == 2
+    assert registry._first_encountered == set(seen)
+    assert not get_plan(_holders(1)[0], registry).needs_context
+
+    registry.register("after_node", "Holder", lambda obj, ctx: None)
+    assert len(registry.dispatch("after_node", "Holder")) == 1
+
+
+def test_scalar_parameters_reuse_their_node_hash():
+    from cadbuildr.foundation.gen.dag.hash import compute_hash
+    from cadbuildr.foundation.gen.models import BoolParameter, FloatParameter
+
+    class Params(BaseModel):
+        values: List[FloatParameter]
+        flag: BoolParameter
+
+    registry = HookRegistry()
+    setup_foundation_hooks(registry)
+    params = Params(
+        values=[FloatParameter(value=v) for v in (0.0, -0.0, 1.0, 0.0)],
+        flag=BoolParameter(value=False),
+    )
+    assert get_plan(params.values[0], registry).scalar
+    assert not get_plan(params, registry).scalar
+
+    for _ in range(2):
+        memo = {}
+        type_registry = {"FloatParameter": 0, "BoolParameter": 1}
+        root = pydantic_to_dag(params, memo, type_registry, registry)
+        values = memo[root]["deps"]["values"]
+        # 0.0 and -0.0 encode differently, so they are different nodes.
+        assert len(set(values)) == 3 and values[0] == values[3]
+        for node_hash in values + [memo[root]["deps"]["flag"]]:
+            assert compute_hash(memo[node_hash]) == node_hash
+
+    registry.register("after_node", "FloatParameter", lambda obj, ctx: None)
+    assert not get_plan(params.values[0], registry).scalar
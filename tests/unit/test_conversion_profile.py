@@ -0,0 +1,39 @@
+"""Per-type conversion profiles with ConversionProfile."""
+
+import json
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import ConversionProfile, TraversalStats, pydantic_to_dag
+
+
+def test_profile_counts_match_traversal_stats(make_assy):
+    from cadbuildr.foundation.dag_utils import _prepare_conversion
+
+    obj, hooks, type_registry = _prepare_conversion(make_assy(3, position=None), None)
+    profile = ConversionProfile()
+    stats = TraversalStats()
+    pydantic_to_dag(obj, {}, type_registry, hooks, stats=stats, profile=profile)
+
+    totals = profile.report()["totals"]
+    assert totals["nodes_created"] == stats.nodes_created
+    assert totals["memo_hits"] == stats.memo_hits
+    assert profile.types["SquareFromCenterAndSide"].expand_count == 3
+    assert profile.types["Extrusion"].compute_count > 0
+    root = profile.types["AssemblyRoot"]
+    assert root.total_time >= sum(entry.self_time for entry in profile.types.values()) * 0.99
+
+
+def test_context_manager_profiles_show_dag_without_changing_it(make_assy):
+    expected = show_dag(make_assy(3, position=None))
+
+    with ConversionProfile(trace_allocations=True) as profile:
+        dag = show_dag(make_assy(3, position=None))
+    show_dag(make_assy(3, position=None))
+
+    assert dag == expected
+    report = json.loads(json.dumps(profile.report()))
+    assert set(report["phases"]) == {"convert", "format"}
+    assert report["types"]["Sketch"]["count"] == 3
+    table = profile.table(limit=5)
+    assert table.splitlines()[0].split()[:3] == ["type", "count", "hit%"]
+    assert "alloc kB" in table
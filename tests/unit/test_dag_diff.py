@@ -0,0 +1,116 @@
+"""DAG diffs, patches and delta transport."""
+
+import json
+
+import pytest
+
+from cadbuildr.foundation.coms import utils_webrtc
+from cadbuildr.foundation.coms.kernel_api import KernelApiClient
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import ShortIdMap, apply_patch, dag_fingerprint, diff_dag
+
+
+def test_patch_rebuilds_the_new_dag(make_assy):
+    id_map = ShortIdMap()
+    old = show_dag(make_assy(20), id_map=id_map)
+    new = show_dag(make_assy(20, height=lambda i: 12 if i == 19 else 8), id_map=id_map)
+
+    patch = diff_dag(old, new)
+
+    assert apply_patch(old, patch) == new
+    assert set(patch["removed"]) == set(old["DAG"]) - set(new["DAG"])
+    assert len(patch["added"]) < len(new["DAG"]) // 4
+    assert len(json.dumps(patch)) < len(json.dumps(new)) // 4
+
+
+def test_identical_dags_give_an_empty_patch(make_assy):
+    dag = show_dag(make_assy(2))
+    patch = diff_dag(dag, dag)
+
+    assert patch["added"] == {} and patch["removed"] == []
+    assert "serializableNodes" not in patch
+    assert apply_patch(dag, patch) == dag
+
+
+def test_reused_id_with_new_contents_is_replaced():
+    old = {"version": "2.0", "rootNodeId": "a", "DAG": {"a": {"type": 0, "params": {"value": 1}, "deps": {}}}}
+    new = {"version": "2.0", "rootNodeId": "a", "DAG": {"a": {"type": 0, "params": {"value": 2}, "deps": {}}}}
+
+    patch = diff_dag(old, new)
+
+    assert patch["added"] == new["DAG"]
+    assert apply_patch(old, patch)["DAG"] == new["DAG"]
+
+
+def test_patch_against_wrong_base_is_rejected(make_assy):
+    old = show_dag(make_assy(1))
+    new = show_dag(make_assy(2))
+    patch = diff_dag(old, new)
+
+    assert patch["baseFingerprint"] == dag_fingerprint(old)
+    with pytest.raises(ValueError, match="expects base"):
+        apply_patch(new, patch)
+
+
+class _Response:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class _Session:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.payloads = []
+
+    def post(self, url, json, headers, timeout):
+        self.payloads.append(json)
+        return _Response(self.statuses.pop(0), {"ok": True})
+
+
+def test_render_sends_patch_and_falls_back_on_unknown_base(make_assy):
+    old = show_dag(make_assy(1))
+    new = show_dag(make_assy(2))
+    client = KernelApiClient(base_url="http://kernel.test")
+
+    client._session = _Session([200])
+    client.render(dag=new, base_dag=old)
+    (payload,) = client._session.payloads
+    assert "dag" not in payload
+    assert payload["dagPatch"] == diff_dag(old, new)
+
+    # Unknown base, or an API that does not know dagPatch at all.
+    for status in (409, 400, 422):
+        client._session = _Session([status, 200])
+        assert client.render(dag=new, base_dag=old) == {"ok": True}
+        patch_payload, full_payload = client._session.payloads
+        assert "dagPatch" in patch_payload
+        assert full_payload["dag"] == new
+
+
+def test_show_ext_sends_patches_only_to_brokers_that_support_them(monkeypatch, make_assy):
+    old = show_dag(make_assy(1))
+    new = show_dag(make_assy(2))
+    sent = []
+
+    def post(url, json, timeout):
+        sent.append(json)
+        return _Response(200, {"request_id": "r1"})
+
+    monkeypatch.setattr(utils_webrtc.requests, "post", post)
+    monkeypatch.setattr(utils_webrtc, "_PATCH_SUPPORT", {})
+    monkeypatch.setattr(utils_webrtc, "BROKER_URL", "http://old-broker.test/send")
+    monkeypatch.setattr(utils_webrtc.requests, "get", lambda url, timeout: _Response(404, {}))
+    assert utils_webrtc.show_ext(new, base_dag=old) == "r1"
+    assert [message["type"] for message in sent] == ["@buildr/dag"]
+
+    sent.clear()
+    monkeypatch.setattr(utils_webrtc, "BROKER_URL", "http://broker.test/send")
+    capabilities = {"messageTypes": ["@buildr/dag", "@buildr/dag-patch"]}
+    monkeypatch.setattr(utils_webrtc.requests, "get", lambda url, timeout: _Response(200, capabilities))
+    assert utils_webrtc.show_ext(new, base_dag=old) == "r1"
+    assert [message["type"] for message in sent] == ["@buildr/dag-patch"]
+    assert sent[0]["patch"] == diff_dag(old, new)
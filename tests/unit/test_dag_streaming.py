@@ -0,0 +1,55 @@
+"""Streaming DAG export with stream_dag / read_dag_stream."""
+
+import io
+import json
+
+import pytest
+
+from cadbuildr.foundation.dag_utils import show_dag, stream_dag
+from cadbuildr.foundation.gen.dag import DagStreamWriter, read_dag_stream
+
+
+@pytest.mark.parametrize("mode", ["ndjson", "json"])
+def test_stream_round_trips_to_show_dag(mode, make_assy):
+    out = io.StringIO()
+    stream_dag(make_assy(4), out, mode=mode)
+
+    out.seek(0)
+    assert json.dumps(read_dag_stream(out)) == json.dumps(show_dag(make_assy(4)))
+
+
+def test_ndjson_nodes_are_topologically_ordered(make_assy):
+    out = io.StringIO()
+    root_id = stream_dag(make_assy(4), out)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    header, nodes, footer = lines[0], lines[1:-1], lines[-1]
+    assert header == {"version": "2.0", "format": "ndjson"}
+    assert footer["rootNodeId"] == root_id == nodes[-1]["id"]
+    assert "AssemblyRoot" in footer["serializableNodes"]
+
+    written = set()
+    for node in nodes:
+        for dep in node["deps"].values():
+            for dep_id in dep if isinstance(dep, list) else [dep]:
+                assert dep_id in written
+        written.add(node["id"])
+
+
+def test_json_mode_is_a_single_document(make_assy):
+    out = io.StringIO()
+    root_id = stream_dag(make_assy(2), out, mode="json")
+
+    document = json.loads(out.getvalue())
+    assert list(document) == ["version", "DAG", "rootNodeId", "serializableNodes"]
+    assert root_id in document["DAG"]
+
+
+def test_unfinished_stream_is_rejected():
+    out = io.StringIO()
+    writer = DagStreamWriter(out)
+    writer["a" * 64] = {"type": 0, "params": {}, "deps": {}}
+
+    out.seek(0)
+    with pytest.raises(ValueError, match="footer"):
+        read_dag_stream(out)
@@ -0,0 +1,73 @@
+"""Single-pass DAG validation with validate_dag."""
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import has_cycle, has_link_cycle, validate_dag
+
+FRAME = 1
+STRING = 2
+
+
+def _frame_dag(links, names=None):
+    """Frames f0..fn with the given top_frame links, each with a name node."""
+    names = names or {}
+    nodes = {}
+    for frame_id, top_frame in links.items():
+        name_id = f"name-{frame_id}"
+        nodes[name_id] = {"type": STRING, "params": {"value": names.get(frame_id, frame_id)}, "deps": {}}
+        deps = {"name": name_id}
+        if top_frame is not None:
+            deps["top_frame"] = top_frame
+        nodes[frame_id] = {"type": FRAME, "params": {}, "deps": deps}
+    return {"DAG": nodes, "serializableNodes": {"Frame": FRAME, "String": STRING}}
+
+
+def test_real_dag_is_valid(make_assy):
+    dag = show_dag(make_assy(3, position=None))
+
+    report = validate_dag(dag)
+
+    assert report.ok
+    assert report.node_count == len(dag["DAG"])
+    assert not has_cycle(dag)
+
+    # Parents before children: acyclic, but needs the full topological sort.
+    reordered = dict(dag, DAG=dict(reversed(list(dag["DAG"].items()))))
+    assert validate_dag(reordered).ok
+
+
+def test_long_chain_does_not_recurse():
+    links = {f"f{i}": f"f{i + 1}" for i in range(50_000)}
+    links["f50000"] = None
+    dag = _frame_dag(links)
+
+    assert validate_dag(dag).ok
+    assert not has_cycle(dag)
+    assert has_link_cycle(dag, "Frame", "top_frame")[0] is False
+
+    dag["DAG"]["f50000"]["deps"]["top_frame"] = "f0"
+    assert has_cycle(dag)
+    assert validate_dag(dag).issues[0].node_ids[-1] == "f0"
+
+
+def test_frame_cycle_is_reported_before_the_general_cycle():
+    dag = _frame_dag({"root": "a", "a": "b", "b": "c", "c": "a"})
+
+    issues = validate_dag(dag).issues
+
+    assert [issue.kind for issue in issues] == ["link_cycle", "cycle"]
+    # Only the cycle itself; has_link_cycle also reports the path leading to it.
+    assert issues[0].node_ids == ["a", "b", "c", "a"]
+    assert has_link_cycle(dag, "Frame", "top_frame")[1] == ["root", "a", "b", "c", "a"]
+    assert "Cycle path (names): a -> b -> c -> a" in issues[0].message
+    assert set(issues[1].node_ids) == {"a", "b", "c"}
+    assert issues[1].node_ids[0] == issues[1].node_ids[-1]
+
+
+def test_plane_frame_pointing_to_origin():
+    dag = _frame_dag({"o": None, "p": "o", "c": "o", "q": "c"}, {"o": "origin", "p": "xz", "c": "body", "q": "yz"})
+
+    (issue,) = validate_dag(dag).issues
+
+    assert issue.kind == "plane_frame_origin"
+    assert issue.node_ids == ["p", "o"]
+    assert validate_dag(dag, check_plane_frames=False).ok
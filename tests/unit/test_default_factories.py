@@ -0,0 +1,28 @@
+"""@default factories compiled once per expression by _eval_expr."""
+
+from cadbuildr.foundation.gen.models import BallJoint, FloatParameter, InterfaceGridSpec, Part
+from cadbuildr.foundation.gen.runtime import _eval_expr
+from cadbuildr.foundation.gen.runtime.helpers import _COMPILED
+
+
+def test_defaults_are_fresh_objects():
+    first = _eval_expr({}, "FloatParameter(value=0.0)")
+    second = _eval_expr({}, "FloatParameter(value=0.0)")
+    assert isinstance(first, FloatParameter) and first.value == 0.0
+    assert first is not second
+    assert "FloatParameter(value=0.0)" in _COMPILED
+
+    assert _eval_expr({}, "[]") is not _eval_expr({}, "[]")
+    assert _eval_expr({}, "3") == 3.0 and isinstance(_eval_expr({}, "3"), float)
+    assert _eval_expr({}, "'part0'") == "part0"
+
+    grid, other = InterfaceGridSpec(), InterfaceGridSpec()
+    assert grid.pitch_z.value == 9.6 and grid.pitch_z is not other.pitch_z
+    assert Part().name.value == "part0"
+
+
+def test_literal_list_defaults():
+    orientation = _eval_expr({}, "[1.0, 0.0, 0.0, 0.0]")
+    orientation.append(5.0)
+    assert _eval_expr({}, "[1.0, 0.0, 0.0, 0.0]") == [1.0, 0.0, 0.0, 0.0]
+    assert BallJoint.model_fields["orientation"].default_factory() == [1.0, 0.0, 0.0, 0.0]
@@ -0,0 +1,57 @@
+"""Expansion memo of pydantic_to_dag: repeated expansions reuse their node."""
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
+from cadbuildr.foundation.gen.dag import TraversalStats, pydantic_to_dag
+from cadbuildr.foundation.gen.dag import conversion
+from cadbuildr.foundation.gen.models import Assembly, Box, Part, Sketch
+
+
+class BoxPart(Part):
+    def __init__(self):
+        s = Sketch(self.xy())
+        self.add_operation(Box(s.origin, w=10, d=20, h=30))
+
+
+def _convert(stats):
+    memo, type_registry = {}, {}
+    root = pydantic_to_dag(BoxPart(), memo, type_registry, setup_foundation_hooks(), stats=stats)
+    return root, list(memo.items()), type_registry
+
+
+def test_memo_hits_leave_the_dag_unchanged(monkeypatch):
+    # With an empty type registry the Rectangle the box's shape expands to is
+    # expanded again; the later expansions find the first one's node.
+    stats = TraversalStats()
+    converted = _convert(stats)
+    assert stats.expansion_hits >= 1
+
+    monkeypatch.setattr(conversion, "_MAX_EXPANSIONS", 0)
+    unmemoized = TraversalStats()
+    assert _convert(unmemoized) == converted
+    assert unmemoized.expansion_hits == 0
+    assert unmemoized.expansions > stats.expansions
+
+
+def test_memo_hits_repeat_the_sketch_registrations(monkeypatch, make_assy):
+    # Each brick's square expands into a Square registered in its own sketch;
+    # a hit registers a copy of the first brick's, so every sketch ends up
+    # with the elements expanding would have given it.
+    assy = make_assy(5, size=lambda i: 8)
+    stats = TraversalStats()
+    dag = show_dag(assy, stats=stats)
+    assert stats.expansions == 1
+    assert stats.expansion_hits == 4
+
+    monkeypatch.setattr(conversion, "_MAX_EXPANSIONS", 0)
+    unmemoized_assy = make_assy(5, size=lambda i: 8)
+    assert show_dag(unmemoized_assy) == dag
+
+    def elements(assy):
+        return [
+            [type(e).__name__ for e in op.sketch.elements]
+            for brick in assy.components
+            for op in brick.operations
+        ]
+
+    assert elements(assy) == elements(unmemoized_assy)
@@ -0,0 +1,61 @@
+"""Per-class compiled @expand plans."""
+
+import pytest
+
+from cadbuildr.foundation.gen.models import (
+    Box,
+    Extrusion,
+    Hexagon,
+    Part,
+    Polygon,
+    RectangleFromCenterAndSides,
+    Sketch,
+    Square,
+)
+from cadbuildr.foundation.gen.runtime import run_expand
+from cadbuildr.foundation.gen.runtime.expandable import _PLANS, _default_expand
+
+
+def _sketch():
+    return Sketch(type("_P", (Part,), {})().xy())
+
+
+def test_plan_is_compiled_once_per_class():
+    s = _sketch()
+    first = Square.from_center_and_side(s.origin, 4).expand()
+    plan = _PLANS[Square]
+    second = Square.from_center_and_side(s.origin, 6).expand()
+
+    assert _PLANS[Square] is plan
+    assert plan.target_cls is Polygon
+    assert isinstance(first, Polygon) and isinstance(second, Polygon)
+    # Placeholders are read off each instance, not the one that compiled the plan.
+    assert first.lines is not second.lines
+    assert len(Hexagon(s.origin, radius=5).expand().lines) == 6
+
+
+def test_typename_selects_union_member():
+    s = _sketch()
+    extrusion = Box(s.origin, w=10, h=4, d=6).expand()
+    assert isinstance(extrusion, Extrusion)
+    assert isinstance(extrusion.shape[0], RectangleFromCenterAndSides)
+    assert extrusion.shape[0].length.value == 10
+    assert extrusion.start.value == -2 and extrusion.end.value == 2
+
+
+def test_other_template_gets_its_own_plan():
+    s = _sketch()
+    square = Square.from_center_and_side(s.origin, 4)
+    template = {"lines": "$lines"}
+    assert isinstance(run_expand(square, template), Polygon)
+    assert _PLANS[Square].template is template
+    assert isinstance(square.expand(), Polygon)
+    assert _PLANS[Square].template is not template
+
+    # Errors of the template are raised when it is expanded.
+    with pytest.raises(ValueError, match="Failed to compute placeholder '\\$missing' on Square"):
+        _default_expand(square, {"lines": "$missing"}, target_cls=Polygon)
+    box = Box(s.origin, w=10, h=4, d=6)
+    template = {"shape": [{"__typename": "Nope", "center": "$center"}], "start": "$neg_half_h", "end": "$half_h"}
+    with pytest.raises(ValueError, match="__typename='Nope'"):
+        _default_expand(box, template, target_cls=Extrusion)
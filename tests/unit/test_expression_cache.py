@@ -0,0 +1,51 @@
+"""Per-expression compiled cache behind _eval_expr."""
+
+import pytest
+
+from cadbuildr.foundation.gen.models import Frame, Part, Sketch, Square
+from cadbuildr.foundation.gen.runtime import _eval_expr, register_type
+from cadbuildr.foundation.gen.runtime.helpers import _COMPILED, _TYPE_REGISTRY
+
+
+def test_static_and_compute_expressions_reuse_compiled_code():
+    first = Frame.make_origin_frame()
+    compiled = [c for expr, c in _COMPILED.items() if expr.startswith("Frame(name=StringParameter(value='origin')")]
+    assert len(compiled) == 1 and compiled[0].uses_eval
+
+    second = Frame.make_origin_frame()
+    assert first is not second and first.name is not second.name
+    assert second.name.value == "origin"
+
+    sketch = Sketch(Part().xy())
+    square = Square.from_center_and_side(sketch.origin, 4)
+    assert _eval_expr(square, "sketch") is sketch
+    assert _eval_expr(square, "[p for p in (p1, p2) if p]", {"self": square, "p1": 1, "p2": 0}) == [1]
+
+
+def test_errors_are_unchanged():
+    with pytest.raises(ValueError, match="Failed to evaluate static method expression 'Missing"):
+        _eval_expr(None, "Missing(value=1)")
+    with pytest.raises(ValueError, match="Cannot use path evaluation on None root"):
+        _eval_expr(None, "a.b")
+    with pytest.raises(ValueError, match="Invalid expr token"):
+        _eval_expr(Part(), "frame.name[is Frame")
+    # Raised on every call, not just the one that compiled the expression.
+    with pytest.raises(ValueError, match="Failed to evaluate expression"):
+        _eval_expr(Part(), "name.value + 1")
+    with pytest.raises(ValueError, match="Failed to evaluate expression"):
+        _eval_expr(Part(), "name.value + 1")
+
+
+def test_types_registered_later_are_visible():
+    class LateType:
+        def __init__(self, value):
+            self.value = value
+
+    assert _eval_expr(None, "round(math.sqrt(4.0))") == 2
+    with pytest.raises(ValueError):
+        _eval_expr(None, "LateType(3)")
+    register_type("LateType", LateType)
+    try:
+        assert _eval_expr(None, "LateType(3)").value == 3
+    finally:
+        del _TYPE_REGISTRY["LateType"]
@@ -0,0 +1,78 @@
+"""Incremental DAG rebuilds through DagBuildCache."""
+
+import json
+
+from cadbuildr.foundation import mark_dirty
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import DagBuildCache
+from cadbuildr.foundation.gen.models import Circle, FloatParameter, Part, Point, Sketch
+
+
+def _dumps(dag):
+    return json.dumps(dag)
+
+
+def test_cached_build_matches_full_build(make_assy):
+    cache = DagBuildCache()
+    assert _dumps(show_dag(make_assy(6), cache=cache)) == _dumps(show_dag(make_assy(6)))
+
+
+def test_unchanged_rebuild_skips_traversal(make_assy):
+    assy = make_assy(6)
+    cache = DagBuildCache()
+    first = show_dag(assy, cache=cache)
+    first_misses = cache.stats()["misses"]
+
+    second = show_dag(assy, cache=cache)
+
+    assert _dumps(second) == _dumps(first)
+    # Only the fresh root wrapper and its frame are rebuilt.
+    assert cache.stats()["misses"] < first_misses / 20
+
+
+def test_field_edit_rebuilds_only_the_changed_path(make_assy):
+    assy = make_assy(6)
+    cache = DagBuildCache()
+    show_dag(assy, cache=cache)
+
+    assy.components[2].operations[0].end = 12.0
+    edited = show_dag(assy, cache=cache)
+
+    expected = make_assy(6)
+    expected.components[2].operations[0].end = 12.0
+    assert _dumps(edited) == _dumps(show_dag(expected))
+    # extrusion, its part root and the assembly root
+    assert cache.stats()["misses"] < 15
+
+
+def test_generated_method_invalidates_instance(make_brick):
+    brick = make_brick()
+    cache = DagBuildCache()
+    before = show_dag(brick, cache=cache)
+
+    brick.translate([1.0, 2.0, 3.0])
+    after = show_dag(brick, cache=cache)
+
+    expected = make_brick()
+    expected.translate([1.0, 2.0, 3.0])
+    assert after != before
+    assert _dumps(after) == _dumps(show_dag(expected))
+
+
+def test_in_place_edit_needs_mark_dirty():
+    part = Part()
+    sketch = Sketch(part.xy())
+    Circle(center=sketch.origin, radius=FloatParameter(value=2.0))
+    Point(sketch=sketch, x=FloatParameter(value=1.0), y=FloatParameter(value=1.0))
+    cache = DagBuildCache()
+    before = show_dag(sketch, cache=cache)
+
+    # A raw list edit bypasses field assignment and generated methods.
+    sketch.elements.pop()
+    assert show_dag(sketch, cache=cache) == before
+
+    mark_dirty(sketch)
+    after = show_dag(sketch, cache=cache)
+
+    assert after != before
+    assert after == show_dag(sketch)
@@ -0,0 +1,79 @@
+"""Explicit-stack traversal in pydantic_to_dag."""
+
+import sys
+
+import pytest
+
+from cadbuildr.foundation.constants import DEFAULT_TYPE_REGISTRY
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
+from cadbuildr.foundation.gen.dag import TraversalStats, pydantic_to_dag
+from cadbuildr.foundation.gen.dag.incremental import collect_reachable
+from cadbuildr.foundation.gen.models import (
+    BoolParameter,
+    Frame,
+    Part,
+    Point,
+    Sketch,
+    StringParameter,
+)
+
+
+def _frame_chain(depth):
+    frame = None
+    for i in range(depth):
+        frame = Frame(
+            top_frame=frame,
+            name=StringParameter(value=f"f{i}"),
+            display=BoolParameter(value=False),
+            position=[0.0, 0.0, float(i)],
+            quaternion=[1.0, 0.0, 0.0, 0.0],
+        )
+    return frame
+
+
+def test_deep_frame_chain_beyond_recursion_limit():
+    depth = sys.getrecursionlimit() + 500
+    memo = {}
+    stats = TraversalStats()
+
+    root = pydantic_to_dag(_frame_chain(depth), memo, stats=stats)
+
+    # One Frame plus one StringParameter per level; the BoolParameter is shared.
+    assert len(memo) == 2 * depth + 1
+    assert stats.nodes_created == len(memo)
+    assert stats.max_depth == depth + 1
+    assert sum(stats.depth_histogram.values()) == stats.visited
+    assert list(memo)[-1] == root
+
+
+def test_memo_is_filled_in_post_order():
+    sketch = Sketch(Part().xy())
+    for i in range(4):
+        Point(sketch=sketch, x=float(i), y=0.0)
+    memo = {}
+
+    root = pydantic_to_dag(sketch, memo, DEFAULT_TYPE_REGISTRY.copy(), setup_foundation_hooks())
+
+    assert list(collect_reachable(memo, root)) == list(memo)
+
+
+def test_cycle_raises_and_releases_processing_set():
+    frame = _frame_chain(3)
+    frame.top_frame.top_frame = frame
+    processing = set()
+
+    with pytest.raises(ValueError, match="Circular reference"):
+        pydantic_to_dag(frame, {}, processing=processing)
+    assert processing == set()
+
+
+def test_show_dag_reports_stats():
+    sketch = Sketch(Part().xy())
+    Point(sketch=sketch, x=1.0, y=2.0)
+    stats = TraversalStats()
+
+    dag = show_dag(sketch, stats=stats)
+
+    assert stats.nodes_created == len(dag["DAG"])
+    assert stats.max_depth >= 3
@@ -0,0 +1,50 @@
+"""Lazy top-level imports: cold-start cost and registration on first use.
+
+Each check runs in a fresh interpreter, the test process has the models loaded.
+"""
+
+import subprocess
+import sys
+
+
+def _run(code, *options):
+    result = subprocess.run(
+        [sys.executable, *options, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result
+
+
+def test_import_does_not_load_models_or_coms():
+    result = _run(
+        "import sys, cadbuildr.foundation\n"
+        "print(sorted(m for m in ('cadbuildr.foundation.gen.models', 'numpy', 'requests') if m in sys.modules))"
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_generated_package_loads_models_on_first_lookup():
+    result = _run(
+        "import sys, cadbuildr.foundation.gen.dag\n"
+        "print('cadbuildr.foundation.gen.models' in sys.modules)\n"
+        "from cadbuildr.foundation.gen import Point\n"
+        "print(Point is sys.modules['cadbuildr.foundation.gen.models'].Point)"
+    )
+    assert result.stdout.split() == ["False", "True"]
+
+
+def test_direct_model_import_registers_compute_functions_and_patches():
+    result = _run(
+        "from cadbuildr.foundation.gen.models import Part, Sketch\n"
+        "sketch = Sketch(Part().xy())\n"
+        "print(sketch.origin is not None, hasattr(Part, 'head'))"
+    )
+    assert result.stdout.strip() == "True True"
+
+
+def test_top_level_names_load_on_first_use():
+    result = _run(
+        "import cadbuildr.foundation as foundation\n"
+        "from cadbuildr.foundation import *\n"
+        "print(Point is foundation.gen.models.Point, callable(show_dag), KernelApiClient.__name__)"
+    )
+    assert result.stdout.strip() == "True True KernelApiClient"
@@ -0,0 +1,85 @@
+"""Persistent content-addressed node store."""
+
+import io
+import json
+
+import pytest
+
+from cadbuildr.foundation.dag_utils import show_dag, stream_dag
+from cadbuildr.foundation.gen.dag import NodeStore, read_dag_stream
+
+
+def _node(value):
+    return {"type": 0, "params": {"value": value}, "deps": {}}
+
+
+def test_nodes_persist_across_reopen(tmp_path):
+    path = str(tmp_path / "nodes.sqlite")
+    with NodeStore(path) as store:
+        store.put_many([("a", _node(1)), ("b", _node(2))])
+
+    with NodeStore(path) as store:
+        assert store.get("a") == _node(1)
+        assert store.get_many(["a", "b", "c"]) == {"a": _node(1), "b": _node(2)}
+        assert "c" not in store
+        stats = store.stats()
+        assert (stats["hits"], stats["misses"], stats["nodes"]) == (3, 2, 2)
+        assert stats["hit_rate"] == pytest.approx(0.6)
+
+
+def test_least_recently_used_nodes_are_evicted():
+    size = len(json.dumps(_node(0), separators=(",", ":")))
+    store = NodeStore(max_bytes=size * 3, evict_to=2 / 3)
+    store.put_many([("a", _node(0)), ("b", _node(0)), ("c", _node(0))])
+    store.get("a")
+
+    store.put("d", _node(0))
+
+    assert {node_id for node_id in "abcd" if store.get(node_id)} == {"a", "d"}
+    assert store.stats()["evictions"] == 2
+
+
+def test_stream_dag_writes_only_new_nodes(make_assy):
+    store = NodeStore()
+    first = io.StringIO()
+    stream_dag(make_assy(3), first, store=store)
+    stored = len(store)
+
+    second = io.StringIO()
+    stream_dag(make_assy(4), second, store=store)
+
+    assert len(second.getvalue()) < len(first.getvalue()) / 2
+    assert len(store) > stored
+    second.seek(0)
+    assert json.dumps(read_dag_stream(second, store)) == json.dumps(show_dag(make_assy(4)))
+
+    second.seek(0)
+    with pytest.raises(ValueError, match="NodeStore"):
+        read_dag_stream(second)
+
+
+def test_eviction_keeps_the_nodes_a_stream_refers_to(make_assy):
+    def changed():
+        return make_assy(10, size=lambda i: 40 if i == 3 else 4 + i)
+
+    store = NodeStore()
+    stream_dag(make_assy(10), io.StringIO(), store=store)
+    store.max_bytes = int(store.stats()["bytes"] * 1.02)
+
+    stream = io.StringIO()
+    stream_dag(changed(), stream, store=store)
+
+    assert store.stats()["evictions"] > 0
+    stream.seek(0)
+    assert json.dumps(read_dag_stream(stream, store)) == json.dumps(show_dag(changed()))
+
+
+def test_export_larger_than_the_store_fails_when_written(make_assy):
+    store = NodeStore()
+    stream_dag(make_assy(2), io.StringIO(), store=store)
+    stored = store.stats()
+    store.max_bytes = stored["bytes"] + 1
+
+    with pytest.raises(ValueError, match="max_bytes"):
+        stream_dag(make_assy(4), io.StringIO(), store=store)
+    assert (len(store), store.stats()["bytes"]) == (stored["nodes"], stored["bytes"])
@@ -0,0 +1,78 @@
+"""Process-pool conversion of assembly components via show_dag(workers=N)."""
+
+import json
+
+from cadbuildr.foundation.compute_functions import (  # pragma: allowlist secret
+    _convert_component_to_root,
+    _finalize_root_names,
+)
+from cadbuildr.foundation.constants import DEFAULT_TYPE_REGISTRY
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.foundation_hooks import setup_foundation_hooks
+from cadbuildr.foundation.gen.dag import HookRegistry, convert_parallel, parallel, pydantic_to_dag
+from cadbuildr.foundation.gen.models import Assembly
+
+
+def _size(i):
+    # Three brick sizes, so that workers convert the same content.
+    return 4 + i % 3
+
+
+def test_parallel_dag_matches_serial(make_assy):
+    parallel = show_dag(make_assy(6, size=_size), workers=2)
+    serial = show_dag(make_assy(6, size=_size))
+
+    assert json.dumps(parallel) == json.dumps(serial)
+
+
+def test_nested_assembly_matches_serial(make_assy, make_brick):
+    def make():
+        outer = Assembly()
+        outer.add_component(make_assy(3, size=_size))
+        outer.add_component(make_assy(2, size=_size))
+        outer.add_component(make_brick())
+        return outer
+
+    assert json.dumps(show_dag(make(), workers=3)) == json.dumps(show_dag(make()))
+
+
+def test_components_sharing_a_sketch_stay_serial(make_assy, make_brick):
+    assy = make_assy(2, size=_size)
+    shared = make_brick()
+    assy.add_component(shared)
+    assy.add_component(shared)
+    root = _convert_component_to_root(assy)
+    _finalize_root_names(root)
+    hooks = setup_foundation_hooks(HookRegistry())
+
+    assert convert_parallel(root, DEFAULT_TYPE_REGISTRY.copy(), hooks, workers=2) is None
+
+
+def test_convert_parallel_matches_serial_memo(make_assy):
+    def root():
+        obj = _convert_component_to_root(make_assy(6, size=_size))
+        _finalize_root_names(obj)
+        return obj
+
+    hooks = setup_foundation_hooks(HookRegistry())
+    result = convert_parallel(root(), DEFAULT_TYPE_REGISTRY.copy(), hooks, workers=2)
+    serial_memo = {}
+    serial_root = pydantic_to_dag(root(), serial_memo, DEFAULT_TYPE_REGISTRY.copy(), hooks)
+
+    assert result is not None
+    root_hash, memo = result
+    assert root_hash == serial_root
+    assert list(memo.items()) == list(serial_memo.items())
+
+
+def test_without_fork_the_conversion_stays_serial(monkeypatch, make_assy):
+    def get_context(method=None):
+        raise ValueError(f"cannot find context for {method!r}")
+
+    monkeypatch.setattr(parallel.multiprocessing, "get_context", get_context)
+    root = _convert_component_to_root(make_assy(3, size=_size))
+    _finalize_root_names(root)
+    hooks = setup_foundation_hooks(HookRegistry())
+
+    assert convert_parallel(root, DEFAULT_TYPE_REGISTRY.copy(), hooks, workers=2) is None
+    assert json.dumps(show_dag(make_assy(3, size=_size), workers=2)) == json.dumps(show_dag(make_assy(3, size=_size)))
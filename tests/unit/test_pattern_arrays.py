@@ -0,0 +1,42 @@
+"""Point.from_array and the array layouts of the location patterns."""
+
+import numpy as np
+import pytest
+
+from cadbuildr.foundation import GridLocations, HexLocations, Locations, PolarLocations
+from cadbuildr.foundation.gen.models import FloatParameter, Part, Point, Sketch
+
+
+def test_from_array_matches_validated_points_and_registers_once():
+    sketch = Sketch(Part().xy())
+    xy = np.array([[0.0, 0.0], [1.5, -2.0], [1.5, -2.0]])
+    points = Point.from_array(sketch, xy)
+    assert points[1] == Point(sketch=sketch, x=FloatParameter(value=1.5), y=FloatParameter(value=-2.0))
+    assert all(point.sketch is sketch for point in points)
+    # The origin and the repeated point are already registered.
+    assert [(e.x.value, e.y.value) for e in sketch.elements if isinstance(e, Point)] == [
+        (0.0, 0.0),
+        (1.5, -2.0),
+    ]
+
+    with pytest.raises(ValueError, match=r"\(n, 2\) array"):
+        Point.from_array(sketch, [1.0, 2.0])
+
+
+def test_positions_are_built_from_positions_array():
+    sketch = Sketch(Part().xy())
+    center = Point(sketch, 3.0, -1.0)
+    patterns = [
+        GridLocations(center, 2.0, 1.5, 4, 3),
+        HexLocations(center, 2.0, 3),
+        PolarLocations(center, 5.0, 6, 15.0),
+        Locations(center, np.array([[1.0, 2.0], [-0.5, 0.25]])),
+    ]
+    for pattern in patterns:
+        xy = pattern.positions_array()
+        assert [(p.x.value, p.y.value) for p in pattern.positions()] == [tuple(row) for row in xy.tolist()]
+
+    assert GridLocations(center, 2.0, 1.5, 4, 3).positions_array()[:2].tolist() == [[0.0, -2.5], [2.0, -2.5]]
+    assert Locations(center, np.array([[1.0, 2.0]])).offsets == [(1.0, 2.0)]
+    with pytest.raises(ValueError, match="at least one offset"):
+        Locations(center, np.empty((0, 2)))
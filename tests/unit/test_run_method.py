@@ -0,0 +1,40 @@
+"""run_method dispatch: signatures are inspected once per registered function."""
+
+import pytest
+
+from cadbuildr.foundation.gen.runtime import register_method_fn, run_method
+from cadbuildr.foundation.gen.runtime.helpers import _METHOD_ADAPTERS
+
+
+def test_extra_locals_are_dropped_and_adapter_is_reused():
+    calls = []
+
+    @register_method_fn("_test_two_args")
+    def two_args(inst, a, b=2):
+        calls.append((inst, a, b))
+        return a + b
+
+    assert run_method("x", "_test_two_args", {"a": 1}) == 3
+    adapter = _METHOD_ADAPTERS["_test_two_args"]
+    assert run_method("y", "_test_two_args", {"a": 1, "b": 5, "unused": 0}) == 6
+    assert _METHOD_ADAPTERS["_test_two_args"] is adapter
+    assert calls == [("x", 1, 2), ("y", 1, 5)]
+
+
+def test_reregistered_function_gets_a_new_adapter():
+    @register_method_fn("_test_rebound")
+    def first(inst, a):
+        return ("first", a)
+
+    assert run_method(None, "_test_rebound", {"a": 1, "b": 2}) == ("first", 1)
+
+    @register_method_fn("_test_rebound")
+    def second(inst, a, b):
+        return ("second", a, b)
+
+    assert run_method(None, "_test_rebound", {"a": 1, "b": 2}) == ("second", 1, 2)
+
+
+def test_unregistered_method_raises():
+    with pytest.raises(ValueError, match="not registered"):
+        run_method(None, "_test_missing", {})
@@ -0,0 +1,51 @@
+"""Deferred schema builds of the generated models.
+
+Each check runs in a fresh interpreter, the test process has built most schemas.
+"""
+
+import subprocess
+import sys
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_schema_is_built_on_first_validation_and_timed():
+    output = _run(
+        "from cadbuildr.foundation.gen.models import Part, Sketch\n"
+        "from cadbuildr.foundation.gen.runtime import schema_build_times\n"
+        "before = Sketch.__pydantic_complete__\n"
+        "Sketch(Part().xy())\n"
+        "print(before, Sketch.__pydantic_complete__, 'Sketch' in schema_build_times())"
+    )
+    assert output == "False True True"
+
+
+def test_deferred_models_resolve_in_subclasses_and_user_models():
+    output = _run(
+        "from typing import List\n"
+        "from pydantic import BaseModel\n"
+        "from cadbuildr.foundation.gen.models import Draft, Part, Plane\n"
+        "class Brick(Part):\n"
+        "    pass\n"
+        "class Holder(BaseModel):\n"
+        "    planes: List[Plane] = []\n"
+        "brick = Brick()\n"
+        "print(type(brick.frame).__name__, Holder(planes=[brick.xy()]).planes[0] is not None)\n"
+        "print('solid' in Draft.model_json_schema()['properties'])"
+    )
+    assert output.splitlines() == ["Frame True", "True"]
+
+
+def test_build_deferred_schemas_completes_every_model():
+    output = _run(
+        "import cadbuildr.foundation.gen.models as models\n"
+        "from pydantic import BaseModel\n"
+        "from cadbuildr.foundation.gen.runtime import build_deferred_schemas\n"
+        "classes = [v for v in vars(models).values() if isinstance(v, type) and issubclass(v, BaseModel)]\n"
+        "build_deferred_schemas()\n"
+        "print(all(cls.__pydantic_complete__ for cls in classes))"
+    )
+    assert output == "True"
@@ -0,0 +1,61 @@
+"""Stable short node ids with ShortIdMap."""
+
+import hashlib
+import json
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import ShortIdMap, format_dag
+
+
+def _hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _node_key(node):
+    return json.dumps(node, sort_keys=True)
+
+
+def _dag(hashes):
+    return {h: {"type": 0, "params": {}, "deps": {}} for h in hashes}
+
+
+def test_first_build_matches_per_build_truncation():
+    hashes = [_hash(str(i)) for i in range(2000)]
+    dag = _dag(hashes)
+
+    assert format_dag(dag, hashes[0], {}, id_map=ShortIdMap()) == format_dag(dag, hashes[0], {})
+
+
+def test_ids_do_not_grow_when_a_close_neighbour_appears():
+    first = "abcd1" + "0" * 59
+    neighbour = "abcd2" + "0" * 59
+    id_map = ShortIdMap()
+
+    assert format_dag(_dag([first]), first, {}, id_map=id_map)["rootNodeId"] == "abcd"
+    rebuilt = format_dag(_dag([first, neighbour]), first, {}, id_map=id_map)
+
+    assert rebuilt["rootNodeId"] == "abcd"
+    assert set(rebuilt["DAG"]) == {"abcd", "abcd2"}
+    # Without the map the old node's id would have changed.
+    assert format_dag(_dag([first, neighbour]), first, {})["rootNodeId"] == "abcd1"
+
+
+def test_ids_stay_unique_and_survive_a_save():
+    id_map = ShortIdMap()
+    id_map.assign(_hash(str(i)) for i in range(500))
+    restored = ShortIdMap.from_dict(id_map.as_dict())
+
+    later = [_hash(f"later{i}") for i in range(500)]
+    assert restored.assign(later) == id_map.assign(later)
+    assert len(set(id_map.as_dict().values())) == len(id_map) == 1000
+
+
+def test_show_dag_ids_are_stable_across_edits(make_assy):
+    id_map = ShortIdMap()
+    before = show_dag(make_assy(3), id_map=id_map)
+    after = show_dag(make_assy(4), id_map=id_map)
+
+    before_ids = {_node_key(node): node_id for node_id, node in before["DAG"].items()}
+    for node_id, node in after["DAG"].items():
+        if _node_key(node) in before_ids:
+            assert before_ids[_node_key(node)] == node_id
@@ -0,0 +1,112 @@
+"""Trusted construction of generated geometry and deferred sketch registration."""
+
+import threading
+
+import pytest
+
+from cadbuildr.foundation.gen.models import Arc, FloatParameter, Line, Part, Point, Sketch
+from cadbuildr.foundation.gen.runtime import construct_trusted
+from cadbuildr.foundation.mixin.sketch_mixin import deferred_registration
+
+
+def _trusted_point(sketch, x, y):
+    return construct_trusted(
+        Point,
+        sketch=sketch,
+        x=construct_trusted(FloatParameter, value=x),
+        y=construct_trusted(FloatParameter, value=y),
+    )
+
+
+def test_trusted_objects_match_validated_ones_and_register():
+    sketch = Sketch(Part().xy())
+    validated = Point(sketch=sketch, x=FloatParameter(value=1.5), y=FloatParameter(value=2.5))
+    trusted = _trusted_point(sketch, 1.5, 2.5)
+    assert trusted == validated
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.__pydantic_extra__ == validated.__pydantic_extra__
+
+    other = _trusted_point(sketch, 3.0, 4.0)
+    assert other in sketch.elements
+
+    line = construct_trusted(Line, p1=trusted, p2=other)
+    assert line == Line(p1=validated, p2=other)
+    assert line.model_fields_set == {"p1", "p2"}
+    assert line.__pydantic_extra__ == {}
+    assert line.sketch is sketch
+    assert line in sketch.elements
+
+    with pytest.raises(TypeError, match="missing value for required field 'p2'"):
+        construct_trusted(Line, p1=trusted)
+
+
+def _build_profile(sketch):
+    points = [_trusted_point(sketch, float(x), float(x % 2)) for x in (0, 1, 2, 1)]
+    line = construct_trusted(Line, p1=points[0], p2=points[1])
+    arc = construct_trusted(Arc, p1=points[1], p2=points[2], p3=points[3])
+    # Equal to ``line``, so not registered again.
+    construct_trusted(Line, p1=_trusted_point(sketch, 0.0, 0.0), p2=points[1])
+    return line, arc
+
+
+def _registered(sketch):
+    def describe(element):
+        if isinstance(element, Point):
+            return ("Point", element.x.value, element.y.value)
+        return (type(element).__name__, describe(element.p1), describe(element.p2))
+
+    return [describe(element) for element in sketch.elements]
+
+
+def test_deferred_registration_matches_immediate_registration():
+    immediate = Sketch(Part().xy())
+    _build_profile(immediate)
+
+    deferred = Sketch(Part().xy())
+    with deferred_registration():
+        line, arc = _build_profile(deferred)
+        assert line not in deferred.elements
+    assert _registered(deferred) == _registered(immediate)
+    assert deferred.elements[-2] is line and deferred.elements[-1] is arc
+
+    # Registering the same profile again adds nothing.
+    with deferred_registration():
+        _build_profile(deferred)
+    assert _registered(deferred) == _registered(immediate)
+
+
+def test_deferred_registration_still_registers_when_the_block_raises():
+    sketch = Sketch(Part().xy())
+    with pytest.raises(ValueError):
+        with deferred_registration():
+            point = _trusted_point(sketch, 7.0, 8.0)
+            raise ValueError("boom")
+    assert point in sketch.elements
+
+
+def test_deferred_registration_is_per_thread():
+    sketch, other = Sketch(Part().xy()), Sketch(Part().xy())
+    entered, created = threading.Event(), threading.Event()
+    points = {}
+
+    def worker():
+        entered.wait()
+        # Not inside this thread's block: registered right away.
+        points["other"] = _trusted_point(other, 5.0, 6.0)
+        created.set()
+        with deferred_registration():
+            points["own"] = _trusted_point(other, 7.0, 8.0)
+            points["own_in_block"] = points["own"] in other.elements
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    with deferred_registration():
+        point = _trusted_point(sketch, 1.0, 2.0)
+        entered.set()
+        created.wait()
+        assert points["other"] in other.elements
+        assert point not in sketch.elements
+    thread.join()
+    assert point in sketch.elements
+    assert not points["own_in_block"] and points["own"] in other.elements
+    assert all(e is not points["other"] and e is not points["own"] for e in sketch.elements)
@@ -0,0 +1,79 @@
+"""Validation during conversion with pydantic_to_dag(validator=...)."""
+
+import json
+
+import pytest
+
+from cadbuildr.foundation.dag_utils import show_dag
+from cadbuildr.foundation.gen.dag import (
+    ConversionValidator,
+    DagValidationError,
+    TraversalStats,
+    pydantic_to_dag,
+)
+from cadbuildr.foundation.gen.models import BoolParameter, Frame, StringParameter
+
+
+def _frame(name, top_frame=None):
+    return Frame(
+        name=StringParameter(value=name),
+        display=BoolParameter(value=False),
+        position=[0.0, 0.0, 0.0],
+        quaternion=[1.0, 0.0, 0.0, 0.0],
+        top_frame=top_frame,
+    )
+
+
+def test_valid_model_converts_unchanged(make_assy):
+    expected = show_dag(make_assy(3, position=None))
+
+    assy = make_assy(3, position=None)
+    assert json.dumps(show_dag(assy, validate=True)) == json.dumps(expected)
+
+
+def test_plane_frame_on_origin_fails_at_that_node():
+    body = _frame("body", _frame("origin"))
+    bad = _frame("xz", _frame("origin"))
+    frames = [_frame("a", body), _frame("b", bad)] + [_frame(f"c{i}", body) for i in range(50)]
+    stats = TraversalStats()
+
+    with pytest.raises(DagValidationError) as error:
+        for frame in frames:
+            pydantic_to_dag(frame, {}, {}, validator=ConversionValidator(), stats=stats)
+
+    issue = error.value.issue
+    assert issue.kind == "plane_frame_origin"
+    assert issue.path == ["Frame.top_frame", "Frame"]
+    assert "Plane frame 'xz'" in str(error.value)
+    # Stopped at the second top-level frame.
+    assert stats.visited < 20
+
+
+def test_frame_cycle_reports_names_and_object_path():
+    first = _frame("first")
+    second = _frame("second", first)
+    first.top_frame = second
+
+    with pytest.raises(DagValidationError) as error:
+        pydantic_to_dag(first, {}, {}, validator=ConversionValidator())
+
+    issue = error.value.issue
+    assert issue.kind == "link_cycle"
+    assert "Cycle path (names): first -> second -> first" in issue.message
+    assert issue.path == ["Frame.top_frame", "Frame.top_frame", "Frame"]
+
+    # Without a validator the cycle is still an error, now with its path.
+    with pytest.raises(ValueError, match="Object path: Frame.top_frame -> Frame.top_frame -> Frame"):
+        pydantic_to_dag(first, {}, {})
+
+
+def test_every_link_rule_of_a_type_is_followed():
+    first = _frame("first")
+    second = _frame("second", first)
+    first.top_frame = second
+    validator = ConversionValidator(link_rules=[("Frame", "top_frame"), ("Frame", "parent")])
+
+    with pytest.raises(DagValidationError) as error:
+        pydantic_to_dag(first, {}, {}, validator=validator)
+
+    assert error.value.issue.kind == "link_cycle"